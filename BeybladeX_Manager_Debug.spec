@@ -5,7 +5,7 @@ a = Analysis(
     ['beybladeX_manager.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('data/catalog.json', 'data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,5 @@
+"""Local HTTP JSON API over a collection."""
+
+from .server import CollectionAPI, CollectionServer, ApiError
+
+__all__ = ['CollectionAPI', 'CollectionServer', 'ApiError']
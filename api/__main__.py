@@ -0,0 +1,7 @@
+"""Serve a collection over HTTP: python -m api --help"""
+
+import sys
+from api.server import main
+
+
+sys.exit(main())
@@ -0,0 +1,383 @@
+"""Local HTTP JSON API over one shared collection.
+
+Read endpoints (all ``GET``, JSON, paginated with ``offset``/``limit``)::
+
+    /parts?type=Blade&search=dran   owned parts, filtered like the Parts tab
+    /combos                         saved combos
+    /combos/top?limit=10            best buildable combos
+    /search?q=dran                  catalog parts matching q, with owned quantity
+    /stats                          collection totals
+
+Writes::
+
+    POST   /parts  {"name": ..., "part_type": ..., "quantity": 1, "condition": "New"}
+    DELETE /parts?name=...&type=...&quantity=1
+
+Every response carries an ``ETag`` derived from ``Collection.version``
+(and a per-server token), and ``If-None-Match`` gets a ``304`` while
+the collection is unchanged.
+Bodies are gzipped for clients that accept it.
+
+Reads never take the write lock. Each write publishes a snapshot of the
+collection (``Collection.snapshot()``, O(1)), and reads render from the
+latest snapshot, with rendered bodies cached per version. The file is
+saved from the snapshot outside the write lock. A write is acknowledged
+only once a snapshot at least that new is on disk, but neither readers
+nor the next writer wait for the save.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from models import Collection, CollectionSnapshot, PartType
+from data.database import get_search_index
+from data.persistence import load_collection, save_collection, CollectionConflictError
+from diagnostics.log_setup import configure_logging
+
+
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+GZIP_MIN_BYTES = 1024  # Smaller bodies are not worth compressing
+CACHE_SIZE = 256  # Rendered bodies kept, across every path and query
+REQUEST_QUEUE_SIZE = 256  # Pending connections the listening socket accepts
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    """An error response with a status code and a message."""
+    
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _paginate(items: list, query: Dict[str, str]) -> dict:
+    offset = _int_param(query, 'offset', 0, minimum=0)
+    limit = min(_int_param(query, 'limit', DEFAULT_LIMIT, minimum=1), MAX_LIMIT)
+    return {'total': len(items), 'offset': offset, 'limit': limit, 'items': items[offset:offset + limit]}
+
+
+def _int_param(query: Dict[str, str], name: str, default: int, minimum: int = 0) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+    if value < minimum:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be at least {minimum}")
+    return value
+
+
+def _part_type(value: Optional[str]) -> PartType:
+    try:
+        return PartType(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"type must be one of {', '.join(t.value for t in PartType)}")
+
+
+class CollectionAPI:
+    """The shared collection with its write lock, snapshot and response cache."""
+    
+    def __init__(self, collection: Collection, save_path: Optional[str] = None, read_only: bool = False):
+        self.collection = collection
+        self.save_path = save_path
+        self.read_only = read_only
+        # Versions restart at zero with each server, so tags also name the instance
+        self.etag_prefix = secrets.token_hex(4)
+        self._write_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saved_version = collection.version
+        self._disk_state = collection.saved  # What this server last wrote, the base for merges
+        self._view = collection.snapshot()
+        self._owned: Tuple[Optional[int], Dict[tuple, int]] = (None, {})
+        self._cache: "OrderedDict[tuple, Tuple[bytes, Optional[bytes]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._rendering: Dict[tuple, threading.Event] = {}
+        self.routes: Dict[str, Callable[[CollectionSnapshot, Dict[str, str]], object]] = {
+            '/parts': self.get_parts,
+            '/combos': self.get_combos,
+            '/combos/top': self.get_top_combos,
+            '/search': self.get_search,
+            '/stats': self.get_stats
+        }
+    
+    def view(self) -> CollectionSnapshot:
+        """The snapshot of the collection published by the latest write."""
+        return self._view
+    
+    def render(self, path: str, query: Dict[str, str]) -> Tuple[int, bytes, Optional[bytes]]:
+        """Version, JSON body and its gzipped form (None when small) for a GET."""
+        route = self.routes.get(path)
+        if route is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+        view = self.view()
+        key = (view.version, path, tuple(sorted(query.items())))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return (view.version,) + cached
+            # Concurrent misses for one key wait for a single render rather
+            # than all rendering it at once under the GIL
+            rendering = self._rendering.get(key)
+            if rendering is None:
+                self._rendering[key] = threading.Event()
+        if rendering is not None:
+            rendering.wait()
+            with self._cache_lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return (view.version,) + cached
+            # The render failed; fall through and raise its error here too
+        
+        try:
+            body = json.dumps(route(view, query)).encode('utf-8')
+            compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+            with self._cache_lock:
+                self._cache[key] = (body, compressed)
+                while len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        finally:
+            if rendering is None:
+                with self._cache_lock:
+                    self._rendering.pop(key).set()
+        return view.version, body, compressed
+    
+    # Read endpoints, each given the versioned snapshot and the query parameters
+    
+    def get_parts(self, view: CollectionSnapshot, query: Dict[str, str]) -> dict:
+        from services.part_service import PartService
+        parts = PartService.filter_parts(view.parts, query.get('search', ""), query.get('type', 'All'))
+        return _paginate([part.to_dict() for part in parts], query)
+    
+    def get_combos(self, view: CollectionSnapshot, query: Dict[str, str]) -> dict:
+        return _paginate([combo.to_dict() for combo in view.combos], query)
+    
+    def get_top_combos(self, view: CollectionSnapshot, query: Dict[str, str]) -> dict:
+        from services.combo_service import ComboService
+        limit = min(_int_param(query, 'limit', 10, minimum=1), MAX_LIMIT)
+        return {'items': [dict(combo.to_dict(), score=round(score, 2))
+                          for combo, score in ComboService.top_combos(view, limit)]}
+    
+    def get_search(self, view: CollectionSnapshot, query: Dict[str, str]) -> dict:
+        from data.database import find_database_part, get_all_parts
+        keys = get_search_index().search(query.get('q', ""))
+        if keys is None:
+            page = _paginate(get_all_parts(), query)
+        else:
+            # Only the parts on the page are looked up and serialized
+            page = _paginate(sorted(keys, key=lambda key: (key[1].value, key[0])), query)
+            page['items'] = [find_database_part(name, part_type) for name, part_type in page['items']]
+        owned = self._owned_quantities(view)
+        page['items'] = [dict(part.to_dict(), owned_quantity=owned.get((part.name, part.part_type), 0))
+                         for part in page['items']]
+        return page
+    
+    def _owned_quantities(self, view: CollectionSnapshot) -> Dict[tuple, int]:
+        """Owned quantity by (name, type) for a view, built once per version."""
+        owned = self._owned
+        if owned[0] != view.version:
+            owned = (view.version, {(part.name, part.part_type): part.owned_quantity for part in view.parts})
+            self._owned = owned
+        return owned[1]
+    
+    def get_stats(self, view: CollectionSnapshot, query: Dict[str, str]) -> dict:
+        from services.stats_service import StatsService
+        return StatsService.summarize(view)
+    
+    # Writes, serialized by the write lock
+    
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "This server is read-only")
+    
+    def add_part(self, payload: dict) -> dict:
+        from services.part_service import PartService
+        self._check_writable()
+        part_type = _part_type(payload.get('part_type'))
+        quantity = payload.get('quantity', 1)
+        if not isinstance(quantity, int) or quantity < 1:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "quantity must be a positive integer")
+        part = PartService.create_part_from_database(str(payload.get('name')), part_type, quantity,
+                                                     str(payload.get('condition', "New")))
+        if part is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"{payload.get('name')} ({part_type.value}) is not in the catalog")
+        with self._write_lock:
+            self.collection.add_part(part)
+            owned = self.collection.find_part(part.name, part.part_type)
+            result = dict(owned.to_dict(), version=self.collection.version)
+            snapshot = self._publish()
+        self._save(snapshot)
+        return result
+    
+    def remove_part(self, query: Dict[str, str]) -> dict:
+        self._check_writable()
+        part_type = _part_type(query.get('type'))
+        name = query.get('name', "")
+        quantity = _int_param(query, 'quantity', 1, minimum=1)
+        with self._write_lock:
+            if not self.collection.remove_part(name, part_type, quantity):
+                raise ApiError(HTTPStatus.CONFLICT, f"Fewer than {quantity} of {name} ({part_type.value}) owned")
+            snapshot = self._publish()
+        self._save(snapshot)
+        return {'name': name, 'part_type': part_type.value, 'removed': quantity, 'version': snapshot.version}
+    
+    def _publish(self) -> CollectionSnapshot:
+        """Make the changed collection visible to readers; call under the write lock."""
+        self._view = self.collection.snapshot()
+        return self._view
+    
+    def _save(self, snapshot: CollectionSnapshot) -> None:
+        """Return once ``snapshot`` or a newer one is on disk.
+        
+        Each save writes the latest snapshot, so writers queued behind a save
+        are usually covered by the next one instead of saving in turn. If
+        another process saved the file meanwhile, its changes are merged
+        into the live collection, which is then saved and republished.
+        """
+        if not self.save_path:
+            return
+        with self._save_lock:
+            if snapshot.version <= self._saved_version:
+                return
+            latest = self._view
+            latest.saved = self._disk_state  # Copied before the previous save finished
+            try:
+                save_collection(latest, self.save_path)
+            except CollectionConflictError as e:
+                logger.warning("%s; merging", e)
+                with self._write_lock:
+                    self.collection.saved = self._disk_state
+                    save_collection(self.collection, self.save_path, merge=True)
+                    latest = self._publish()
+            self._disk_state = latest.saved
+            self._saved_version = latest.version
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's ``CollectionAPI``."""
+    
+    protocol_version = "HTTP/1.1"  # Keep-alive; every response sets Content-Length
+    # Headers and body go out as separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms per keep-alive request)
+    disable_nagle_algorithm = True
+    server_version = "BeybladeX"
+    
+    @property
+    def api(self) -> CollectionAPI:
+        return self.server.api
+    
+    def _query(self) -> Tuple[str, Dict[str, str]]:
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return url.path.rstrip('/') or '/', query
+    
+    def _accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('Accept-Encoding', "")
+    
+    def _send(self, status: int, body: bytes = b"", headers: Optional[List[Tuple[str, str]]] = None) -> None:
+        self.send_response(status)
+        for name, value in headers or []:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def _send_json(self, status: int, value) -> None:
+        self._send(status, json.dumps(value).encode('utf-8'), [('Content-Type', 'application/json')])
+    
+    def _send_error(self, error: ApiError) -> None:
+        self._send_json(error.status, {'error': str(error)})
+    
+    def do_GET(self):
+        path, query = self._query()
+        try:
+            version, body, compressed = self.api.render(path, query)
+        except ApiError as e:
+            self._send_error(e)
+            return
+        use_gzip = compressed is not None and self._accepts_gzip()
+        # Each encoding is a different representation, so it gets its own tag
+        tag = f"{self.api.etag_prefix}-{version}" + ("-gzip" if use_gzip else "")
+        etag = f'"{tag}"'
+        headers = [('ETag', etag), ('Vary', 'Accept-Encoding'), ('Cache-Control', 'no-cache')]
+        if etag in (candidate.strip() for candidate in self.headers.get('If-None-Match', "").split(',')):
+            self._send(HTTPStatus.NOT_MODIFIED, headers=headers)
+            return
+        headers.append(('Content-Type', 'application/json'))
+        if use_gzip:
+            headers.append(('Content-Encoding', 'gzip'))
+        self._send(HTTPStatus.OK, compressed if use_gzip else body, headers)
+    
+    do_HEAD = do_GET
+    
+    def do_POST(self):
+        path, _ = self._query()
+        try:
+            if path != '/parts':
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+            if not isinstance(payload, dict):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+            self._send_json(HTTPStatus.CREATED, self.api.add_part(payload))
+        except ApiError as e:
+            self._send_error(e)
+    
+    def do_DELETE(self):
+        path, query = self._query()
+        try:
+            if path != '/parts':
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+            self._send_json(HTTPStatus.OK, self.api.remove_part(query))
+        except ApiError as e:
+            self._send_error(e)
+    
+    def log_message(self, format, *args):
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+class CollectionServer(ThreadingHTTPServer):
+    """Thread-per-connection server with room for bursts of connections."""
+    
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+    
+    def __init__(self, api: CollectionAPI, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self.api = api
+        super().__init__((host, port), RequestHandler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api", description="Serve a collection as a local JSON API.")
+    parser.add_argument('--collection', default="collection.json", help="(default %(default)s)")
+    parser.add_argument('--host', default="127.0.0.1", help="(default %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="(default %(default)s)")
+    parser.add_argument('--read-only', action='store_true', help="reject writes")
+    args = parser.parse_args(argv)
+    
+    configure_logging(filename=None)
+    api = CollectionAPI(load_collection(args.collection), args.collection, read_only=args.read_only)
+    get_search_index()  # Built up front rather than under the first burst of searches
+    server = CollectionServer(api, args.host, args.port)
+    logger.info("Serving %s on http://%s:%d", args.collection, args.host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
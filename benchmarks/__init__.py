@@ -0,0 +1 @@
+"""Benchmarks and synthetic data for scaling measurements."""
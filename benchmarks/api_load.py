@@ -0,0 +1,295 @@
+"""Load generator for the collection API, entirely on loopback.
+
+Writes a generated catalog and collection to a temporary directory,
+starts ``python -m api`` on them in a separate process, then runs many
+client coroutines against it for a fixed duration. Each client holds
+one keep-alive connection and issues a weighted mix of requests:
+
+- ``search``: catalog search for a word from the generated names
+- ``stats``: collection totals
+- ``add``: POST one of a small set of hot parts
+- ``remove``: DELETE one of the hot parts (409 when none are owned
+  counts as rejected, not as an error)
+
+The report gives throughput and latency percentiles per operation, plus
+non-2xx/transport errors. Every acknowledged add and remove is tallied
+per hot part. At the end, the server's quantities and the saved file are
+compared with the tallies, and any difference counts as a lost update.
+
+Usage::
+
+    python -m benchmarks.api_load --clients 200 --duration 10
+    python -m benchmarks.api_load --size 100000 --mix search=60,stats=30,add=5,remove=5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+from benchmarks.generator import BIT_NAMES, BLADE_FIRST, catalog_part, write_catalog, write_collection
+from benchmarks.ui_bench import percentile
+
+
+DEFAULT_MIX = {'search': 70, 'stats': 20, 'add': 5, 'remove': 5}
+HOT_PARTS = 20  # Parts the writers contend on; few, so updates race
+STARTUP_TIMEOUT = 30.0
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 client over one keep-alive asyncio connection."""
+    
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+    
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode('ascii') + b"\r\n" + (body or b""))
+        await self.writer.drain()
+        
+        status_line = await self.reader.readline()
+        if not status_line:
+            await self.close()
+            raise ConnectionError("Server closed the connection")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, await self.reader.readexactly(length) if length else b""
+    
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+
+class LoadStats:
+    """Latencies, outcomes and acknowledged quantity changes across all clients."""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.deltas: Dict[Tuple[str, str], int] = defaultdict(int)  # (name, type) -> acknowledged change
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"expected op=weight with op in {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def hot_parts(catalog_size: int, seed: int) -> List[Tuple[str, str]]:
+    return [(part.name, part.part_type.value)
+            for part in (catalog_part(index, seed) for index in range(min(HOT_PARTS, catalog_size)))]
+
+
+async def run_client(client: HttpClient, mix: Dict[str, int], hot: List[Tuple[str, str]],
+                     stats: LoadStats, deadline: float, rng: random.Random) -> None:
+    ops, weights = list(mix), list(mix.values())
+    words = list(BLADE_FIRST) + list(BIT_NAMES)
+    while time.perf_counter() < deadline:
+        op = rng.choices(ops, weights)[0]
+        name, part_type = rng.choice(hot)
+        if op == 'search':
+            request = ('GET', f"/search?q={quote(rng.choice(words))}&limit=20", None)
+        elif op == 'stats':
+            request = ('GET', "/stats", None)
+        elif op == 'add':
+            request = ('POST', "/parts", json.dumps({'name': name, 'part_type': part_type}).encode('utf-8'))
+        else:
+            request = ('DELETE', f"/parts?name={quote(name)}&type={part_type}&quantity=1", None)
+        
+        start = time.perf_counter()
+        try:
+            status, _ = await client.request(*request)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            stats.errors[op] += 1
+            await client.close()
+            continue
+        stats.latencies[op].append(time.perf_counter() - start)
+        if op == 'remove' and status == 409:
+            stats.rejected[op] += 1
+        elif status >= 300:
+            stats.errors[op] += 1
+        elif op == 'add':
+            stats.deltas[(name, part_type)] += 1
+        elif op == 'remove':
+            stats.deltas[(name, part_type)] -= 1
+    await client.close()
+
+
+async def owned_quantities(host: str, port: int, hot: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """Current quantity of each hot part, read back through the API."""
+    client = HttpClient(host, port)
+    quantities = {}
+    try:
+        for name, part_type in hot:
+            _, body = await client.request('GET', f"/parts?search={quote(name)}&type={part_type}&limit=500")
+            items = json.loads(body)['items']
+            quantities[(name, part_type)] = sum(item['owned_quantity'] for item in items if item['name'] == name)
+    finally:
+        await client.close()
+    return quantities
+
+
+def saved_quantities(path: str, hot: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    with open(path) as f:
+        parts = json.load(f)['parts']
+    owned = {(part['name'], part['part_type']): part['owned_quantity'] for part in parts}
+    return {key: owned.get(key, 0) for key in hot}
+
+
+def start_server(workdir: str, collection_path: str, catalog_path: str, port: int) -> subprocess.Popen:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, BEYBLADEX_CATALOG=catalog_path,
+               PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    server = subprocess.Popen([sys.executable, '-m', 'api', '--collection', collection_path, '--port', str(port)],
+                              cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with status {server.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("API server did not start listening")
+
+
+async def run_clients(port: int, clients: int, duration: float, mix: Dict[str, int],
+                      hot: List[Tuple[str, str]], seed: int) -> Tuple[LoadStats, Dict, float]:
+    stats = LoadStats()
+    before = await owned_quantities('127.0.0.1', port, hot)
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(HttpClient('127.0.0.1', port), mix, hot, stats, start + duration,
+                                      random.Random(seed * 100003 + index))
+                           for index in range(clients)))
+    return stats, before, time.perf_counter() - start
+
+
+def run_load_test(size: int = 1000, clients: int = 100, duration: float = 10.0,
+                  mix: Optional[Dict[str, int]] = None, catalog_size: Optional[int] = None,
+                  seed: int = 0) -> dict:
+    """Serve a generated collection and drive it with concurrent clients."""
+    mix = mix or DEFAULT_MIX
+    catalog_size = catalog_size or size * 2
+    hot = hot_parts(catalog_size, seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        catalog_path = os.path.join(workdir, "catalog.json")
+        collection_path = os.path.join(workdir, "collection.json")
+        write_catalog(catalog_path, catalog_size, seed)
+        write_collection(collection_path, size, catalog_size=catalog_size, seed=seed)
+        port = free_port()
+        server = start_server(workdir, collection_path, catalog_path, port)
+        try:
+            stats, before, elapsed = asyncio.run(run_clients(port, clients, duration, mix, hot, seed))
+            after = asyncio.run(owned_quantities('127.0.0.1', port, hot))
+        finally:
+            server.terminate()
+            server.wait()
+        saved = saved_quantities(collection_path, hot)
+    
+    lost = []
+    for key in hot:
+        expected = before[key] + stats.deltas[key]
+        if after[key] != expected or saved[key] != expected:
+            lost.append({'part': key[0], 'type': key[1], 'expected': expected,
+                         'served': after[key], 'saved': saved[key]})
+    total = sum(len(samples) for samples in stats.latencies.values())
+    return {
+        'size': size,
+        'catalog_size': catalog_size,
+        'clients': clients,
+        'duration': elapsed,
+        'mix': mix,
+        'requests': total,
+        'throughput': total / elapsed if elapsed else 0.0,
+        'operations': [
+            {'name': op, 'count': len(stats.latencies[op]), 'errors': stats.errors[op],
+             'rejected': stats.rejected[op],
+             'p50': percentile(stats.latencies[op], 50), 'p95': percentile(stats.latencies[op], 95),
+             'p99': percentile(stats.latencies[op], 99),
+             'max': max(stats.latencies[op]) if stats.latencies[op] else 0.0}
+            for op in mix
+        ],
+        'errors': sum(stats.errors.values()),
+        'lost_updates': lost
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{report['requests']:,} requests from {report['clients']} clients in {report['duration']:.1f} s: "
+             f"{report['throughput']:,.0f} req/s",
+             f"{'operation':<10} {'count':>8} {'errors':>7} {'rejected':>9} {'p50 ms':>9} {'p95 ms':>9} "
+             f"{'p99 ms':>9} {'max ms':>9}"]
+    for op in report['operations']:
+        lines.append(f"{op['name']:<10} {op['count']:>8,} {op['errors']:>7} {op['rejected']:>9} "
+                     f"{op['p50'] * 1e3:>9.2f} {op['p95'] * 1e3:>9.2f} {op['p99'] * 1e3:>9.2f} "
+                     f"{op['max'] * 1e3:>9.2f}")
+    lost = report['lost_updates']
+    lines.append(f"lost updates: {len(lost)}" + "".join(
+        f"\n  {item['part']} ({item['type']}): expected {item['expected']}, served {item['served']}, "
+        f"saved {item['saved']}" for item in lost))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api_load",
+                                     description="Load-test the collection API on loopback.")
+    parser.add_argument('--size', type=int, default=1000, help="owned parts in the generated collection")
+    parser.add_argument('--catalog-size', type=int, default=None, help="generated catalog size (default 2x size)")
+    parser.add_argument('--clients', type=int, default=100, help="concurrent client coroutines")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds of load")
+    parser.add_argument('--mix', type=parse_mix, default=None,
+                        help="op=weight list (default %s)" % ",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON report here")
+    args = parser.parse_args(argv)
+    
+    report = run_load_test(args.size, args.clients, args.duration, args.mix, args.catalog_size, args.seed)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['errors'] or report['lost_updates'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
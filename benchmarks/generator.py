@@ -0,0 +1,257 @@
+"""Deterministic synthetic catalogs, collections and combos at scale.
+
+Every row is derived from a hash of ``(seed, index)`` rather than from a
+shared random stream, so any catalog row can be produced on its own.
+Collections and combos pick catalog rows by index, and the file writers
+stream rows out, so sizes from 10^3 to 10^7 rows run in constant memory.
+Collection files are written in the format ``data.persistence`` uses.
+
+Distributions follow the real catalog: the part type mix and each type's
+rarity mix and weight spread are taken from the 67 shipped parts.
+
+Usage::
+
+    python -m benchmarks.generator catalog catalog_1m.json --size 1000000
+    python -m benchmarks.generator collection collection_1m.json --size 1000000 --combos 10000
+    python -m benchmarks.generator collection collection_10k.json.gz --size 10000
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple
+from data import persistence
+from models import BeybladeCombo, BeybladePart, Collection, PartType, Rarity
+
+
+_MASK = (1 << 64) - 1
+
+# Part type mix and per-type rarity mix of the shipped catalog
+TYPE_WEIGHTS = ((PartType.BLADE, 23), (PartType.RATCHET, 20), (PartType.BIT, 24))
+RARITY_WEIGHTS = {
+    PartType.BLADE: ((Rarity.COMMON, 8), (Rarity.RARE, 7), (Rarity.SUPER_RARE, 4), (Rarity.ULTRA_RARE, 4)),
+    PartType.RATCHET: ((Rarity.COMMON, 7), (Rarity.RARE, 7), (Rarity.SUPER_RARE, 4), (Rarity.ULTRA_RARE, 2)),
+    PartType.BIT: ((Rarity.COMMON, 6), (Rarity.RARE, 8), (Rarity.SUPER_RARE, 6), (Rarity.ULTRA_RARE, 4)),
+}
+# Mean and standard deviation of weight in grams
+WEIGHT_PROFILE = {PartType.BLADE: (36.1, 2.1), PartType.RATCHET: (7.17, 0.72), PartType.BIT: (2.55, 0.36)}
+# Share of ratchets and bits in the "Special" series
+SPECIAL_SHARE = {PartType.RATCHET: 0.2, PartType.BIT: 0.5}
+
+# Owned quantities: mostly singles, a long tail of duplicates
+QUANTITY_WEIGHTS = ((1, 60), (2, 20), (3, 10), (4, 4), (5, 3), (8, 2), (12, 1))
+CONDITION_WEIGHTS = (("New", 70), ("Like New", 15), ("Good", 10), ("Fair", 4), ("Poor", 1))
+
+BLADE_FIRST = ("Dran", "Hell's", "Wizard", "Knight", "Shark", "Phoenix", "Cobalt", "Tyranno", "Leon",
+               "Viper", "Whale", "Spider", "Tiger", "Eagle", "Rhino", "Wolf", "Falcon", "Scorpion")
+BLADE_SECOND = ("Sword", "Scythe", "Arrow", "Shield", "Edge", "Buster", "Wing", "Dragoon", "Beat",
+                "Crest", "Tail", "Feather", "Wave", "Web", "Claw", "Eye", "Horn", "Fang", "Spear")
+BIT_NAMES = ("Accel", "Atomic", "Ball", "Bearing", "Defense", "Eternal", "Flat", "Gear Ball", "Guard",
+             "High Taper", "Hunter", "Low Flat", "Massive", "Motor", "Needle", "Orb", "Point", "Revolve",
+             "Rush", "Survive", "Taper", "Unite", "Variable", "Xtreme")
+ARCHETYPE_WORDS = ("Attack", "Defense", "Stamina", "Balance")
+
+NEW_FILE_VERSION = 1  # What the first save of a collection file writes
+
+CATEGORY_NAMES = {PartType.BLADE: "blades", PartType.RATCHET: "ratchets", PartType.BIT: "bits"}
+
+
+def _mix(seed: int, index: int, salt: int = 0) -> int:
+    """SplitMix64 hash of a row index, the source of all randomness here."""
+    z = (seed * 0x9E3779B97F4A7C15 + index * 0xBF58476D1CE4E5B9 + salt * 0x94D049BB133111EB) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _unit(seed: int, index: int, salt: int) -> float:
+    """Uniform float in [0, 1) for a row and field."""
+    return (_mix(seed, index, salt) >> 11) / float(1 << 53)
+
+
+class _Choice:
+    """Weighted choice driven by a uniform float."""
+    
+    def __init__(self, weighted: Sequence[Tuple[object, int]]):
+        self.values = [value for value, _ in weighted]
+        cumulative = list(accumulate(weight for _, weight in weighted))
+        self.bounds = [c / cumulative[-1] for c in cumulative]
+    
+    def pick(self, u: float):
+        return self.values[min(bisect_right(self.bounds, u), len(self.values) - 1)]
+
+
+_TYPES = _Choice(TYPE_WEIGHTS)
+_RARITIES = {part_type: _Choice(weights) for part_type, weights in RARITY_WEIGHTS.items()}
+_QUANTITIES = _Choice(QUANTITY_WEIGHTS)
+_CONDITIONS = _Choice(CONDITION_WEIGHTS)
+
+
+def catalog_part_type(index: int, seed: int = 0) -> PartType:
+    """The part type of a catalog row, without building the part."""
+    return _TYPES.pick(_unit(seed, index, 1))
+
+
+def catalog_part(index: int, seed: int = 0) -> BeybladePart:
+    """The catalog part at a row index; names are unique within a catalog."""
+    part_type = catalog_part_type(index, seed)
+    rarity = _RARITIES[part_type].pick(_unit(seed, index, 2))
+    h = _mix(seed, index, 3)
+    
+    if part_type == PartType.BLADE:
+        name = f"{BLADE_FIRST[h % len(BLADE_FIRST)]} {BLADE_SECOND[(h >> 8) % len(BLADE_SECOND)]} {index}"
+        series = f"BX-{(h >> 16) % 99 + 1:02d}"
+    else:
+        if part_type == PartType.RATCHET:
+            name = f"{(h % 8) + 1}-{60 + 10 * ((h >> 8) % 3)} #{index}"
+        else:
+            name = f"{BIT_NAMES[h % len(BIT_NAMES)]} #{index}"
+        series = "Special" if _unit(seed, index, 4) < SPECIAL_SHARE[part_type] else "Standard"
+    
+    # Approximately normal weight from three uniforms (Irwin-Hall)
+    mean, deviation = WEIGHT_PROFILE[part_type]
+    spread = sum(_unit(seed, index, salt) for salt in (5, 6, 7)) - 1.5
+    weight = round(max(0.1, mean + 2 * deviation * spread), 1)
+    
+    archetype = ARCHETYPE_WORDS[(h >> 24) % len(ARCHETYPE_WORDS)]
+    description = f"{archetype} type {part_type.value.lower()}"
+    return BeybladePart(name, part_type, series, rarity, weight, description)
+
+
+def generate_catalog(size: int, seed: int = 0) -> Iterator[BeybladePart]:
+    """Yield catalog parts 0..size-1."""
+    for index in range(size):
+        yield catalog_part(index, seed)
+
+
+def _stride(catalog_size: int, seed: int) -> Tuple[int, int]:
+    """Multiplier coprime to the catalog size and an offset: a cheap permutation."""
+    multiplier = (_mix(seed, 0, 8) % catalog_size) | 1 if catalog_size > 1 else 1
+    while math.gcd(multiplier, catalog_size) != 1:
+        multiplier += 2
+    return multiplier, _mix(seed, 0, 9) % catalog_size
+
+
+def collection_row(row: int, catalog_size: int, seed: int = 0,
+                   stride: Optional[Tuple[int, int]] = None) -> BeybladePart:
+    """The owned part at a collection row: a distinct catalog part with a quantity."""
+    multiplier, offset = stride or _stride(catalog_size, seed)
+    part = catalog_part((multiplier * row + offset) % catalog_size, seed)
+    part.owned_quantity = _QUANTITIES.pick(_unit(seed, row, 10))
+    part.condition = _CONDITIONS.pick(_unit(seed, row, 11))
+    return part
+
+
+def generate_collection_parts(size: int, catalog_size: Optional[int] = None,
+                              seed: int = 0) -> Iterator[BeybladePart]:
+    """Yield ``size`` distinct owned parts drawn from a catalog (default twice as large)."""
+    if size == 0:
+        return
+    catalog_size = catalog_size or 2 * size
+    if size > catalog_size:
+        raise ValueError("A collection cannot own more distinct parts than the catalog has")
+    stride = _stride(catalog_size, seed)
+    for row in range(size):
+        yield collection_row(row, catalog_size, seed, stride)
+
+
+def generate_combos(count: int, collection_size: int, catalog_size: Optional[int] = None,
+                    seed: int = 0) -> Iterator[BeybladeCombo]:
+    """Yield combos built from owned parts of a generated collection."""
+    if collection_size == 0:
+        return
+    catalog_size = catalog_size or 2 * collection_size
+    stride = _stride(catalog_size, seed)
+    draw = 0
+    
+    def owned(part_type: PartType) -> Optional[BeybladePart]:
+        nonlocal draw
+        for _ in range(64):  # Each type is about a third of rows
+            draw += 1
+            part = collection_row(_mix(seed, draw, 12) % collection_size, catalog_size, seed, stride)
+            if part.part_type == part_type:
+                return part
+        return None
+    
+    for _ in range(count):
+        blade, ratchet, bit = owned(PartType.BLADE), owned(PartType.RATCHET), owned(PartType.BIT)
+        if blade and ratchet and bit:
+            yield BeybladeCombo(f"{blade.name} {ratchet.name} {bit.name}", blade, ratchet, bit)
+
+
+def build_collection(size: int, combos: int = 0, catalog_size: Optional[int] = None,
+                     seed: int = 0) -> Collection:
+    """Materialize a generated collection in memory."""
+    collection = Collection()
+    collection.parts = list(generate_collection_parts(size, catalog_size, seed))
+    collection.combos = list(generate_combos(combos, size, catalog_size, seed))
+    return collection
+
+
+def _write_array(f, rows: Iterator[dict], indent: str) -> None:
+    first = True
+    for row in rows:
+        f.write(("\n" if first else ",\n") + indent + json.dumps(row))
+        first = False
+    f.write("\n" + indent[:-2] + "]" if not first else "]")
+
+
+def write_catalog(path: str, size: int, seed: int = 0, version: int = 1) -> None:
+    """Stream a generated catalog in the ``catalog.json`` format."""
+    with open(path, 'w') as f:
+        f.write('{\n  "version": %d,\n  "aliases": {}' % version)
+        for part_type, category in CATEGORY_NAMES.items():
+            f.write(f',\n  "{category}": [')
+            rows = ({'name': part.name, 'part_type': part.part_type.value, 'series': part.series,
+                     'rarity': part.rarity.value, 'weight': part.weight, 'description': part.description}
+                    for part in (catalog_part(index, seed) for index in range(size)
+                                 if catalog_part_type(index, seed) == part_type))
+            _write_array(f, rows, '    ')
+        f.write('\n}\n')
+
+
+def write_collection(path: str, size: int, combos: int = 0, catalog_size: Optional[int] = None,
+                     seed: int = 0) -> None:
+    """Stream a generated collection as json, json.gz or csv, chosen by the extension.
+    
+    JSON files carry the version header ``data.persistence`` gives a new
+    file, so they load and save like any collection; CSV drops combos.
+    """
+    fmt = persistence.collection_format(path)
+    parts = (part.to_dict() for part in generate_collection_parts(size, catalog_size, seed))
+    if fmt == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=persistence.CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(parts)
+        return
+    with (gzip.open if fmt == 'json.gz' else open)(path, 'wt', encoding='utf-8') as f:
+        f.write('{\n  "version": %d,\n  "parts": [' % NEW_FILE_VERSION)
+        _write_array(f, parts, '    ')
+        f.write(',\n  "combos": [')
+        _write_array(f, (combo.to_dict() for combo in generate_combos(combos, size, catalog_size, seed)), '    ')
+        f.write(',\n  "catalog_version": null\n}\n')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic catalogs and collections.")
+    parser.add_argument('kind', choices=['catalog', 'collection'])
+    parser.add_argument('path')
+    parser.add_argument('--size', type=int, default=1000, help="catalog parts or owned parts")
+    parser.add_argument('--combos', type=int, default=0, help="combos in a collection")
+    parser.add_argument('--catalog-size', type=int, default=None, help="catalog to draw a collection from")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    if args.kind == 'catalog':
+        write_catalog(args.path, args.size, args.seed)
+    else:
+        write_collection(args.path, args.size, args.combos, args.catalog_size, args.seed)
+
+
+if __name__ == '__main__':
+    main()
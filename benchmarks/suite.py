@@ -0,0 +1,273 @@
+"""Stdlib benchmark suite for models, persistence, services and search.
+
+Each benchmark builds its state with the synthetic generator at every
+requested size, times the operation with ``timeit`` (auto-ranged loop
+count, best of several repeats) and records the peak memory of one call
+with ``tracemalloc``. Results are written as JSON with machine info, and
+``--compare`` flags operations that slowed down beyond a threshold
+against a stored baseline run.
+
+Usage::
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+from models import BeybladePart, Collection, PartType
+from data.persistence import save_collection, load_collection
+from data.search_index import SearchIndex
+from services.part_service import PartService
+from services.stats_service import StatsService
+from services.combo_service import ComboService
+from benchmarks.generator import build_collection, generate_catalog
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+QUICK_SIZES = (1000, 10000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10  # Flag operations more than 10% slower than the baseline
+
+
+@dataclass
+class Benchmark:
+    """An operation timed at several sizes.
+    
+    ``setup(size)`` returns the state passed to ``run``; ``run`` must leave
+    the state as it found it so repeats measure the same work.
+    """
+    name: str
+    setup: Callable[[int], object]
+    run: Callable[[object], None]
+    teardown: Optional[Callable[[object], None]] = None
+    max_size: Optional[int] = None  # Skip sizes above this
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    seconds: float  # Best time per operation
+    repeats: List[float] = field(default_factory=list)
+    loops: int = 1
+    peak_bytes: int = 0
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, setup: Callable[[int], object], teardown: Optional[Callable[[object], None]] = None,
+              max_size: Optional[int] = None):
+    """Register the decorated function as the timed operation of a benchmark."""
+    def register(run: Callable[[object], None]):
+        BENCHMARKS.append(Benchmark(name, setup, run, teardown, max_size))
+        return run
+    return register
+
+
+# Collection model
+
+def _collection_with_target(size: int):
+    collection = build_collection(size, seed=1)
+    target = collection.parts[-1]  # Worst case for the linear lookup
+    target.owned_quantity = 10 ** 9  # Never drops to zero while removing
+    return collection, target
+
+
+@benchmark("collection.find_part", _collection_with_target)
+def _find_part(state):
+    collection, target = state
+    collection.find_part(target.name, target.part_type)
+
+
+@benchmark("collection.add_part", _collection_with_target)
+def _add_part(state):
+    collection, target = state
+    collection.add_part(BeybladePart(target.name, target.part_type, target.series, target.rarity, owned_quantity=1))
+    target.owned_quantity -= 1
+
+
+@benchmark("collection.remove_part", _collection_with_target)
+def _remove_part(state):
+    collection, target = state
+    collection.remove_part(target.name, target.part_type, 1)
+    target.owned_quantity += 1
+
+
+@benchmark("collection.snapshot", lambda size: build_collection(size, seed=1))
+def _snapshot(collection):
+    collection.snapshot().parts  # Taking it is O(1); the first read replays the change log
+
+
+# Persistence
+
+def _saved_collection(size: int):
+    collection = build_collection(size, combos=size // 100, seed=2)
+    handle, path = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+    save_collection(collection, path)
+    return collection, path
+
+
+def _remove_saved_collection(state):
+    os.remove(state[1])
+
+
+@benchmark("persistence.save_collection", _saved_collection, _remove_saved_collection)
+def _save(state):
+    collection, path = state
+    save_collection(collection, path)
+
+
+@benchmark("persistence.load_collection", _saved_collection, _remove_saved_collection)
+def _load(state):
+    _, path = state
+    load_collection(path)
+
+
+# Services
+
+@benchmark("part_service.filter_parts", lambda size: build_collection(size, seed=3).parts)
+def _filter_parts(parts):
+    PartService.filter_parts(parts, "wing", "Blade")
+
+
+@benchmark("stats_service.generate_stats_text", lambda size: build_collection(size, combos=size // 100, seed=4))
+def _stats_text(collection):
+    StatsService.generate_stats_text(collection)
+
+
+def _combo_collection(size: int) -> Collection:
+    """Collection with about ``size`` buildable combos (size^(1/3) parts per type)."""
+    per_type = max(1, round(size ** (1 / 3)))
+    counts = dict.fromkeys(PartType, 0)
+    parts = []
+    for part in generate_catalog(per_type * 10, seed=5):
+        if counts[part.part_type] < per_type:
+            part.owned_quantity = 1
+            parts.append(part)
+            counts[part.part_type] += 1
+    collection = Collection()
+    collection.add_parts(parts)
+    return collection
+
+
+@benchmark("combo_service.top_combos", _combo_collection, max_size=1000000)
+def _top_combos(collection):
+    ComboService.top_combos(collection, 10)
+
+
+# Search
+
+@benchmark("search_index.search", lambda size: SearchIndex(generate_catalog(size, seed=6)))
+def _search(index):
+    index.search("dran sw")
+
+
+def measure(bench: Benchmark, size: int, repeat: int = DEFAULT_REPEAT) -> Result:
+    """Time one benchmark at one size, then trace the memory of a single call."""
+    state = bench.setup(size)
+    timer = timeit.Timer(lambda: bench.run(state))
+    loops, _ = timer.autorange()
+    repeats = [elapsed / loops for elapsed in timer.repeat(repeat=repeat, number=loops)]
+    
+    tracemalloc.start()
+    bench.run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    if bench.teardown:
+        bench.teardown(state)
+    return Result(bench.name, size, min(repeats), repeats, loops, peak)
+
+
+def machine_info() -> dict:
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation()
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, name_filter: str = "", repeat: int = DEFAULT_REPEAT,
+              progress: Optional[Callable[[Result], None]] = None) -> dict:
+    """Run every matching benchmark at every size and return the report."""
+    results = []
+    for bench in BENCHMARKS:
+        if name_filter not in bench.name:
+            continue
+        for size in sizes:
+            if bench.max_size is not None and size > bench.max_size:
+                continue
+            result = measure(bench, size, repeat)
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'results': [asdict(result) for result in results]
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Operations slower than the baseline by more than ``threshold`` (a fraction)."""
+    previous = {(r['name'], r['size']): r['seconds'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['name'], result['size']))
+        if before and result['seconds'] > before * (1 + threshold):
+            regressions.append({'name': result['name'], 'size': result['size'], 'baseline': before,
+                                'seconds': result['seconds'], 'ratio': result['seconds'] / before})
+    return regressions
+
+
+def format_result(result: Result) -> str:
+    return (f"{result.name:<36} {result.size:>9,} {result.seconds * 1e6:>14.2f} us"
+            f" {result.peak_bytes / 1024:>12.1f} KiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the benchmark suite.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help="collection sizes to run")
+    parser.add_argument('--quick', action='store_true', help="only the smaller sizes")
+    parser.add_argument('--filter', default="", help="only benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--output', help="write the JSON report here")
+    parser.add_argument('--compare', metavar='BASELINE', help="flag regressions against a stored report")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+    
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    print(f"{'benchmark':<36} {'size':>9} {'time/op':>17} {'peak memory':>16}")
+    report = run_suite(sizes, args.filter, args.repeat, progress=lambda r: print(format_result(r), flush=True))
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']} @ {regression['size']:,}: "
+                  f"{regression['ratio']:.2f}x slower than baseline", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
@@ -0,0 +1,196 @@
+"""Headless benchmark of main window operations on synthetic collections.
+
+Builds ``ModernMainWindow`` with a generated collection (and optionally a
+generated catalog), withdraws the root so nothing is shown, then scripts
+user operations: refresh, add a part, type into the parts search, switch
+tabs and save. Each operation is timed through ``root.update()`` so the
+redraw work it queues is included, and the Tk widget count is sampled
+after it. Results are p50/p95/p99 wall times per operation.
+
+Tk still needs a display; on a machine without one run under Xvfb::
+
+    xvfb-run python -m benchmarks.ui_bench --size 10000 --combos 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from models import BeybladePart
+from benchmarks.generator import build_collection, write_catalog
+
+
+SEARCH_TEXT = "dran sword"
+DEFAULT_ITERATIONS = 20
+
+
+@dataclass
+class OperationStats:
+    name: str
+    samples: List[float] = field(default_factory=list)  # Seconds per run
+    widgets: List[int] = field(default_factory=list)  # Widget count after each run
+    
+    def summary(self) -> dict:
+        return {
+            'name': self.name,
+            'runs': len(self.samples),
+            'p50': percentile(self.samples, 50),
+            'p95': percentile(self.samples, 95),
+            'p99': percentile(self.samples, 99),
+            'max': max(self.samples, default=0.0),
+            'widgets': self.widgets[-1] if self.widgets else 0,
+            'widget_growth': self.widgets[-1] - self.widgets[0] if self.widgets else 0
+        }
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def count_widgets(widget) -> int:
+    """Number of widgets in the tree under (and including) a widget."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+# Scripted operations; ``step`` counts runs so repeated runs vary
+
+def _refresh_all(app, step: int) -> None:
+    app.refresh_all()
+
+
+def _add_part(app, step: int) -> None:
+    from data.database import get_all_parts
+    catalog_parts = get_all_parts()
+    part = catalog_parts[step % len(catalog_parts)]
+    app.collection.add_part(BeybladePart(part.name, part.part_type, part.series, part.rarity,
+                                         part.weight, part.description, owned_quantity=1))
+    app.refresh_callback()  # What the add part dialog does
+
+
+def _search_keystroke(app, step: int) -> None:
+    # Types the search text one character per run, then clears it
+    app.get_tab('all_parts_tab').search_var.set(SEARCH_TEXT[:step % (len(SEARCH_TEXT) + 1)])
+
+
+def _switch_tab(app, step: int) -> None:
+    app.notebook.select((step + 1) % len(app.notebook.tabs()))
+
+
+def _save(app, step: int) -> None:
+    # What the save button does; run_operations drains the background save
+    app.save_collection(notify=False)
+
+
+OPERATIONS: Dict[str, Callable] = {
+    'refresh_all': _refresh_all,
+    'add_part': _add_part,
+    'search_keystroke': _search_keystroke,
+    'switch_tab': _switch_tab,
+    'save': _save
+}
+
+
+def run_operations(app, operations: List[str], iterations: int) -> List[OperationStats]:
+    """Run each operation ``iterations`` times, timing it until Tk is idle again."""
+    root = app.root
+    root.update()
+    results = []
+    for name in operations:
+        operation = OPERATIONS[name]
+        stats = OperationStats(name)
+        for step in range(iterations):
+            start = time.perf_counter()
+            operation(app, step)
+            app.executor.drain()  # Include work the operation handed to background tasks
+            root.update()
+            stats.samples.append(time.perf_counter() - start)
+            stats.widgets.append(count_widgets(root))
+        results.append(stats)
+    return results
+
+
+def run_ui_benchmark(size: int, combos: int = 0, catalog_size: Optional[int] = None,
+                     operations: Optional[List[str]] = None, iterations: int = DEFAULT_ITERATIONS,
+                     seed: int = 0) -> dict:
+    """Build the main window on a generated collection and time the operations."""
+    with tempfile.TemporaryDirectory() as workdir:
+        if catalog_size:
+            # Must be in place before the catalog is first loaded
+            catalog_path = os.path.join(workdir, "catalog.json")
+            write_catalog(catalog_path, catalog_size, seed)
+            os.environ['BEYBLADEX_CATALOG'] = catalog_path
+        from ui.modern_main_window import ModernMainWindow
+        
+        collection = build_collection(size, combos, catalog_size, seed)
+        start = time.perf_counter()
+        app = ModernMainWindow(collection, collection_path=os.path.join(workdir, "collection.json"))
+        app.root.withdraw()
+        app.root.update()
+        startup = time.perf_counter() - start
+        try:
+            widgets = count_widgets(app.root)  # Before any operation builds more
+            results = run_operations(app, operations or list(OPERATIONS), iterations)
+        finally:
+            app.root.destroy()
+    
+    return {
+        'size': size,
+        'combos': combos,
+        'catalog_size': catalog_size,
+        'iterations': iterations,
+        'startup': startup,
+        'startup_widgets': widgets,
+        'operations': [stats.summary() for stats in results],
+        'samples': {stats.name: stats.samples for stats in results}
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"startup {report['startup'] * 1e3:.1f} ms, {report['startup_widgets']:,} widgets",
+             f"{'operation':<20} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} "
+             f"{'widgets':>9} {'growth':>7}"]
+    for op in report['operations']:
+        lines.append(f"{op['name']:<20} {op['p50'] * 1e3:>10.2f} {op['p95'] * 1e3:>10.2f} "
+                     f"{op['p99'] * 1e3:>10.2f} {op['max'] * 1e3:>10.2f} {op['widgets']:>9,} "
+                     f"{op['widget_growth']:>+7}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ui_bench",
+                                     description="Time main window operations on a synthetic collection.")
+    parser.add_argument('--size', type=int, default=1000, help="owned parts")
+    parser.add_argument('--combos', type=int, default=0)
+    parser.add_argument('--catalog-size', type=int, default=None,
+                        help="use a generated catalog of this size instead of the shipped one")
+    parser.add_argument('--ops', nargs='+', choices=list(OPERATIONS), default=None)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON report here")
+    args = parser.parse_args(argv)
+    
+    import tkinter as tk
+    try:
+        report = run_ui_benchmark(args.size, args.combos, args.catalog_size, args.ops, args.iterations, args.seed)
+    except tk.TclError as e:
+        print(f"Tk is unavailable ({e}); run under xvfb-run on a headless machine", file=sys.stderr)
+        return 2
+    
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
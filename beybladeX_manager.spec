@@ -6,7 +6,7 @@ a = Analysis(
     ['beybladeX_manager.py'],
     pathex=[],
     binaries=[],
-    datas=[],  # Removed the non-existent files
+    datas=[('data/catalog.json', 'data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,5 +1,5 @@
 @echo off
 echo Building Beyblade X Manager...
-pyinstaller --onefile --windowed --name "BeybladeX_Manager" --distpath "./release" --workpath "./build_temp" --specpath "./build_temp" main.py
+pyinstaller --onefile --windowed --name "BeybladeX_Manager" --distpath "./release" --workpath "./build_temp" --specpath "./build_temp" --add-data "%~dp0data\catalog.json;data" main.py
 echo Build complete! Check the 'release' folder for your executable.
 pause
@@ -0,0 +1 @@
+"""Headless command-line interface for batch collection operations."""
@@ -0,0 +1,7 @@
+"""Run the command-line interface: python -m cli --help"""
+
+import sys
+from cli.commands import main
+
+
+sys.exit(main())
@@ -0,0 +1,289 @@
+"""Command-line entry point for batch collection operations.
+
+Never imports tkinter or ``ui/``, so it runs on headless servers. Each
+command imports what it needs when it runs, which keeps ``--help`` and
+the cheap commands fast. Collection files may be ``.json``,
+``.json.gz`` or ``.csv`` (parts only).
+
+Usage::
+
+    python -m cli stats collections/*.json --json
+    python -m cli query collection.json --type Blade --search dran
+    python -m cli combos top collection.json --limit 5
+    python -m cli validate collections/*.json
+    python -m cli import new.csv --into collection.json
+    python -m cli export blades.csv --type Blade
+    python -m cli convert-format collection.json collection.json.gz
+    python -m cli bench --quick
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+# Exit statuses: 1 when validation finds problems, 2 when a file cannot be read
+EXIT_INVALID = 1
+EXIT_ERROR = 2
+
+PART_TYPES = ('Blade', 'Ratchet', 'Bit')
+
+
+class CommandError(Exception):
+    """A failure reported as a one-line message with ``EXIT_ERROR``."""
+
+
+def _read(filename: str):
+    from data.persistence import read_collection
+    try:
+        return read_collection(filename)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise CommandError(f"{filename}: cannot read collection: {e}")
+
+
+def _write(collection, filename: str, fmt: Optional[str] = None) -> None:
+    from data.persistence import write_collection
+    try:
+        write_collection(collection, filename, fmt)
+    except (OSError, ValueError) as e:
+        raise CommandError(f"{filename}: cannot write collection: {e}")
+
+
+def _save(collection, filename: str) -> None:
+    """Write back a collection read from ``filename``, failing if it was saved elsewhere meanwhile."""
+    from data.persistence import collection_format, save_collection, CollectionConflictError
+    if collection_format(filename) != 'json':
+        _write(collection, filename)
+        return
+    try:
+        save_collection(collection, filename)
+    except CollectionConflictError as e:
+        raise CommandError(f"{e}; nothing written, run the import again")
+    except OSError as e:
+        raise CommandError(f"{filename}: cannot write collection: {e}")
+
+
+def _print_json(value) -> None:
+    print(json.dumps(value))
+
+
+def _part_row(part) -> str:
+    return f"{part.name:<32} {part.part_type.value:<8} {part.rarity.value:<12} {part.owned_quantity:>4}"
+
+
+def cmd_import(args) -> int:
+    """Merge parts and combos from other files into a collection, summing quantities."""
+    import os
+    from models import Collection
+    target = _read(args.into) if os.path.exists(args.into) else Collection()
+    combo_names = {combo.name for combo in target.combos}
+    for source in args.sources:
+        imported = _read(source)
+        for part in imported.parts:
+            target.add_part(part)
+        new_combos = [combo for combo in imported.combos if combo.name not in combo_names]
+        for combo in new_combos:
+            target.add_combo(combo)
+        combo_names.update(combo.name for combo in new_combos)
+        print(f"{source}: {len(imported.parts)} parts, {len(new_combos)} new combos")
+    _save(target, args.into)
+    print(f"{args.into}: {len(target.parts)} unique parts, {len(target.combos)} combos")
+    return 0
+
+
+def cmd_export(args) -> int:
+    """Write a collection, or the parts matching a query, to another file."""
+    from services.part_service import PartService
+    collection = _read(args.collection)
+    if args.search or args.type != 'All':
+        from models import Collection
+        parts = PartService.filter_parts(collection.parts, args.search, args.type)
+        collection = Collection()
+        collection.parts = parts
+    _write(collection, args.output, args.format)
+    print(f"{args.output}: {len(collection.parts)} parts")
+    return 0
+
+
+def cmd_stats(args) -> int:
+    from services.stats_service import StatsService
+    status = 0
+    for filename in args.files:
+        try:
+            collection = _read(filename)
+        except CommandError as e:
+            status = EXIT_ERROR
+            if args.json:
+                _print_json({'file': filename, 'error': str(e)})
+            else:
+                print(f"error: {e}", file=sys.stderr)
+            continue
+        if args.json:
+            _print_json({'file': filename, **StatsService.summarize(collection)})
+        else:
+            if len(args.files) > 1:
+                print(f"== {filename}")
+            print(StatsService.generate_stats_text(collection))
+    return status
+
+
+def cmd_query(args) -> int:
+    from services.part_service import PartService
+    parts = PartService.filter_parts(_read(args.collection).parts, args.search, args.type)
+    for part in parts:
+        if args.json:
+            _print_json(part.to_dict())
+        else:
+            print(_part_row(part))
+    if not args.json:
+        print(f"{len(parts)} parts")
+    return 0
+
+
+def cmd_combos_top(args) -> int:
+    from services.combo_service import ComboService
+    for rank, (combo, score) in enumerate(ComboService.top_combos(_read(args.collection), args.limit), 1):
+        if args.json:
+            _print_json({'rank': rank, 'name': combo.name, 'score': round(score, 2), 'blade': combo.blade.name,
+                         'ratchet': combo.ratchet.name, 'bit': combo.bit.name})
+        else:
+            print(f"{rank:>3}. {combo.name:<48} {score:6.2f}")
+    return 0
+
+
+def validate_collection(collection) -> List[str]:
+    """Problems that make a collection inconsistent with itself or the catalog."""
+    from data.database import find_database_part
+    problems = []
+    seen = set()
+    owned = set()
+    for part in collection.parts:
+        key = (part.name, part.part_type)
+        if key in seen:
+            problems.append(f"duplicate part {part.name} ({part.part_type.value})")
+        seen.add(key)
+        owned.add(key)
+        if part.owned_quantity < 1:
+            problems.append(f"{part.name} ({part.part_type.value}) has quantity {part.owned_quantity}")
+        catalog_part = find_database_part(part.name, part.part_type)
+        if catalog_part is None:
+            problems.append(f"{part.name} ({part.part_type.value}) is not in the catalog")
+        elif catalog_part.name != part.name:
+            problems.append(f"{part.name} ({part.part_type.value}) is now named {catalog_part.name}")
+    for combo in collection.combos:
+        for part in (combo.blade, combo.ratchet, combo.bit):
+            if (part.name, part.part_type) not in owned:
+                problems.append(f"combo {combo.name} uses {part.name}, which is not in the collection")
+    return problems
+
+
+def cmd_validate(args) -> int:
+    status = 0
+    for filename in args.files:
+        try:
+            problems = validate_collection(_read(filename))
+        except CommandError as e:
+            problems = [str(e)]
+        if problems:
+            status = EXIT_INVALID
+        if args.json:
+            _print_json({'file': filename, 'valid': not problems, 'problems': problems})
+        elif problems:
+            print(f"{filename}: {len(problems)} problems")
+            for problem in problems:
+                print(f"  {problem}")
+        else:
+            print(f"{filename}: OK")
+    return status
+
+
+def cmd_convert(args) -> int:
+    collection = _read(args.source)
+    if args.to == 'csv' or (args.to is None and args.dest.lower().endswith('.csv')):
+        if collection.combos:
+            print(f"warning: CSV holds parts only; {len(collection.combos)} combos not written", file=sys.stderr)
+    _write(collection, args.dest, args.to)
+    print(f"{args.source} -> {args.dest}: {len(collection.parts)} parts")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    from benchmarks.suite import main as bench_main
+    return bench_main(args.bench_args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    formats = ('json', 'json.gz', 'csv')  # data.persistence.COLLECTION_FORMATS, without importing it
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Batch operations on collection files.")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+    
+    def add_query_options(command):
+        command.add_argument('--search', default="", help="part name contains this (case-insensitive)")
+        command.add_argument('--type', default='All', choices=('All',) + PART_TYPES)
+    
+    command = commands.add_parser('import', help="merge collection files into one")
+    command.add_argument('sources', nargs='+', metavar='SOURCE')
+    command.add_argument('--into', default="collection.json", metavar='TARGET',
+                         help="collection to merge into, created if missing (default %(default)s)")
+    command.set_defaults(handler=cmd_import)
+    
+    command = commands.add_parser('export', help="write a collection or matching parts to another file")
+    command.add_argument('output', metavar='OUTPUT')
+    command.add_argument('--collection', default="collection.json", help="(default %(default)s)")
+    command.add_argument('--format', choices=formats, help="output format (default: from the extension)")
+    add_query_options(command)
+    command.set_defaults(handler=cmd_export)
+    
+    command = commands.add_parser('stats', help="collection statistics")
+    command.add_argument('files', nargs='+', metavar='FILE')
+    command.add_argument('--json', action='store_true', help="one JSON summary per line")
+    command.set_defaults(handler=cmd_stats)
+    
+    command = commands.add_parser('query', help="list parts matching a search")
+    command.add_argument('collection', metavar='FILE')
+    command.add_argument('--json', action='store_true', help="one JSON part per line")
+    add_query_options(command)
+    command.set_defaults(handler=cmd_query)
+    
+    combos = commands.add_parser('combos', help="combo reports").add_subparsers(dest='combos_command',
+                                                                              metavar='REPORT')
+    combos.required = True
+    command = combos.add_parser('top', help="highest scoring buildable combos")
+    command.add_argument('collection', metavar='FILE')
+    command.add_argument('--limit', type=int, default=10)
+    command.add_argument('--json', action='store_true', help="one JSON combo per line")
+    command.set_defaults(handler=cmd_combos_top)
+    
+    command = commands.add_parser('validate', help="check collection files against the catalog")
+    command.add_argument('files', nargs='+', metavar='FILE')
+    command.add_argument('--json', action='store_true', help="one JSON result per line")
+    command.set_defaults(handler=cmd_validate)
+    
+    command = commands.add_parser('convert-format', help="convert between .json, .json.gz and .csv")
+    command.add_argument('source', metavar='SOURCE')
+    command.add_argument('dest', metavar='DEST')
+    command.add_argument('--to', choices=formats, help="output format (default: from the extension)")
+    command.set_defaults(handler=cmd_convert)
+    
+    # Its options belong to the benchmark suite; main passes them through
+    command = commands.add_parser('bench', help="run the benchmark suite (python -m benchmarks)", add_help=False)
+    command.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        args.bench_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    try:
+        return args.handler(args)
+    except CommandError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except BrokenPipeError:
+        return 0  # Output piped into head and the like
@@ -1,6 +1,19 @@
 """Data management for Beyblade X."""
 
-from .database import get_all_parts, BEYBLADE_X_DATABASE, find_database_part
-from .persistence import save_collection, load_collection
+from .database import (get_all_parts, BEYBLADE_X_DATABASE, find_database_part, get_catalog, get_search_index,
+                       reload_catalog, CatalogWatcher)
+from .catalog import CatalogDiff
+from .search_index import SearchIndex
+from .migration import migrate_collection, MigrationReport
+from .persistence import (save_collection, load_collection, iter_collection_file, read_collection, write_collection,
+                          collection_format, COLLECTION_FORMATS, merge_collection, file_version,
+                          CollectionConflictError, save_ratings, load_ratings)
+from .battle_log import BattleLog, WinRate
+from .products import PRODUCT_CATALOG, get_all_products, find_product
 
-__all__ = ['get_all_parts', 'BEYBLADE_X_DATABASE', 'find_database_part', 'save_collection', 'load_collection']
+__all__ = ['get_all_parts', 'BEYBLADE_X_DATABASE', 'find_database_part', 'get_catalog', 'get_search_index',
+           'reload_catalog', 'CatalogWatcher', 'CatalogDiff', 'SearchIndex', 'migrate_collection', 'MigrationReport',
+           'save_collection', 'load_collection', 'iter_collection_file', 'read_collection', 'write_collection',
+           'collection_format', 'COLLECTION_FORMATS', 'merge_collection', 'file_version', 'CollectionConflictError',
+           'save_ratings', 'load_ratings', 'BattleLog', 'WinRate',
+           'PRODUCT_CATALOG', 'get_all_products', 'find_product']
@@ -0,0 +1,246 @@
+"""Append-only battle result log with indexed win-rate queries."""
+
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from models import BattleRecord, BeybladeCombo, FinishType, PartType
+
+
+@dataclass
+class WinRate:
+    """Wins out of battles for a combo or part over some period."""
+    wins: int
+    battles: int
+    
+    @property
+    def losses(self) -> int:
+        return self.battles - self.wins
+    
+    @property
+    def rate(self) -> Optional[float]:
+        return self.wins / self.battles if self.battles else None
+
+
+class _PrefixIndex:
+    """Battle rows for one entity, ordered by time, with prefix sums of wins.
+    
+    Any time range resolves to a slice with two bisections, and the wins
+    in that slice are a difference of two prefix sums.
+    """
+    
+    __slots__ = ('times', 'rows', 'won', 'cum_wins')
+    
+    def __init__(self):
+        self.times = array('d')
+        self.rows = array('l')
+        self.won = array('b')
+        self.cum_wins = array('l', [0])
+    
+    def add(self, time: float, row: int, won: bool) -> None:
+        if not self.times or time >= self.times[-1]:
+            self.times.append(time)
+            self.rows.append(row)
+            self.won.append(won)
+            self.cum_wins.append(self.cum_wins[-1] + won)
+            return
+        
+        # Back-dated result: insert in order and rebuild the prefix suffix
+        pos = bisect_right(self.times, time)
+        self.times.insert(pos, time)
+        self.rows.insert(pos, row)
+        self.won.insert(pos, won)
+        self.cum_wins.append(0)
+        for i in range(pos, len(self.won)):
+            self.cum_wins[i + 1] = self.cum_wins[i] + self.won[i]
+    
+    def span(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect_right(self.times, end)
+        return lo, max(lo, hi)
+    
+    def win_rate(self, start: Optional[float], end: Optional[float]) -> WinRate:
+        lo, hi = self.span(start, end)
+        return WinRate(self.cum_wins[hi] - self.cum_wins[lo], hi - lo)
+
+
+def _to_time(moment: Optional[datetime]) -> Optional[float]:
+    return None if moment is None else moment.timestamp()
+
+
+def _combo_key(combo: BeybladeCombo) -> tuple:
+    return (combo.name, combo.blade.name, combo.ratchet.name, combo.bit.name)
+
+
+class BattleLog:
+    """Append-only log of battle results stored as compact JSON lines.
+    
+    Each combo is written once as a definition line; every battle is then
+    a short array ``[timestamp, combo_a_id, combo_b_id, finish, winner]``.
+    """
+    
+    def __init__(self, filename: str = "battles.jsonl"):
+        self.filename = filename
+        self._combos: Dict[int, BeybladeCombo] = {}  # By the id stored in the file
+        self._combo_ids: Dict[tuple, int] = {}
+        self._next_id = 0  # Above every id in the file, including those of skipped definitions
+        
+        # Column storage, one entry per battle row
+        self._times = array('d')
+        self._combo_a = array('l')
+        self._combo_b = array('l')
+        self._finish = array('b')
+        self._b_won = array('b')
+        
+        self._by_combo: Dict[str, _PrefixIndex] = {}
+        self._by_part: Dict[Tuple[str, PartType], _PrefixIndex] = {}
+        self._by_date = _PrefixIndex()
+    
+    def __len__(self) -> int:
+        return len(self._times)
+    
+    def load(self) -> None:
+        """Load and index the log file, skipping unreadable lines."""
+        try:
+            with open(self.filename, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Tolerate a torn final line
+                    try:
+                        if isinstance(entry, dict):
+                            self._load_combo(entry)
+                        else:
+                            self._load_battle(*entry)
+                    except (KeyError, TypeError, ValueError):
+                        continue  # Well-formed JSON of the wrong shape; skip it rather than fail startup
+        except FileNotFoundError:
+            pass  # No battles recorded yet
+    
+    def _load_combo(self, entry: dict) -> None:
+        combo_id = entry['c']
+        if not isinstance(combo_id, int) or combo_id < 0:
+            raise ValueError(f"Bad combo id {combo_id!r}")
+        self._next_id = max(self._next_id, combo_id + 1)  # Reserved even if the definition is unreadable
+        combo = BeybladeCombo.from_dict(entry['combo'])
+        if combo_id not in self._combos:
+            self._define_combo(combo_id, combo)
+    
+    def _load_battle(self, time, combo_a, combo_b, finish, b_won) -> None:
+        # Check every field before _index appends to the columns
+        time, finish = float(time), FinishType[finish]
+        for combo_id in (combo_a, combo_b):
+            if not isinstance(combo_id, int) or combo_id not in self._combos:
+                raise ValueError(f"Unknown combo id {combo_id!r}")
+        if self._combos[combo_a].name == self._combos[combo_b].name:
+            raise ValueError("A combo cannot battle itself")
+        self._index(time, combo_a, combo_b, finish, bool(b_won))
+    
+    def record(self, battle: BattleRecord) -> None:
+        """Append a battle to the log file and the in-memory indexes."""
+        if battle.combo_a.name == battle.combo_b.name:
+            raise ValueError(f"'{battle.combo_a.name}' cannot battle itself")
+        if battle.winner not in (battle.combo_a.name, battle.combo_b.name):
+            raise ValueError(f"Winner '{battle.winner}' is not one of the battling combos")
+        
+        lines = []
+        combo_ids = []
+        new_combos = []
+        for combo in (battle.combo_a, battle.combo_b):
+            combo_id = self._combo_ids.get(_combo_key(combo))
+            if combo_id is None:
+                combo_id = self._next_id + len(new_combos)
+                new_combos.append((combo_id, combo))
+                lines.append(json.dumps({'c': combo_id, 'combo': combo.to_dict()}, separators=(',', ':')))
+            combo_ids.append(combo_id)
+        
+        time = battle.timestamp.timestamp()
+        b_won = not battle.a_won
+        lines.append(json.dumps([time, combo_ids[0], combo_ids[1], battle.finish.name, int(b_won)],
+                                separators=(',', ':')))
+        # A failed write may still have written some lines, so the new ids are
+        # never reused; the combos are registered only once the write succeeded
+        self._next_id += len(new_combos)
+        with open(self.filename, 'ab+') as f:
+            f.seek(0, 2)
+            if f.tell():
+                f.seek(-1, 2)
+                if f.read(1) != b'\n':
+                    lines.insert(0, "")  # End a torn last line rather than extend it
+            f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        
+        for combo_id, combo in new_combos:
+            self._define_combo(combo_id, combo)
+        self._index(time, combo_ids[0], combo_ids[1], battle.finish, b_won)
+    
+    def _define_combo(self, combo_id: int, combo: BeybladeCombo) -> None:
+        self._combos[combo_id] = combo
+        self._combo_ids[_combo_key(combo)] = combo_id
+    
+    def _index(self, time: float, combo_a: int, combo_b: int, finish: FinishType, b_won: bool) -> None:
+        row = len(self._times)
+        self._times.append(time)
+        self._combo_a.append(combo_a)
+        self._combo_b.append(combo_b)
+        self._finish.append(list(FinishType).index(finish))
+        self._b_won.append(b_won)
+        
+        self._by_date.add(time, row, False)
+        for combo_id, won in ((combo_a, not b_won), (combo_b, b_won)):
+            combo = self._combos[combo_id]
+            self._by_combo.setdefault(combo.name, _PrefixIndex()).add(time, row, won)
+            for part in (combo.blade, combo.ratchet, combo.bit):
+                self._by_part.setdefault((part.name, part.part_type), _PrefixIndex()).add(time, row, won)
+    
+    def get_record(self, row: int) -> BattleRecord:
+        """Materialize a single battle row."""
+        combo_a = self._combos[self._combo_a[row]]
+        combo_b = self._combos[self._combo_b[row]]
+        return BattleRecord(
+            combo_a=combo_a,
+            combo_b=combo_b,
+            finish=list(FinishType)[self._finish[row]],
+            winner=combo_b.name if self._b_won[row] else combo_a.name,
+            timestamp=datetime.fromtimestamp(self._times[row])
+        )
+    
+    def _records(self, index: Optional[_PrefixIndex], start: Optional[datetime],
+                 end: Optional[datetime]) -> List[BattleRecord]:
+        if index is None:
+            return []
+        lo, hi = index.span(_to_time(start), _to_time(end))
+        return [self.get_record(row) for row in index.rows[lo:hi]]
+    
+    def records_between(self, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> List[BattleRecord]:
+        """Get battles in a date range, oldest first."""
+        return self._records(self._by_date, start, end)
+    
+    def records_for_combo(self, combo_name: str, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None) -> List[BattleRecord]:
+        """Get battles involving a combo, oldest first."""
+        return self._records(self._by_combo.get(combo_name), start, end)
+    
+    def records_for_part(self, name: str, part_type: PartType, start: Optional[datetime] = None,
+                         end: Optional[datetime] = None) -> List[BattleRecord]:
+        """Get battles involving a part, oldest first."""
+        return self._records(self._by_part.get((name, part_type)), start, end)
+    
+    def combo_win_rate(self, combo_name: str, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> WinRate:
+        """Get a combo's wins and battles in a date range in O(log n)."""
+        index = self._by_combo.get(combo_name)
+        return index.win_rate(_to_time(start), _to_time(end)) if index else WinRate(0, 0)
+    
+    def part_win_rate(self, name: str, part_type: PartType, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> WinRate:
+        """Get a part's wins and battles in a date range in O(log n).
+        
+        Each side a part battles on counts as one appearance, so a mirror
+        match contributes both a win and a loss.
+        """
+        index = self._by_part.get((name, part_type))
+        return index.win_rate(_to_time(start), _to_time(end)) if index else WinRate(0, 0)
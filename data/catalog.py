@@ -0,0 +1,338 @@
+"""Parts catalog loaded from a data file through a compiled, memory-mapped image.
+
+The catalog source is ``catalog.json``. On first use it is compiled into a
+binary image in the user cache directory, named after the SHA-256 of the
+source, so an edited catalog is recompiled automatically. Later starts map
+the image and only decode the parts that are actually accessed.
+
+Image layout (native byte order, the cache is per machine)::
+
+    MAGIC | sha256 digest | record_count, meta_len, index_len, data_len (uint32)
+    meta JSON | name index JSON | record offsets (uint32 * count+1) | records
+
+Each record is a compact JSON array
+``[name, part_type, series, rarity, weight, description]``.
+
+Besides the part lists, the source carries a catalog ``version`` and an
+``aliases`` map of retired or regional names per part type, e.g.
+``{"Blade": {"Hells Scythe": "Hell's Scythe"}}``. Alias chains are
+resolved when compiling, so every alias points at a current part.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from models import BeybladePart, PartType, Rarity
+
+
+MAGIC = b'BXCAT002'
+_HEADER = struct.Struct('=IIII')
+_PREFIX_SIZE = len(MAGIC) + hashlib.sha256().digest_size + _HEADER.size
+_OFFSET_SIZE = array('I').itemsize
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_ENV_VAR = "BEYBLADEX_CATALOG"
+
+
+def _bundle_dir() -> str:
+    """Directory holding the bundled catalog (PyInstaller extracts to _MEIPASS)."""
+    base = getattr(sys, '_MEIPASS', None)
+    if base:
+        return os.path.join(base, 'data')
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def catalog_source_path() -> str:
+    """Locate the catalog source file.
+    
+    An explicit ``BEYBLADEX_CATALOG`` path wins, then a ``catalog.json`` in
+    the working directory (next to ``collection.json``), so the catalog can
+    be updated without rebuilding the executable. Otherwise the bundled
+    catalog is used.
+    """
+    override = os.environ.get(CATALOG_ENV_VAR)
+    if override:
+        return override
+    if os.path.isfile(CATALOG_FILENAME):
+        return os.path.abspath(CATALOG_FILENAME)
+    return os.path.join(_bundle_dir(), CATALOG_FILENAME)
+
+
+def cache_dir() -> str:
+    """Per-user cache directory for compiled catalog images."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()
+        return os.path.join(base, 'BeybladeX_Manager', 'cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'beybladex_manager')
+
+
+def _index_key(name: str, part_type: PartType) -> str:
+    return f"{part_type.value}|{name}"
+
+
+def _resolve_aliases(aliases: dict, index: Dict[str, int]) -> Dict[str, str]:
+    """Flatten per-type alias maps into "Type|Old" -> current name, following chains."""
+    flat = {}
+    for part_type_value, names in aliases.items():
+        part_type = PartType(part_type_value)
+        for old_name, new_name in names.items():
+            flat[_index_key(old_name, part_type)] = (part_type, new_name)
+    
+    resolved = {}
+    for key, (part_type, name) in flat.items():
+        seen = {key}
+        target = _index_key(name, part_type)
+        while target in flat:
+            if target in seen:
+                raise ValueError(f"Alias cycle through {key}")
+            seen.add(target)
+            name = flat[target][1]
+            target = _index_key(name, part_type)
+        if target not in index:
+            raise ValueError(f"Alias {key} points to unknown part {target}")
+        if key in index:
+            raise ValueError(f"Alias {key} shadows a catalog part")
+        resolved[key] = name
+    return resolved
+
+
+def compile_catalog(source: bytes) -> bytes:
+    """Compile catalog JSON into the binary image format."""
+    document = json.loads(source)
+    categories = []
+    index: Dict[str, int] = {}
+    offsets = array('I', [0])
+    records = bytearray()
+    
+    for key, parts in document.items():
+        if not isinstance(parts, list):
+            continue  # Scalar metadata such as the catalog version
+        first = len(offsets) - 1
+        for entry in parts:
+            part_type = PartType(entry['part_type'])
+            rarity = Rarity(entry['rarity'])  # Validate now rather than on access
+            row = [entry['name'], part_type.value, entry['series'], rarity.value,
+                   entry.get('weight'), entry.get('description')]
+            part_key = _index_key(entry['name'], part_type)
+            if part_key in index:
+                raise ValueError(f"Duplicate catalog part: {part_key}")
+            index[part_key] = len(offsets) - 1
+            records += json.dumps(row, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            offsets.append(len(records))
+        categories.append([key, first, len(offsets) - 1 - first])
+    
+    meta = {key: value for key, value in document.items() if not isinstance(value, list)}
+    meta['categories'] = categories
+    meta['aliases'] = _resolve_aliases(document.get('aliases', {}), index)
+    meta_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    index_bytes = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    return b''.join([
+        MAGIC,
+        hashlib.sha256(source).digest(),
+        _HEADER.pack(len(offsets) - 1, len(meta_bytes), len(index_bytes), len(records)),
+        meta_bytes,
+        index_bytes,
+        offsets.tobytes(),
+        bytes(records)
+    ])
+
+
+class CatalogView(Sequence):
+    """Read-only, lazily instantiated run of catalog parts."""
+    
+    def __init__(self, catalog: 'Catalog', start: int, count: int):
+        self._catalog = catalog
+        self._start = start
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._catalog.part(self._start + i) for i in range(*item.indices(self._count))]
+        if item < 0:
+            item += self._count
+        if not 0 <= item < self._count:
+            raise IndexError("catalog index out of range")
+        return self._catalog.part(self._start + item)
+    
+    def __iter__(self):
+        part = self._catalog.part
+        for record in range(self._start, self._start + self._count):
+            yield part(record)
+
+
+class Catalog(Mapping):
+    """Catalog image mapping category names ("blades", ...) to lazy part views.
+    
+    Parts are decoded on first access and cached, so repeated lookups
+    return the same object, as the former in-memory database did.
+    """
+    
+    def __init__(self, buffer, digest: bytes, source_path: Optional[str] = None):
+        self.source_path = source_path
+        self.digest = digest
+        self._buffer = buffer
+        
+        count, meta_len, index_len, data_len = _HEADER.unpack_from(buffer, len(MAGIC) + len(digest))
+        position = _PREFIX_SIZE
+        self.meta = json.loads(bytes(buffer[position:position + meta_len]))
+        position += meta_len
+        self._index_span = (position, position + index_len)
+        self._index: Optional[Dict[str, int]] = None
+        position += index_len
+        self._offsets = memoryview(buffer)[position:position + _OFFSET_SIZE * (count + 1)].cast('I')
+        self._data_start = position + _OFFSET_SIZE * (count + 1)
+        self._parts: List[Optional[BeybladePart]] = [None] * count
+        
+        self._categories = {key: CatalogView(self, first, size) for key, first, size in self.meta['categories']}
+        self._all = CatalogView(self, 0, count)
+    
+    @property
+    def version(self) -> int:
+        return self.meta.get('version', 1)
+    
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """Retired or regional names ("Type|Name") mapped to current part names."""
+        return self.meta['aliases']
+    
+    def resolve(self, name: str, part_type: PartType) -> str:
+        """Current catalog name for a possibly retired or regional part name."""
+        return self.aliases.get(_index_key(name, part_type), name)
+    
+    def __getitem__(self, category: str) -> CatalogView:
+        return self._categories[category]
+    
+    def __iter__(self):
+        return iter(self._categories)
+    
+    def __len__(self) -> int:
+        return len(self._categories)
+    
+    def all_parts(self) -> CatalogView:
+        return self._all
+    
+    def part(self, record: int) -> BeybladePart:
+        part = self._parts[record]
+        if part is None:
+            start = self._data_start + self._offsets[record]
+            end = self._data_start + self._offsets[record + 1]
+            name, part_type, series, rarity, weight, description = json.loads(bytes(self._buffer[start:end]))
+            part = BeybladePart(name, PartType(part_type), series, Rarity(rarity), weight, description)
+            self._parts[record] = part
+        return part
+    
+    def _record_bytes(self, record: int) -> bytes:
+        return bytes(self._buffer[self._data_start + self._offsets[record]:self._data_start + self._offsets[record + 1]])
+    
+    @property
+    def index(self) -> Dict[str, int]:
+        """Name index ("Type|Name" to record), decoded on first use."""
+        if self._index is None:
+            start, end = self._index_span
+            self._index = json.loads(bytes(self._buffer[start:end]))
+        return self._index
+    
+    def position(self, name: str, part_type: PartType) -> Optional[int]:
+        """Record number of a part, which is also its position in catalog order."""
+        return self.index.get(_index_key(name, part_type))
+    
+    def find(self, name: str, part_type: PartType) -> Optional[BeybladePart]:
+        """Look up a part by name or alias through the image's name index."""
+        record = self.position(self.resolve(name, part_type), part_type)
+        return None if record is None else self.part(record)
+
+
+@dataclass
+class CatalogDiff:
+    """Parts added, removed and changed between two catalog versions."""
+    added: List[BeybladePart] = field(default_factory=list)
+    removed: List[BeybladePart] = field(default_factory=list)
+    changed: List[Tuple[BeybladePart, BeybladePart]] = field(default_factory=list)  # (old, new)
+    
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_catalogs(old: Catalog, new: Catalog) -> CatalogDiff:
+    """Keyed diff of two catalogs by (name, part type).
+    
+    Records are compared as raw image bytes, so only added, removed and
+    changed parts are decoded. Parts already decoded from the old catalog
+    that did not change are carried over to the new one.
+    """
+    diff = CatalogDiff()
+    old_index = old.index
+    for key, record in new.index.items():
+        old_record = old_index.get(key)
+        if old_record is None:
+            diff.added.append(new.part(record))
+        elif old._record_bytes(old_record) == new._record_bytes(record):
+            if new._parts[record] is None:
+                new._parts[record] = old._parts[old_record]
+        else:
+            diff.changed.append((old.part(old_record), new.part(record)))
+    
+    new_index = new.index
+    for key, record in old_index.items():
+        if key not in new_index:
+            diff.removed.append(old.part(record))
+    return diff
+
+
+def _read_image(path: str, digest: bytes) -> Optional[mmap.mmap]:
+    """Map a cached image, or return None if it is missing or stale."""
+    try:
+        with open(path, 'rb') as f:
+            image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None  # Missing or empty file
+    if image[:len(MAGIC)] != MAGIC or image[len(MAGIC):len(MAGIC) + len(digest)] != digest:
+        image.close()
+        return None
+    return image
+
+
+def _write_image(path: str, image: bytes) -> bool:
+    """Atomically write an image to the cache, returning False if not writable."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(image)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+def load_catalog(source_path: Optional[str] = None) -> Catalog:
+    """Load the catalog, compiling and caching its image when the source changed."""
+    if source_path is None:
+        source_path = catalog_source_path()
+    with open(source_path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha256(source).digest()
+    image_path = os.path.join(cache_dir(), f"catalog-{digest.hex()[:16]}.bin")
+    
+    image = _read_image(image_path, digest)
+    if image is None:
+        compiled = compile_catalog(source)
+        image = _read_image(image_path, digest) if _write_image(image_path, compiled) else None
+        if image is None:
+            return Catalog(compiled, digest, source_path)  # Read-only cache: use it from memory
+    return Catalog(image, digest, source_path)
+
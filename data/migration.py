@@ -0,0 +1,78 @@
+"""Bulk migration of collections to the current catalog's part names."""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+from models import BeybladePart, Collection, PartType
+from .catalog import Catalog
+from .database import get_catalog
+
+
+@dataclass
+class MigrationReport:
+    """What a migration rewrote."""
+    from_version: Optional[int]
+    to_version: int
+    renamed: int = 0
+    merged: int = 0
+    combo_parts: int = 0
+    
+    @property
+    def changed(self) -> bool:
+        return bool(self.renamed or self.merged or self.combo_parts)
+
+
+def _renamed(part: BeybladePart, name: str, catalog: Catalog) -> BeybladePart:
+    """Copy of a part under its current name, with current catalog details."""
+    current = catalog.find(name, part.part_type)
+    if current is None:
+        return replace(part, name=name)
+    return replace(part, name=name, series=current.series, rarity=current.rarity,
+                   weight=current.weight, description=current.description)
+
+
+def migrate_collection(collection: Collection, catalog: Optional[Catalog] = None) -> MigrationReport:
+    """Rename aliased parts in a collection and its combos to current catalog names.
+    
+    One linear pass probes each part against the catalog's alias hash map
+    and hash-aggregates parts by their resolved key, so parts whose names
+    collapse into one are merged with their quantities summed (the first
+    entry's condition is kept). Combo parts are rewritten in a second pass.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    report = MigrationReport(collection.catalog_version, catalog.version)
+    
+    if catalog.aliases:
+        merged: Dict[Tuple[str, PartType], BeybladePart] = {}
+        for part in collection.parts:
+            name = catalog.resolve(part.name, part.part_type)
+            if name != part.name:
+                part = _renamed(part, name, catalog)
+                report.renamed += 1
+            target = merged.get((name, part.part_type))
+            if target is None:
+                merged[(name, part.part_type)] = part
+            else:
+                target.owned_quantity += part.owned_quantity
+                report.merged += 1
+        if report.changed:
+            collection.parts = list(merged.values())
+        
+        combos = []
+        for combo in collection.combos:
+            renamed = {}
+            for slot in ('blade', 'ratchet', 'bit'):
+                part = getattr(combo, slot)
+                name = catalog.resolve(part.name, part.part_type)
+                if name != part.name:
+                    renamed[slot] = _renamed(part, name, catalog)
+            if renamed:
+                combo = replace(combo, **renamed)
+                report.combo_parts += len(renamed)
+            combos.append(combo)
+        if report.combo_parts:
+            # Replaced rather than edited, so collection snapshots keep the old combos
+            collection.combos = combos
+    
+    collection.catalog_version = catalog.version
+    return report
@@ -1,28 +1,400 @@
-"""Collection persistence to JSON files."""
+"""Collection persistence to JSON files.
 
+Saving is safe with several app instances (or the API server) sharing a
+file. The file carries a save counter, ``version``, and a collection
+remembers the version it was loaded from (``Collection.saved``). A save
+takes an advisory lock on ``<file>.lock`` and checks that the file is
+still at that version. Otherwise it raises ``CollectionConflictError``,
+or, with ``merge=True``, merges the local changes into what the other
+instance saved. The new file is written beside the old one and renamed
+over it, so readers never lock and never see a partial file.
+"""
+
+import csv
+import gzip
 import json
-from typing import Tuple
-from models import Collection, BeybladePart, BeybladeCombo
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+from models import Collection, CollectionSnapshot, BeybladePart, BeybladeCombo, PartType, Rarity, SavedState
+from diagnostics import timed
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-def save_collection(collection: Collection, filename: str = "collection.json") -> None:
-    """Save collection to JSON file."""
-    data = {
-        'parts': [part.to_dict() for part in collection.parts],
-        'combos': [combo.to_dict() for combo in collection.combos]
-    }
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+
+PART_BATCH_SIZE = 1000
+
+# Formats read_collection/write_collection handle, by file extension.
+# CSV holds parts only, one row per part with these columns.
+COLLECTION_FORMATS = ('json', 'json.gz', 'csv')
+CSV_FIELDS = ['name', 'part_type', 'series', 'rarity', 'weight', 'description', 'owned_quantity', 'condition']
+
+LOCK_SUFFIX = ".lock"
+REPLACE_RETRIES = 20  # Windows refuses to replace a file a reader has open; retry briefly
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+_VERSION_HEAD = re.compile(r'\s*\{\s*"version"\s*:\s*(\d+)')
+
+
+class CollectionConflictError(Exception):
+    """Raised when the file was saved by someone else since the collection was loaded."""
+    
+    def __init__(self, filename: str, expected: int, found: int):
+        super().__init__(f"{filename} was saved elsewhere (version {found}, loaded {expected})")
+        self.filename = filename
+        self.expected = expected
+        self.found = found
+
+
+@timed("persistence.save_collection")
+def save_collection(collection: Collection, filename: str = "collection.json", merge: bool = False) -> None:
+    """Save collection to JSON file, refusing to overwrite changes saved elsewhere.
+    
+    With ``merge``, a conflicting file is merged into ``collection`` (see
+    ``merge_collection``) and the result saved instead of raising. A
+    snapshot cannot be merged into; merge the live collection instead.
+    """
+    if merge and isinstance(collection, CollectionSnapshot):
+        raise TypeError("A collection snapshot is read-only; save the live collection with merge=True")
+    with _locked(filename):
+        found = file_version(filename)
+        if found is not None and found != collection.saved.version:
+            if not merge:
+                raise CollectionConflictError(filename, collection.saved.version, found)
+            merge_collection(collection, read_collection(filename, 'json'))
+        version = max(found or 0, collection.saved.version) + 1
+        _write_atomic(filename, lambda f: _dump_collection(collection, f, version))
+        collection.saved = collection.saved_state(version)
+
+
+def merge_collection(ours: Collection, theirs: Collection) -> None:
+    """Apply the changes made to ``ours`` since it was saved onto ``theirs``, in place in ``ours``.
+    
+    A three-way merge against ``ours.saved``: quantity changes are added
+    to theirs, and combos added or deleted locally are added or deleted.
+    Listeners are not notified, as after a migration; callers refresh.
+    """
+    base = ours.saved
+    quantities = {(part.name, part.part_type): part.owned_quantity for part in theirs.parts}
+    ours_keys = set()
+    for part in ours.parts:
+        key = (part.name, part.part_type)
+        ours_keys.add(key)
+        quantities[key] = quantities.get(key, 0) + part.owned_quantity - base.quantities.get(key, 0)
+    for key, quantity in base.quantities.items():
+        if key not in ours_keys and key in quantities:
+            quantities[key] -= quantity  # Removed here
+    
+    parts = []
+    for part in ours.parts + theirs.parts:
+        quantity = quantities.pop((part.name, part.part_type), 0)
+        if quantity > 0:
+            part.owned_quantity = quantity
+            parts.append(part)
+    
+    ours_names = {combo.name for combo in ours.combos}
+    theirs_names = {combo.name for combo in theirs.combos}
+    combos = [combo for combo in theirs.combos if combo.name in ours_names or combo.name not in base.combo_names]
+    combos += [combo for combo in ours.combos if combo.name not in base.combo_names and combo.name not in theirs_names]
+    
+    ours.parts = parts
+    ours.combos = combos
+    if ours.catalog_version != theirs.catalog_version:
+        ours.catalog_version = None  # Migrate again, since part names may be mixed
+    ours.saved = theirs.saved
 
 
+def file_version(filename: str) -> Optional[int]:
+    """The save counter of a collection file, or None if there is no file.
+    
+    Saves write it first, so normally only the head is read; files from
+    before versioning count as version 0.
+    """
+    try:
+        with open(filename, 'r') as f:
+            head = f.read(256)
+            match = _VERSION_HEAD.match(head)
+            if match:
+                return int(match.group(1))
+            text = head + f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        for key, value in _stream_members(text):
+            if key == 'version':
+                return value
+    except json.JSONDecodeError:
+        pass  # Damaged; saving over it is the only way forward
+    return 0
+
+
+@contextmanager
+def _locked(filename: str):
+    """Hold the advisory lock serializing saves of ``filename``; readers never take it."""
+    with open(filename + LOCK_SUFFIX, 'a+b') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ten seconds; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(filename: str, write: Callable) -> None:
+    """Write a new file beside ``filename`` and rename it over the old one."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(temp_path, filename)
+                break
+            except PermissionError:
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(0.05)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+@timed("persistence.load_collection")
 def load_collection(filename: str = "collection.json") -> Collection:
     """Load collection from JSON file."""
     collection = Collection()
     try:
         with open(filename, 'r') as f:
             data = json.load(f)
-        collection.parts = [BeybladePart.from_dict(part_data) for part_data in data.get('parts', [])]
-        collection.combos = [BeybladeCombo.from_dict(combo_data) for combo_data in data.get('combos', [])]
+        collection = collection_from_dict(data)
     except (FileNotFoundError, json.JSONDecodeError):
         pass  # Return empty collection if file doesn't exist or is invalid
     return collection
+
+
+def _dump_collection(collection: Collection, f, version: int) -> None:
+    """Write the collection JSON with one part or combo per line.
+    
+    ``json.dump`` with ``indent`` falls back to the pure-Python encoder,
+    which dominated saves of large collections. Encoding each record on
+    its own keeps them on the C encoder and the file still diffs well.
+    """
+    def write_array(records):
+        f.write("[" + ",".join("\n    " + json.dumps(record.to_dict()) for record in records)
+                + ("\n  ]" if records else "]"))
+    
+    f.write('{\n  "version": %d,\n  "parts": ' % version)
+    write_array(collection.parts)
+    f.write(',\n  "combos": ')
+    write_array(collection.combos)
+    f.write(',\n  "catalog_version": %s\n}\n' % json.dumps(collection.catalog_version))
+
+
+def collection_to_dict(collection: Collection) -> dict:
+    return {
+        'version': collection.saved.version,
+        'parts': [part.to_dict() for part in collection.parts],
+        'combos': [combo.to_dict() for combo in collection.combos],
+        'catalog_version': collection.catalog_version
+    }
+
+
+def collection_from_dict(data: dict) -> Collection:
+    collection = Collection()
+    collection.parts = [BeybladePart.from_dict(part_data) for part_data in data.get('parts', [])]
+    collection.combos = [BeybladeCombo.from_dict(combo_data) for combo_data in data.get('combos', [])]
+    collection.catalog_version = data.get('catalog_version')
+    collection.saved = collection.saved_state(data.get('version', 0))
+    return collection
+
+
+def collection_format(filename: str) -> str:
+    """The format of a collection file, from its extension."""
+    lower = filename.lower()
+    for fmt in sorted(COLLECTION_FORMATS, key=len, reverse=True):
+        if lower.endswith('.' + fmt):
+            return fmt
+    raise ValueError(f"Unknown collection format for {filename}; expected one of "
+                     f"{', '.join('.' + fmt for fmt in COLLECTION_FORMATS)}")
+
+
+def read_collection(filename: str, fmt: Optional[str] = None) -> Collection:
+    """Read a collection file in any supported format.
+    
+    Unlike ``load_collection`` this is strict: a missing or damaged file
+    raises (``OSError``, or ``ValueError``/``KeyError`` for bad content).
+    """
+    fmt = fmt or collection_format(filename)
+    if fmt == 'csv':
+        collection = Collection()
+        with open(filename, 'r', newline='', encoding='utf-8') as f:
+            collection.parts = [_part_from_row(row) for row in csv.DictReader(f)]
+        return collection
+    opener = gzip.open if fmt == 'json.gz' else open
+    with opener(filename, 'rt', encoding='utf-8') as f:
+        return collection_from_dict(json.load(f))
+
+
+def write_collection(collection: Collection, filename: str, fmt: Optional[str] = None) -> None:
+    """Write a collection in any supported format; CSV drops combos.
+    
+    A ``.json`` file may be an app's live collection, so it is replaced
+    under the save lock and with a newer version than the file had. An
+    instance still holding the old contents then gets a conflict on save
+    instead of silently writing over this.
+    """
+    fmt = fmt or collection_format(filename)
+    if fmt == 'json':
+        with _locked(filename):
+            version = max(file_version(filename) or 0, collection.saved.version) + 1
+            _write_atomic(filename, lambda f: _dump_collection(collection, f, version))
+        return
+    if fmt == 'csv':
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(part.to_dict() for part in collection.parts)
+        return
+    with gzip.open(filename, 'wt', encoding='utf-8') as f:
+        _dump_collection(collection, f, collection.saved.version)
+
+
+def _part_from_row(row: dict) -> BeybladePart:
+    return BeybladePart(
+        name=row['name'],
+        part_type=PartType(row['part_type']),
+        series=row['series'],
+        rarity=Rarity(row['rarity']),
+        weight=float(row['weight']) if row.get('weight') else None,
+        description=row.get('description') or None,
+        owned_quantity=int(row.get('owned_quantity') or 0),
+        condition=row.get('condition') or 'New'
+    )
+
+
+def _stream_members(text: str) -> Iterator[Tuple[str, object]]:
+    """Decode a top-level JSON object member by member.
+    
+    Yields ``(key, value)``; array values are yielded one ``(key, element)``
+    per element instead, so a large list never has to be decoded in one
+    call (which would hold the GIL throughout).
+    """
+    def skip(pos):
+        return _WHITESPACE.match(text, pos).end()
+    
+    def expect(pos, chars):
+        if pos >= len(text) or text[pos] not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", text, pos)
+        return text[pos]
+    
+    pos = skip(0)
+    expect(pos, '{')
+    pos = skip(pos + 1)
+    if text.startswith('}', pos):
+        return
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = skip(pos)
+        expect(pos, ':')
+        pos = skip(pos + 1)
+        if text.startswith('[', pos):
+            pos = skip(pos + 1)
+            if text.startswith(']', pos):
+                pos += 1
+            else:
+                while True:
+                    value, pos = _decoder.raw_decode(text, pos)
+                    yield key, value
+                    pos = skip(pos)
+                    if expect(pos, ',]') == ']':
+                        pos += 1
+                        break
+                    pos = skip(pos + 1)
+        else:
+            value, pos = _decoder.raw_decode(text, pos)
+            yield key, value
+        pos = skip(pos)
+        if expect(pos, ',}') == '}':
+            return
+        pos = skip(pos + 1)
+
+
+def iter_collection_file(filename: str = "collection.json",
+                         batch_size: int = PART_BATCH_SIZE) -> Iterator[tuple]:
+    """Decode a collection file incrementally, for loading on a worker thread.
+    
+    Yields ``('parts', [BeybladePart, ...])`` batches as they are decoded,
+    then ``('done', combos, catalog_version, saved)``. ``saved`` is the
+    ``SavedState`` of the file as decoded, unaffected by edits made to the
+    delivered parts meanwhile. A missing file yields only
+    ``('done', [], None, SavedState())``; a damaged one raises
+    ``json.JSONDecodeError`` after the batches before the damage.
+    """
+    try:
+        with open(filename, 'r') as f:
+            text = f.read()
+    except FileNotFoundError:
+        yield 'done', [], None, SavedState()
+        return
+    
+    batch, combos, catalog_version, version = [], [], None, 0
+    quantities = {}
+    for key, value in _stream_members(text):
+        if key == 'parts':
+            part = BeybladePart.from_dict(value)
+            quantities[(part.name, part.part_type)] = part.owned_quantity
+            batch.append(part)
+            if len(batch) >= batch_size:
+                yield 'parts', batch
+                batch = []
+        elif key == 'combos':
+            combos.append(BeybladeCombo.from_dict(value))
+        elif key == 'catalog_version':
+            catalog_version = value
+        elif key == 'version':
+            version = value
+    if batch:
+        yield 'parts', batch
+    yield 'done', combos, catalog_version, SavedState(version, quantities,
+                                                      frozenset(combo.name for combo in combos))
+
+
+def save_ratings(ratings: dict, filename: str = "ratings.json") -> None:
+    """Save serialized ratings to JSON file."""
+    with open(filename, 'w') as f:
+        json.dump(ratings, f)
+
+
+def load_ratings(filename: str = "ratings.json") -> dict:
+    """Load serialized ratings from JSON file."""
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}  # Ratings are rebuilt from the battle log
@@ -0,0 +1,66 @@
+"""Beyblade X retail product catalog."""
+
+from typing import List, Optional
+from models import Product, PartType
+
+
+def _combo(blade: str, ratchet: str, bit: str):
+    return [(blade, PartType.BLADE), (ratchet, PartType.RATCHET), (bit, PartType.BIT)]
+
+
+PRODUCT_CATALOG = [
+    # Starters and boosters (one blade, ratchet and bit each)
+    Product("BX-01", "Starter Dran Sword 3-60F", 14.99, _combo("Dran Sword", "3-60", "Flat")),
+    Product("BX-02", "Starter Hell's Scythe 4-60T", 14.99, _combo("Hell's Scythe", "4-60", "Taper")),
+    Product("BX-03", "Starter Wizard Arrow 4-80B", 14.99, _combo("Wizard Arrow", "4-80", "Ball")),
+    Product("BX-04", "Starter Knight Shield 3-80N", 14.99, _combo("Knight Shield", "3-80", "Needle")),
+    Product("BX-05", "Booster Shark Edge 3-60LF", 12.99, _combo("Shark Edge", "3-60", "Low Flat")),
+    Product("BX-06", "Booster Dran Buster 1-60A", 12.99, _combo("Dran Buster", "1-60", "Accel")),
+    Product("BX-07", "Starter Phoenix Wing 9-60GB", 16.99, _combo("Phoenix Wing", "9-60", "Gear Ball")),
+    Product("BX-08", "Booster Cobalt Dragoon 2-60R", 12.99, _combo("Cobalt Dragoon", "2-60", "Rush")),
+    Product("BX-09", "Booster Tyranno Beat 4-70H", 12.99, _combo("Tyranno Beat", "4-70", "Hunter")),
+    Product("BX-10", "Booster Leon Crest 7-60G", 12.99, _combo("Leon Crest", "7-60", "Guard")),
+    Product("BX-11", "Booster Viper Tail 5-60P", 12.99, _combo("Viper Tail", "5-60", "Point")),
+    Product("BX-12", "Booster Phoenix Feather 5-70O", 12.99, _combo("Phoenix Feather", "5-70", "Orb")),
+    Product("BX-13", "Booster Whale Wave 5-80D", 12.99, _combo("Whale Wave", "5-80", "Defense")),
+    Product("BX-14", "Booster Spider Web 6-70U", 12.99, _combo("Spider Web", "6-70", "Unite")),
+    Product("BX-15", "Starter Tiger Claw 8-60X", 16.99, _combo("Tiger Claw", "8-60", "Xtreme")),
+    Product("BX-16", "Booster Eagle Eye 3-70E", 12.99, _combo("Eagle Eye", "3-70", "Eternal")),
+    Product("BX-17", "Booster Rhino Horn 6-80M", 12.99, _combo("Rhino Horn", "6-80", "Massive")),
+    Product("BX-18", "Booster Wolf Fang 6-60S", 12.99, _combo("Wolf Fang", "6-60", "Survive")),
+    Product("BX-19", "Booster Falcon Wing 7-70V", 12.99, _combo("Falcon Wing", "7-70", "Variable")),
+    Product("BX-20", "Starter Scorpion Spear 10-75RV", 19.99, _combo("Scorpion Spear", "10-75", "Revolve")),
+    
+    # Customize sets
+    Product("BX-21", "Ratchet & Bit Set 8-70HT/MT", 9.99,
+            [("8-70", PartType.RATCHET), ("High Taper", PartType.BIT), ("Motor", PartType.BIT)]),
+    Product("BX-22", "Bit Booster Pack BR/AT", 7.99,
+            [("Bearing", PartType.BIT), ("Atomic", PartType.BIT)]),
+    
+    # Multi-packs
+    Product("BX-23", "Battle Entry Set", 39.99,
+            _combo("Dran Sword", "3-60", "Flat") + _combo("Hell's Scythe", "4-60", "Taper")
+            + _combo("Wizard Arrow", "4-80", "Ball")),
+    Product("BX-24", "3on3 Deck Set", 34.99,
+            _combo("Knight Shield", "3-80", "Needle") + _combo("Leon Crest", "7-60", "Guard")
+            + _combo("Wolf Fang", "6-60", "Survive")),
+    
+    # Limited editions
+    Product("BX-01G", "Limited Dran Sword (Gold) 3-60F", 29.99, _combo("Dran Sword (Gold)", "3-60", "Flat")),
+    Product("BX-07C", "Limited Phoenix Wing (Crystal) 9-60GB", 34.99,
+            _combo("Phoenix Wing (Crystal)", "9-60", "Gear Ball")),
+    Product("BX-10B", "Limited Leon Crest (Black) 7-60G", 29.99, _combo("Leon Crest (Black)", "7-60", "Guard")),
+]
+
+
+def get_all_products() -> List[Product]:
+    """Get all products in the catalog."""
+    return list(PRODUCT_CATALOG)
+
+
+def find_product(sku: str) -> Optional[Product]:
+    """Find a product by SKU."""
+    for product in PRODUCT_CATALOG:
+        if product.sku == sku:
+            return product
+    return None
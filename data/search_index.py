@@ -0,0 +1,124 @@
+"""Trigram index for substring search over catalog parts."""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+from models import BeybladePart, PartType
+from diagnostics import timed
+
+
+PartKey = Tuple[str, PartType]
+
+SEARCH_FIELDS = ('name', 'description')
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _texts(part: BeybladePart) -> Dict[str, str]:
+    return {'name': part.name.lower(), 'description': (part.description or "").lower()}
+
+
+class SearchIndex:
+    """Case-insensitive substring search on part names and descriptions.
+    
+    Every lowered field is split into trigrams; a query of three or more
+    characters intersects the postings of its trigrams and only verifies
+    those candidates. Parts can be added and removed one at a time, so a
+    catalog reload only touches the parts that changed; ``patched`` does
+    that on a copy, since searches on other threads may be reading this one.
+    """
+    
+    def __init__(self, parts: Iterable[BeybladePart] = ()):
+        self._text: Dict[PartKey, Dict[str, str]] = {}
+        self._postings: Dict[str, Dict[str, Set[PartKey]]] = {name: {} for name in SEARCH_FIELDS}
+        for part in parts:
+            self.add(part)
+    
+    def __len__(self) -> int:
+        return len(self._text)
+    
+    def add(self, part: BeybladePart) -> None:
+        key = (part.name, part.part_type)
+        if key in self._text:
+            self.remove(key)
+        texts = _texts(part)
+        self._text[key] = texts
+        for name, text in texts.items():
+            postings = self._postings[name]
+            for trigram in _trigrams(text):
+                postings.setdefault(trigram, set()).add(key)
+    
+    def remove(self, key: PartKey) -> None:
+        texts = self._text.pop(key, None)
+        if texts is None:
+            return
+        for name, text in texts.items():
+            postings = self._postings[name]
+            for trigram in _trigrams(text):
+                keys = postings.get(trigram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[trigram]
+    
+    def patched(self, removed: Iterable[PartKey], added: Iterable[BeybladePart]) -> 'SearchIndex':
+        """A new index with parts removed and added, leaving this one untouched.
+        
+        The dicts are copied shallowly and only the posting sets of the
+        changed parts' trigrams are copied before being modified, so the
+        cost follows the size of the change rather than of the catalog.
+        """
+        removed, added = list(removed), list(added)
+        index = SearchIndex()
+        index._text = dict(self._text)
+        index._postings = {name: dict(postings) for name, postings in self._postings.items()}
+        
+        changed = [self._text[key] for key in removed if key in self._text]
+        for part in added:
+            changed.append(_texts(part))
+            old = self._text.get((part.name, part.part_type))
+            if old is not None:
+                changed.append(old)
+        for texts in changed:
+            for name, text in texts.items():
+                postings = index._postings[name]
+                for trigram in _trigrams(text):
+                    if trigram in postings and postings[trigram] is self._postings[name].get(trigram):
+                        postings[trigram] = set(postings[trigram])
+        
+        for key in removed:
+            index.remove(key)
+        for part in added:
+            index.add(part)
+        return index
+    
+    def matches(self, part: BeybladePart, term: str, fields: Iterable[str] = SEARCH_FIELDS) -> bool:
+        """Check a single part against a search term without the postings."""
+        term = term.lower()
+        texts = self._text.get((part.name, part.part_type))
+        if texts is None:
+            texts = _texts(part)
+        return any(term in texts[name] for name in fields)
+    
+    @timed("search_index.search")
+    def search(self, term: str, fields: Iterable[str] = SEARCH_FIELDS) -> Optional[Set[PartKey]]:
+        """Keys of parts containing the term in any of the fields.
+        
+        Returns None for an empty term, meaning every part matches.
+        """
+        term = term.lower()
+        if not term:
+            return None
+        fields = tuple(fields)
+        if len(term) < 3:
+            return {key for key, texts in self._text.items() if any(term in texts[name] for name in fields)}
+        
+        found: Set[PartKey] = set()
+        trigrams = sorted(_trigrams(term))
+        for name in fields:
+            postings = self._postings[name]
+            candidates = [postings.get(trigram, set()) for trigram in trigrams]
+            candidates.sort(key=len)
+            hits = set.intersection(*candidates) if candidates else set()
+            found.update(key for key in hits if term in self._text[key][name])
+        return found
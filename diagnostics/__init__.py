@@ -0,0 +1,5 @@
+"""Runtime diagnostics: metrics and timing instrumentation."""
+
+from .metrics import metrics, timed, MetricsRegistry, Counter, Histogram
+
+__all__ = ['metrics', 'timed', 'MetricsRegistry', 'Counter', 'Histogram']
@@ -0,0 +1,114 @@
+"""Logging that never blocks the calling thread.
+
+``configure_logging`` replaces ``logging.basicConfig``. The root logger
+gets a single ``QueueHandler``, which only enqueues records. A
+``QueueListener`` thread then writes them to the console and to a
+size-rotated ``beyblade_debug.log``, so a slow disk or console stalls
+that thread instead of the Tk loop.
+
+With ``json_lines`` the file gets one JSON object per record instead of
+text. Each object carries the wall-clock time, milliseconds since start,
+and any timing fields passed as ``extra`` (``duration_ms`` and the like).
+Call sites should use lazy ``%`` formatting so disabled records cost
+only a level check::
+
+    logger.info("Catalog reloaded in %.1f ms", ms, extra={'duration_ms': ms})
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+
+LOG_FILENAME = "beyblade_debug.log"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s"
+
+# Attributes every LogRecord has; anything else was passed as ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[QueueListener] = None
+
+
+class _LocalQueueHandler(QueueHandler):
+    """Enqueues records untouched; the listener is in-process, so nothing needs pickling.
+    
+    The stock ``prepare`` formats the message (and any traceback) on the
+    logging thread. Skipping it leaves all formatting to the listener.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, including ``extra`` fields."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'elapsed_ms': round(record.relativeCreated, 1),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: int = logging.INFO, filename: Optional[str] = LOG_FILENAME,
+                      json_lines: bool = False, max_bytes: int = MAX_BYTES,
+                      backup_count: int = BACKUP_COUNT) -> QueueListener:
+    """Route all logging through a queue to the console and a rotating file.
+    
+    Pass ``filename=None`` to log to the console only. Calling again
+    replaces the previous setup.
+    """
+    stop_logging()
+    
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers = [console]
+    if filename:
+        file_handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                           encoding='utf-8', delay=True)
+        file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+    
+    global _listener
+    records = queue.SimpleQueue()
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_LocalQueueHandler(records))
+    root.setLevel(level)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,220 @@
+"""Process-wide counters, histograms and timers.
+
+Instrumented code records into the module-level ``metrics`` registry::
+
+    @timed("persistence.save_collection")
+    def save_collection(...): ...
+    
+    with metrics.timer("ui.refresh_all"):
+        ...
+    
+    metrics.counter("catalog.reloads").inc()
+
+The registry starts disabled. Then ``@timed`` costs one attribute check
+per call, ``timer()`` returns a shared no-op context manager, and
+``counter()`` and ``histogram()`` return no-op instances, so call sites
+never need their own guards. ``enable()`` turns recording on.
+``dump(path)`` writes a JSON snapshot, and ``start_periodic_dump`` does
+that every interval from a daemon thread.
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+
+SAMPLE_SIZE = 1024  # Recent observations kept per histogram for percentiles
+
+
+class Counter:
+    """Monotonic count of events."""
+    
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+    
+    def snapshot(self) -> dict:
+        return {'type': 'counter', 'value': self.value}
+
+
+class Histogram:
+    """Distribution of observed values: totals plus a window of recent samples."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.recent = deque(maxlen=SAMPLE_SIZE)
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+            self.recent.append(value)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Percentile of the recent window, or None before any observation."""
+        with self._lock:
+            ordered = sorted(self.recent)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+    
+    def snapshot(self) -> dict:
+        return {
+            'type': 'histogram',
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99)
+        }
+
+
+class _Timer:
+    """Context manager recording elapsed seconds into a histogram."""
+    __slots__ = ('histogram', 'start')
+    
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _Null:
+    """Stand-in for every metric while the registry is disabled."""
+    
+    def inc(self, amount: int = 1) -> None:
+        pass
+    
+    def observe(self, value: float) -> None:
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL = _Null()
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use. Timers are histograms of seconds."""
+    
+    def __init__(self):
+        self.enabled = False
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._dump_stop: Optional[threading.Event] = None
+    
+    def enable(self) -> None:
+        self.enabled = True
+    
+    def disable(self) -> None:
+        self.enabled = False
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+    
+    def _get(self, name: str, kind: type):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, kind())
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+    
+    def counter(self, name: str):
+        return self._get(name, Counter) if self.enabled else _NULL
+    
+    def histogram(self, name: str):
+        return self._get(name, Histogram) if self.enabled else _NULL
+    
+    def timer(self, name: str):
+        """Context manager timing its block into the ``name`` histogram."""
+        return _Timer(self._get(name, Histogram)) if self.enabled else _NULL
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+    
+    def dump(self, path: str) -> None:
+        """Atomically write a JSON snapshot of every metric."""
+        document = {'created': datetime.now().isoformat(timespec='seconds'), 'metrics': self.snapshot()}
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(document, f, indent=2)
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+    
+    def start_periodic_dump(self, path: str, interval: float = 60.0) -> None:
+        """Dump to ``path`` every ``interval`` seconds until ``stop_periodic_dump``."""
+        self.stop_periodic_dump()
+        stop = self._dump_stop = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError:
+                    pass  # Try again next interval
+        
+        threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+    
+    def stop_periodic_dump(self) -> None:
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+
+metrics = MetricsRegistry()
+
+
+def timed(name: str):
+    """Decorator timing every call of a function into the ``name`` histogram."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.histogram(name).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -0,0 +1,98 @@
+"""On-demand cProfile and tracemalloc capture.
+
+A capture profiles the thread that starts it (the Tk thread) and traces
+allocations between its start and stop. Stopping writes two files next
+to the debug log: a ``.prof`` file for ``pstats``/snakeviz, and a text
+report with the slowest functions by cumulative time and the top
+allocation sites by growth.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Optional, Tuple
+from diagnostics.log_setup import LOG_FILENAME
+
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACE_FRAMES = 1  # Frames kept per allocation; more is slower to trace
+
+logger = logging.getLogger(__name__)
+
+
+def report_dir() -> str:
+    """Directory of the debug log, where captures are written."""
+    return os.path.dirname(os.path.abspath(LOG_FILENAME))
+
+
+class ProfileCapture:
+    """One profile and heap-growth capture, started and stopped explicitly."""
+    
+    def __init__(self, output_dir: Optional[str] = None):
+        self.output_dir = output_dir or report_dir()
+        self.label = ""
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_tracing = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+        self._start = 0.0
+    
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+    
+    def start(self, label: str = "capture") -> None:
+        if self.active:
+            return
+        self.label = label
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        self._before = self._snapshot()
+        self._start = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        logger.info("Profiling started (%s)", label)
+    
+    def stop(self) -> Optional[Tuple[str, str]]:
+        """Stop capturing and write the reports; returns (prof path, report path)."""
+        if not self.active:
+            return None
+        profile, self._profile = self._profile, None
+        profile.disable()
+        elapsed = time.perf_counter() - self._start
+        after = self._snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(self.output_dir, f"profile-{stamp}-{self.label}")
+        profile.dump_stats(base + ".prof")
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write(self.format_report(profile, self._before, after, elapsed))
+        self._before = None
+        logger.info("Profile written to %s.prof and %s.txt", base, base)
+        return base + ".prof", base + ".txt"
+    
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    
+    def format_report(self, profile: cProfile.Profile, before: tracemalloc.Snapshot,
+                      after: tracemalloc.Snapshot, elapsed: float) -> str:
+        stream = io.StringIO()
+        stream.write(f"Capture '{self.label}': {elapsed:.2f} s\n\n")
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        
+        growth = after.compare_to(before, 'lineno')
+        stream.write(f"\nTop {TOP_ALLOCATIONS} allocation sites by growth\n")
+        for stat in growth[:TOP_ALLOCATIONS]:
+            stream.write(f"{stat}\n")
+        current = sum(stat.size for stat in after.statistics('filename'))
+        stream.write(f"\nTraced memory at stop: {current / 1024:.1f} KiB\n")
+        return stream.getvalue()
@@ -0,0 +1,111 @@
+"""Startup phase timing and an import-time breakdown.
+
+``startup_timer`` starts counting when this module is first imported, so
+``main.py`` imports it before anything heavy. Phases are marked as they
+finish and logged as one breakdown once the first tab is interactive.
+
+``ImportTimer`` is an in-process take on ``python -X importtime``, which
+is not available to the frozen executable. It wraps ``__import__`` and
+records the cumulative and self time of every module actually loaded.
+"""
+
+import builtins
+import importlib.util
+import logging
+import sys
+import time
+from typing import List, Optional, Tuple
+
+
+TOP_IMPORTS = 15
+
+logger = logging.getLogger(__name__)
+
+
+class ImportTimer:
+    """Times module imports made while installed, like ``-X importtime``."""
+    
+    def __init__(self):
+        self.imports: List[Tuple[str, float, float, int]] = []  # (module, cumulative, self, depth)
+        self._original = None
+        self._stack: List[float] = []  # Child time accumulated per open import
+    
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+    
+    def uninstall(self) -> None:
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+    
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        module = name
+        if level:
+            try:
+                module = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__') or "")
+            except (ImportError, ValueError):
+                module = None
+        if module is None or module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cumulative
+            self.imports.append((module, cumulative, cumulative - children, len(self._stack)))
+    
+    def report(self, top: int = TOP_IMPORTS) -> str:
+        """Top-level imports by cumulative time, then the slowest modules by self time."""
+        lines = ["Imports by cumulative time:"]
+        roots = sorted((entry for entry in self.imports if entry[3] == 0), key=lambda e: e[1], reverse=True)
+        lines += [f"  {name:<40} {cumulative * 1e3:8.1f} ms" for name, cumulative, _, _ in roots[:top]]
+        lines.append("Slowest modules by self time:")
+        slowest = sorted(self.imports, key=lambda e: e[2], reverse=True)
+        lines += [f"  {name:<40} {own * 1e3:8.1f} ms" for name, _, own, _ in slowest[:top]]
+        return "\n".join(lines)
+
+
+class StartupTimer:
+    """Named startup phases, each measured from the end of the previous one."""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases: List[Tuple[str, float]] = []
+        self.import_timer: Optional[ImportTimer] = None
+    
+    def mark(self, phase: str) -> float:
+        """End a phase; returns seconds since the timer started."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+        return now - self.start
+    
+    def trace_imports(self) -> None:
+        """Record an import breakdown until ``finish``."""
+        self.import_timer = ImportTimer()
+        self.import_timer.install()
+    
+    def finish(self) -> None:
+        """Log the phase breakdown, and the import breakdown if traced."""
+        logger.info("%s", self.report(), extra={'startup_ms': (self.last - self.start) * 1e3})
+        if self.import_timer is not None:
+            self.import_timer.uninstall()
+            logger.info("%s", self.import_timer.report())
+            self.import_timer = None
+    
+    def report(self) -> str:
+        lines = [f"Startup {self.last - self.start:.3f} s"]
+        lines += [f"  {phase:<24} {seconds * 1e3:8.1f} ms" for phase, seconds in self.phases]
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
@@ -1,25 +1,97 @@
 """Main entry point for Beyblade X Collection Manager."""
 
+import sys
+from diagnostics.startup import startup_timer
+
+if '--import-times' in sys.argv:
+    startup_timer.trace_imports()  # Before the imports it should measure
+
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 import logging
+import multiprocessing
 from ui.modern_main_window import ModernMainWindow
+from ui.latency_monitor import LatencyMonitor, DEFAULT_THRESHOLD_MS
+from diagnostics import metrics
+from diagnostics.profiler import ProfileCapture
+from diagnostics.log_setup import configure_logging, stop_logging, LOG_FILENAME
+
+startup_timer.mark("imports")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Beyblade X Collection Manager")
+    parser.add_argument('--latency-monitor', action='store_true',
+                        help="log Tk handlers that block the event loop")
+    parser.add_argument('--latency-threshold', type=float, default=DEFAULT_THRESHOLD_MS, metavar='MS',
+                        help="handler duration to report (default %(default)s ms)")
+    parser.add_argument('--import-times', action='store_true',
+                        help="log a per-module import time breakdown once started")
+    parser.add_argument('--profile', type=float, metavar='SECONDS',
+                        help="profile startup and the first SECONDS, writing reports next to the debug log")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="record timing metrics, dumping them to FILE periodically and on exit")
+    parser.add_argument('--metrics-interval', type=float, default=60.0, metavar='SECONDS',
+                        help="seconds between metrics dumps (default %(default)s)")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="minimum level logged (default %(default)s)")
+    parser.add_argument('--log-file', default=LOG_FILENAME, metavar='FILE',
+                        help="rotating log file (default %(default)s)")
+    parser.add_argument('--log-json', action='store_true',
+                        help="write the log file as JSON lines with timing fields")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main application entry point."""
     try:
-        logging.basicConfig(level=logging.INFO)
+        args = parse_args()
+        configure_logging(getattr(logging, args.log_level), args.log_file, json_lines=args.log_json)
         logging.info("Application starting...")
         
-        app = ModernMainWindow()
+        if args.metrics:
+            metrics.enable()
+            metrics.start_periodic_dump(args.metrics, args.metrics_interval)
+        
+        monitor = None
+        if args.latency_monitor:
+            # Before the window exists, so every callback it registers is timed
+            monitor = LatencyMonitor(args.latency_threshold)
+            monitor.install()
+        
+        capture = None
+        if args.profile:
+            capture = ProfileCapture()
+            capture.start("startup")
+        
+        app = ModernMainWindow(profile_capture=capture)
+        if capture:
+            app.root.after(int(args.profile * 1000), app.stop_profile)
+        if monitor:
+            monitor.start(app.root)
         logging.info("Starting main loop...")
         app.run()
         
+        if monitor:
+            stats = monitor.stats()
+            logging.info("Event loop lag p50 %.1f ms, p99 %.1f ms, max %.1f ms; %d slow handlers",
+                         stats['lag_p50_ms'], stats['lag_p99_ms'], stats['lag_max_ms'], stats['slow_calls'],
+                         extra=stats)
+            monitor.uninstall()
+        
+        if args.metrics:
+            metrics.stop_periodic_dump()
+            metrics.dump(args.metrics)
+        
     except Exception as e:
-        logging.error(f"Fatal error: {e}")
+        logging.error("Fatal error: %s", e)
         messagebox.showerror("Fatal Error", f"Application failed to start: {e}")
+    finally:
+        stop_logging()
 
 
 if __name__ == "__main__":
+    # Required for process pools in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
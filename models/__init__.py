@@ -1,8 +1,11 @@
 """Beyblade X data models."""
 
-from .enums import PartType, Rarity
+from .enums import PartType, Rarity, FinishType
 from .part import BeybladePart
 from .combo import BeybladeCombo
-from .collection import Collection
+from .collection import Collection, CollectionSnapshot, PartNotLoadedError, SavedState
+from .battle import BattleRecord
+from .product import Product
 
-__all__ = ['PartType', 'Rarity', 'BeybladePart', 'BeybladeCombo', 'Collection']
+__all__ = ['PartType', 'Rarity', 'FinishType', 'BeybladePart', 'BeybladeCombo', 'Collection', 'CollectionSnapshot',
+           'PartNotLoadedError', 'SavedState', 'BattleRecord', 'Product']
@@ -0,0 +1,38 @@
+"""Battle result model."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from .combo import BeybladeCombo
+from .enums import FinishType
+
+
+@dataclass
+class BattleRecord:
+    combo_a: BeybladeCombo
+    combo_b: BeybladeCombo
+    finish: FinishType
+    winner: str
+    timestamp: datetime
+    
+    @property
+    def a_won(self) -> bool:
+        return self.winner == self.combo_a.name
+    
+    def to_dict(self) -> dict:
+        return {
+            'combo_a': self.combo_a.to_dict(),
+            'combo_b': self.combo_b.to_dict(),
+            'finish': self.finish.value,
+            'winner': self.winner,
+            'timestamp': self.timestamp.isoformat()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BattleRecord':
+        return cls(
+            combo_a=BeybladeCombo.from_dict(data['combo_a']),
+            combo_b=BeybladeCombo.from_dict(data['combo_b']),
+            finish=FinishType(data['finish']),
+            winner=data['winner'],
+            timestamp=datetime.fromisoformat(data['timestamp'])
+        )
@@ -1,31 +1,232 @@
-"""Collection management for Beyblade parts and combos."""
+"""Collection management for Beyblade parts and combos.
 
-from typing import List, Optional
+Worker threads read a collection through ``Collection.snapshot()``. A
+snapshot is taken in O(1) and never changes. Each change made through
+the ``Collection`` methods logs a private copy of the changed part,
+under a lock that serializes writers. After each change the writer
+publishes the checkpoint, the log and its length as one tuple, which a
+snapshot reads without the lock. A snapshot replays that much of the log
+when first read, so readers neither lock nor see a half-applied change. Once the
+log outgrows the collection it is folded into a new checkpoint. The fold
+costs O(n) but is amortized over at least n changes, and snapshots
+already taken keep the old checkpoint and log.
+
+Change parts through the methods, or replace ``parts`` or ``combos``
+wholesale. Editing a part object in place is not seen by snapshots.
+"""
+
+import copy
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from .part import BeybladePart
 from .combo import BeybladeCombo
 from .enums import PartType
 
 
+# Called with the changed part (holding its new quantity) and its previous quantity
+PartListener = Callable[[BeybladePart, int], None]
+
+COMPACT_MIN_CHANGES = 1024  # The log is folded once longer than this and the part count
+
+_COMBOS = object()  # Log key of an entry replacing the combo list
+
+PartKey = Tuple[str, PartType]
+
+
+class PartNotLoadedError(Exception):
+    """Raised when an edit needs parts or combos the background load has not delivered yet."""
+
+
+@dataclass(frozen=True)
+class SavedState:
+    """What the collection file held when last loaded or saved.
+    
+    ``version`` is the file's save counter, and the contents are the base
+    for merging local changes with a file another instance has saved.
+    """
+    version: int = 0
+    quantities: Dict[Tuple[str, PartType], int] = field(default_factory=dict)
+    combo_names: FrozenSet[str] = frozenset()
+
+
+class _Checkpoint(NamedTuple):
+    """Part copies by key and combo copies at some version; never modified."""
+    parts: Dict[PartKey, BeybladePart]
+    combos: Tuple[BeybladeCombo, ...]
+
+
+def _replay(checkpoint: _Checkpoint, log: List[tuple], end: int) -> _Checkpoint:
+    """The checkpoint with the first ``end`` logged changes applied."""
+    parts = dict(checkpoint.parts)
+    combos = checkpoint.combos
+    for key, value in islice(log, end):
+        if key is _COMBOS:
+            combos = value
+        elif value is None:
+            parts.pop(key, None)
+        else:
+            parts[key] = value  # Keeps its place, as a quantity change does in the list
+    return _Checkpoint(parts, combos)
+
+
+def _part_entry(part: BeybladePart) -> tuple:
+    return (part.name, part.part_type), copy.copy(part)
+
+
+def _combo_copies(combos: List[BeybladeCombo]) -> Tuple[BeybladeCombo, ...]:
+    return tuple(copy.copy(combo) for combo in combos)
+
+
 class Collection:
     def __init__(self):
-        self.parts: List[BeybladePart] = []
-        self.combos: List[BeybladeCombo] = []
+        self._parts: List[BeybladePart] = []
+        self._combos: List[BeybladeCombo] = []
+        self.catalog_version: Optional[int] = None  # Catalog version the part names were migrated to
+        self.loading = False  # Parts are still arriving from a background load
+        self.version = 0  # Bumped by every change, including replacing the parts or combos
+        self.saved = SavedState()  # File state this collection was loaded from or last saved as
+        self._listeners: List[PartListener] = []
+        self._lock = threading.RLock()  # Serializes writers; snapshots never take it
+        self._checkpoint = _Checkpoint({}, ())
+        self._log: List[tuple] = []  # (part key, part copy or None when removed) or (_COMBOS, combos)
+        self._published = (self._checkpoint, self._log, 0, 0)  # (checkpoint, log, end, version), swapped whole
+    
+    @property
+    def parts(self) -> List[BeybladePart]:
+        return self._parts
+    
+    @parts.setter
+    def parts(self, parts: List[BeybladePart]) -> None:
+        """Replace every part, as loading, migration and merging do."""
+        with self._lock:
+            self._parts = parts
+            self.version += 1
+            self._checkpoint = _Checkpoint(dict(_part_entry(part) for part in parts), _combo_copies(self._combos))
+            self._log = []
+            self._publish()
+    
+    @property
+    def combos(self) -> List[BeybladeCombo]:
+        return self._combos
+    
+    @combos.setter
+    def combos(self, combos: List[BeybladeCombo]) -> None:
+        with self._lock:
+            self._combos = combos
+            self.version += 1
+            self._record([(_COMBOS, _combo_copies(combos))])
+    
+    def snapshot(self) -> "CollectionSnapshot":
+        """An immutable view of the current contents, safe to take and read on any thread."""
+        checkpoint, log, end, version = self._published  # One read, so never a mix of two changes
+        return CollectionSnapshot(version, self.catalog_version, self.saved, checkpoint, log, end)
+    
+    def _publish(self) -> None:
+        self._published = (self._checkpoint, self._log, len(self._log), self.version)
+    
+    def _record(self, entries: List[tuple]) -> None:
+        """Log changes already made to the live lists and publish them; call under the lock."""
+        self._log.extend(entries)
+        if len(self._log) > max(COMPACT_MIN_CHANGES, len(self._parts)):
+            self._checkpoint = _replay(self._checkpoint, self._log, len(self._log))
+            self._log = []  # Snapshots hold on to the old list
+        self._publish()
+    
+    def saved_state(self, version: int) -> SavedState:
+        """The current contents as the saved state of file version ``version``."""
+        return SavedState(version, {(part.name, part.part_type): part.owned_quantity for part in self.parts},
+                          frozenset(combo.name for combo in self.combos))
+    
+    def add_listener(self, listener: PartListener) -> None:
+        """Register a callback for part quantity changes."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: PartListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, changes: List[Tuple[BeybladePart, int]]) -> None:
+        # Called after the lock is released, so a slow listener never holds up other writers
+        for part, previous_quantity in changes:
+            for listener in list(self._listeners):
+                listener(part, previous_quantity)
+    
+    def extend_loaded(self, parts: List[BeybladePart]) -> None:
+        """Append a batch of parts from a background load.
+        
+        Loaded parts are distinct and listeners are not notified, so
+        dependents rebuild once the load is complete.
+        """
+        with self._lock:
+            self._parts.extend(parts)
+            self.version += 1
+            self._record([_part_entry(part) for part in parts])
+    
+    def _check_loaded(self, name: str, part_type: PartType) -> None:
+        # While loading, a part not seen yet may still be further down the file
+        if self.loading:
+            raise PartNotLoadedError(f"{name} ({part_type.value}) has not finished loading yet")
     
     def add_part(self, part: BeybladePart) -> None:
-        existing = self.find_part(part.name, part.part_type)
-        if existing:
-            existing.owned_quantity += part.owned_quantity
-        else:
-            self.parts.append(part)
+        with self._lock:
+            existing = self.find_part(part.name, part.part_type)
+            if existing is None:
+                self._check_loaded(part.name, part.part_type)
+            self.version += 1
+            if existing:
+                previous = existing.owned_quantity
+                existing.owned_quantity += part.owned_quantity
+                self._record([_part_entry(existing)])
+                change = (existing, previous)
+            else:
+                self._parts.append(part)
+                self._record([_part_entry(part)])
+                change = (part, 0)
+        self._notify([change])
+    
+    def add_parts(self, parts: List[BeybladePart]) -> None:
+        """``add_part`` for many parts, with one lookup table instead of a scan per part."""
+        with self._lock:
+            by_key = {(part.name, part.part_type): part for part in self._parts}
+            if self.loading:
+                for part in parts:
+                    if (part.name, part.part_type) not in by_key:
+                        self._check_loaded(part.name, part.part_type)
+            self.version += 1
+            changes = []
+            for part in parts:
+                key = (part.name, part.part_type)
+                existing = by_key.get(key)
+                if existing:
+                    previous = existing.owned_quantity
+                    existing.owned_quantity += part.owned_quantity
+                else:
+                    previous, existing = 0, part
+                    self._parts.append(part)
+                    by_key[key] = part
+                changes.append((existing, previous))
+            self._record([_part_entry(part) for part, _ in changes])
+        self._notify(changes)
     
     def remove_part(self, name: str, part_type: PartType, quantity: int = 1) -> bool:
-        part = self.find_part(name, part_type)
-        if part and part.owned_quantity >= quantity:
+        with self._lock:
+            part = self.find_part(name, part_type)
+            if part is None:
+                self._check_loaded(name, part_type)
+            if not part or part.owned_quantity < quantity:
+                return False
+            previous = part.owned_quantity
+            self.version += 1
             part.owned_quantity -= quantity
             if part.owned_quantity == 0:
-                self.parts.remove(part)
-            return True
-        return False
+                self._parts.remove(part)
+                self._record([((name, part_type), None)])
+            else:
+                self._record([_part_entry(part)])
+        self._notify([(part, previous)])
+        return True
     
     def find_part(self, name: str, part_type: PartType) -> Optional[BeybladePart]:
         for part in self.parts:
@@ -36,12 +237,70 @@ class Collection:
     def get_parts_by_type(self, part_type: PartType) -> List[BeybladePart]:
         return [part for part in self.parts if part.part_type == part_type]
     
+    def _check_combos_loaded(self) -> None:
+        # The loaded combos replace the list once the load is done
+        if self.loading:
+            raise PartNotLoadedError("Combos can be edited once the collection has finished loading")
+    
     def add_combo(self, combo: BeybladeCombo) -> None:
-        self.combos.append(combo)
+        self._check_combos_loaded()
+        with self._lock:
+            self._combos.append(combo)
+            self.version += 1
+            self._record([(_COMBOS, _combo_copies(self._combos))])
     
     def remove_combo(self, combo_name: str) -> bool:
-        for i, combo in enumerate(self.combos):
-            if combo.name == combo_name:
-                del self.combos[i]
-                return True
-        return False
+        self._check_combos_loaded()
+        with self._lock:
+            for i, combo in enumerate(self._combos):
+                if combo.name == combo_name:
+                    del self._combos[i]
+                    self.version += 1
+                    self._record([(_COMBOS, _combo_copies(self._combos))])
+                    return True
+            return False
+
+
+class CollectionSnapshot:
+    """The contents of a collection at one version, from ``Collection.snapshot()``.
+    
+    Reads like a ``Collection`` (``parts`` and ``combos`` are tuples), so
+    services and ``save_collection`` (without ``merge``) accept it. The parts are copies
+    shared with other snapshots and must not be modified. ``saved`` is
+    file bookkeeping, which saving a snapshot updates.
+    """
+    
+    loading = False
+    
+    def __init__(self, version: int, catalog_version: Optional[int], saved: SavedState,
+                 checkpoint: _Checkpoint, log: List[tuple], end: int):
+        self.version = version
+        self.catalog_version = catalog_version
+        self.saved = saved
+        self._checkpoint = checkpoint
+        self._log = log
+        self._end = end
+        self._combos: Optional[Tuple[BeybladeCombo, ...]] = None
+        self._parts: Optional[Tuple[BeybladePart, ...]] = None
+    
+    def _materialize(self) -> None:
+        # Concurrent first reads may both replay; either result is the same
+        state = _replay(self._checkpoint, self._log, self._end)
+        self._combos = state.combos
+        self._parts = tuple(state.parts.values())
+    
+    @property
+    def parts(self) -> Tuple[BeybladePart, ...]:
+        if self._parts is None:
+            self._materialize()
+        return self._parts
+    
+    @property
+    def combos(self) -> Tuple[BeybladeCombo, ...]:
+        if self._parts is None:
+            self._materialize()
+        return self._combos
+    
+    saved_state = Collection.saved_state
+    find_part = Collection.find_part
+    get_parts_by_type = Collection.get_parts_by_type
@@ -14,3 +14,15 @@ class Rarity(Enum):
     RARE = "Rare"
     SUPER_RARE = "Super Rare"
     ULTRA_RARE = "Ultra Rare"
+
+
+class FinishType(Enum):
+    SPIN = "Spin Finish"
+    OVER = "Over Finish"
+    BURST = "Burst Finish"
+    XTREME = "Xtreme Finish"
+    
+    @property
+    def points(self) -> int:
+        """Points awarded to the winner under standard Beyblade X rules."""
+        return {'SPIN': 1, 'OVER': 2, 'BURST': 2, 'XTREME': 3}[self.name]
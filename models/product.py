@@ -0,0 +1,30 @@
+"""Retail product model."""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from .enums import PartType
+
+
+@dataclass
+class Product:
+    sku: str
+    name: str
+    price: float
+    contents: List[Tuple[str, PartType]] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        return {
+            'sku': self.sku,
+            'name': self.name,
+            'price': self.price,
+            'contents': [{'name': name, 'part_type': part_type.value} for name, part_type in self.contents]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Product':
+        return cls(
+            sku=data['sku'],
+            name=data['name'],
+            price=data['price'],
+            contents=[(item['name'], PartType(item['part_type'])) for item in data.get('contents', [])]
+        )
@@ -1,6 +1,33 @@
 """Business logic services."""
 
+import importlib
 from .part_service import PartService
 from .stats_service import StatsService
+from .combo_service import ComboService
+from .completion_service import CompletionTracker, GroupProgress
+from .planner_service import PurchasePlanner, PurchasePlan
+from .rating_service import RatingService
+from .recommendation_service import RecommendationService, Recommendation
 
-__all__ = ['PartService', 'StatsService']
+# Simulation pulls in NumPy and process pools; load it on first use so
+# importing any service stays cheap at startup.
+_LAZY = {
+    'BattleSimulator': 'simulation_service', 'MatchupResult': 'simulation_service',
+    'MatchupMatrix': 'simulation_service', 'TournamentSimulator': 'tournament_service',
+    'TournamentResult': 'tournament_service', 'Deck': 'tournament_service', 'Standing': 'tournament_service'
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ['PartService', 'StatsService', 'ComboService', 'CompletionTracker', 'GroupProgress',
+           'BattleSimulator', 'MatchupResult', 'MatchupMatrix',
+           'PurchasePlanner', 'PurchasePlan', 'RatingService', 'RecommendationService', 'Recommendation',
+           'TournamentSimulator', 'TournamentResult', 'Deck', 'Standing']
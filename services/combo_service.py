@@ -0,0 +1,108 @@
+"""Combo analysis and scoring logic."""
+
+import heapq
+import re
+from typing import Iterator, List, Optional, Tuple
+from models import BeybladePart, BeybladeCombo, Collection, PartType
+
+
+ARCHETYPES = ('Attack', 'Defense', 'Stamina', 'Balance')
+
+# Ratchet names encode "<sides>-<height in tenths of a mm>", e.g. "3-60"
+_RATCHET_PATTERN = re.compile(r'^(\d+)-(\d+)$')
+
+# Default ratchet profile when the name cannot be parsed
+DEFAULT_RATCHET_SIDES = 3
+DEFAULT_RATCHET_HEIGHT = 6.0
+
+
+class ComboService:
+    """Service for combo features, scoring and enumeration."""
+    
+    @staticmethod
+    def get_archetype(part: BeybladePart) -> str:
+        """Get the battle archetype of a part from its description."""
+        description = (part.description or "").lower()
+        for archetype in ARCHETYPES:
+            if archetype.lower() in description:
+                return archetype
+        return 'Balance'
+    
+    @staticmethod
+    def get_ratchet_profile(part: BeybladePart) -> Tuple[int, float]:
+        """Get (sides, height in mm) of a ratchet from its name."""
+        match = _RATCHET_PATTERN.match(part.name)
+        if not match:
+            return DEFAULT_RATCHET_SIDES, DEFAULT_RATCHET_HEIGHT
+        return int(match.group(1)), int(match.group(2)) / 10.0
+    
+    @staticmethod
+    def score_part(part: BeybladePart) -> float:
+        """Score a single part independently of the rest of the combo."""
+        score = part.weight or 0.0
+        if part.part_type == PartType.RATCHET:
+            sides, _ = ComboService.get_ratchet_profile(part)
+            score += sides * 0.5
+        return score
+    
+    @staticmethod
+    def synergy(blade_archetype: str, bit_archetype: str) -> float:
+        """Bonus for a blade and bit that share a battle style."""
+        if blade_archetype == bit_archetype and blade_archetype != 'Balance':
+            return 3.0
+        if 'Balance' in (blade_archetype, bit_archetype):
+            return 1.0
+        return 0.0
+    
+    @staticmethod
+    def score_combo(combo: BeybladeCombo) -> float:
+        """Score a combo as the sum of part scores plus blade/bit synergy.
+        
+        The score is deliberately additive per part so that callers can
+        reason about marginal gains without re-scoring every combination.
+        """
+        return (ComboService.score_part(combo.blade)
+                + ComboService.score_part(combo.ratchet)
+                + ComboService.score_part(combo.bit)
+                + ComboService.synergy(ComboService.get_archetype(combo.blade),
+                                       ComboService.get_archetype(combo.bit)))
+    
+    @staticmethod
+    def get_features(combo: BeybladeCombo) -> dict:
+        """Get the numeric feature row used by the battle model."""
+        sides, height = ComboService.get_ratchet_profile(combo.ratchet)
+        blade_archetype = ComboService.get_archetype(combo.blade)
+        bit_archetype = ComboService.get_archetype(combo.bit)
+        return {
+            'weight': sum(p.weight or 0.0 for p in (combo.blade, combo.ratchet, combo.bit)),
+            'blade_archetype': ARCHETYPES.index(blade_archetype),
+            'bit_archetype': ARCHETYPES.index(bit_archetype),
+            'ratchet_sides': sides,
+            'ratchet_height': height,
+            'synergy': ComboService.synergy(blade_archetype, bit_archetype),
+        }
+    
+    @staticmethod
+    def enumerate_combos(collection: Collection) -> Iterator[BeybladeCombo]:
+        """Yield every buildable blade/ratchet/bit combination in a collection."""
+        blades = collection.get_parts_by_type(PartType.BLADE)
+        ratchets = collection.get_parts_by_type(PartType.RATCHET)
+        bits = collection.get_parts_by_type(PartType.BIT)
+        for blade in blades:
+            for ratchet in ratchets:
+                for bit in bits:
+                    yield BeybladeCombo(
+                        name=f"{blade.name} {ratchet.name} {bit.name}",
+                        blade=blade,
+                        ratchet=ratchet,
+                        bit=bit
+                    )
+    
+    @staticmethod
+    def top_combos(collection: Collection, limit: Optional[int] = 10) -> List[Tuple[BeybladeCombo, float]]:
+        """Get the highest scoring buildable combos with their scores."""
+        scored = ((combo, ComboService.score_combo(combo))
+                  for combo in ComboService.enumerate_combos(collection))
+        if limit is None:
+            return sorted(scored, key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scored, key=lambda item: item[1])
@@ -0,0 +1,175 @@
+"""Collection completion against the parts catalog, maintained incrementally."""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from models import BeybladePart, Collection, PartType, Rarity
+from data import get_all_parts
+
+
+# Group kinds a catalog part is counted under
+OVERALL = 'overall'
+BY_TYPE = 'type'
+BY_SERIES = 'series'
+BY_RARITY = 'rarity'
+
+GroupKey = Tuple[str, object]
+PartKey = Tuple[str, PartType]
+
+
+@dataclass
+class GroupProgress:
+    """Owned catalog parts out of a group's total."""
+    key: GroupKey
+    owned: int
+    total: int
+    
+    @property
+    def label(self) -> str:
+        value = self.key[1]
+        if value is None:
+            return "All Parts"
+        return value.value if isinstance(value, (PartType, Rarity)) else str(value)
+    
+    @property
+    def missing(self) -> int:
+        return self.total - self.owned
+    
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.owned / self.total if self.total else 100.0
+
+
+def _group_keys(part: BeybladePart) -> List[GroupKey]:
+    return [(OVERALL, None), (BY_TYPE, part.part_type), (BY_SERIES, part.series), (BY_RARITY, part.rarity)]
+
+
+class CompletionTracker:
+    """Tracks catalog completion overall, per part type, series and rarity.
+    
+    Group sizes and each catalog part's groups are computed once; after
+    that the tracker follows the collection's change events, so adding or
+    removing a part only touches that part's four groups.
+    """
+    
+    def __init__(self, collection: Collection, catalog: Optional[Sequence[BeybladePart]] = None):
+        if catalog is None:
+            catalog = get_all_parts()
+        self.collection = collection
+        self.catalog = list(catalog)
+        self._listeners: List[Callable[[List[GroupKey]], None]] = []
+        
+        self._index: Dict[PartKey, int] = {}
+        self._groups: List[List[GroupKey]] = []
+        self._totals: Dict[GroupKey, int] = {}
+        for position, part in enumerate(self.catalog):
+            self._index[(part.name, part.part_type)] = position
+            keys = _group_keys(part)
+            self._groups.append(keys)
+            for key in keys:
+                self._totals[key] = self._totals.get(key, 0) + 1
+        
+        self.rebuild()
+        collection.add_listener(self.on_part_changed)
+    
+    def rebuild(self) -> None:
+        """Recount from the collection, e.g. after its parts were replaced wholesale."""
+        self._owned: Dict[GroupKey, int] = {key: 0 for key in self._totals}
+        self._missing: Dict[GroupKey, Dict[int, BeybladePart]] = {key: {} for key in self._totals}
+        owned = {(p.name, p.part_type) for p in self.collection.parts if p.owned_quantity > 0}
+        for position, part in enumerate(self.catalog):
+            if (part.name, part.part_type) in owned:
+                for key in self._groups[position]:
+                    self._owned[key] += 1
+            else:
+                for key in self._groups[position]:
+                    self._missing[key][position] = part
+    
+    def add_listener(self, listener: Callable[[List[GroupKey]], None]) -> None:
+        """Register a callback receiving the group keys whose counts changed."""
+        self._listeners.append(listener)
+    
+    def on_part_changed(self, part: BeybladePart, previous_quantity: int) -> None:
+        """Collection listener: update the part's groups if it became owned or unowned."""
+        was_owned = previous_quantity > 0
+        is_owned = part.owned_quantity > 0
+        position = self._index.get((part.name, part.part_type))
+        if was_owned == is_owned or position is None:
+            return
+        
+        keys = self._groups[position]
+        for key in keys:
+            if is_owned:
+                self._owned[key] += 1
+                self._missing[key].pop(position, None)
+            else:
+                self._owned[key] -= 1
+                self._missing[key][position] = self.catalog[position]
+        for listener in list(self._listeners):
+            listener(keys)
+    
+    def apply_catalog_diff(self, diff) -> None:
+        """Adjust group totals and counts for a reloaded catalog's changed parts."""
+        owned = {(p.name, p.part_type) for p in self.collection.parts if p.owned_quantity > 0}
+        touched = set()
+        
+        for part in diff.removed + [old for old, _ in diff.changed]:
+            position = self._index.pop((part.name, part.part_type))
+            is_owned = (part.name, part.part_type) in owned
+            for key in self._groups[position]:
+                self._totals[key] -= 1
+                if is_owned:
+                    self._owned[key] -= 1
+                else:
+                    self._missing[key].pop(position, None)
+                touched.add(key)
+            self._groups[position] = []  # Retired position
+        
+        for part in diff.added + [new for _, new in diff.changed]:
+            position = len(self.catalog)
+            self.catalog.append(part)
+            self._index[(part.name, part.part_type)] = position
+            keys = _group_keys(part)
+            self._groups.append(keys)
+            is_owned = (part.name, part.part_type) in owned
+            for key in keys:
+                self._totals[key] = self._totals.get(key, 0) + 1
+                self._owned.setdefault(key, 0)
+                self._missing.setdefault(key, {})
+                if is_owned:
+                    self._owned[key] += 1
+                else:
+                    self._missing[key][position] = part
+                touched.add(key)
+        
+        # Drop groups the catalog no longer has
+        for key in [key for key in touched if self._totals[key] == 0]:
+            del self._totals[key], self._owned[key], self._missing[key]
+            touched.discard(key)
+        
+        if touched:
+            for listener in list(self._listeners):
+                listener(list(touched))
+    
+    def progress(self, key: GroupKey = (OVERALL, None)) -> GroupProgress:
+        return GroupProgress(key, self._owned.get(key, 0), self._totals.get(key, 0))
+    
+    def overall(self) -> GroupProgress:
+        return self.progress((OVERALL, None))
+    
+    def _by_kind(self, kind: str) -> List[GroupProgress]:
+        # Totals were filled in catalog order, so groups come out in catalog order
+        return [self.progress(key) for key in self._totals if key[0] == kind]
+    
+    def by_type(self) -> List[GroupProgress]:
+        return self._by_kind(BY_TYPE)
+    
+    def by_series(self) -> List[GroupProgress]:
+        return self._by_kind(BY_SERIES)
+    
+    def by_rarity(self) -> List[GroupProgress]:
+        return self._by_kind(BY_RARITY)
+    
+    def missing(self, key: GroupKey = (OVERALL, None)) -> List[BeybladePart]:
+        """Catalog parts missing from a group, in catalog order."""
+        group = self._missing.get(key, {})
+        return [group[position] for position in sorted(group)]
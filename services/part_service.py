@@ -3,6 +3,7 @@
 from typing import List, Optional
 from models import BeybladePart, PartType, Collection
 from data import get_all_parts, find_database_part, BEYBLADE_X_DATABASE, save_collection, load_collection
+from diagnostics import timed
 
 
 class PartService:
@@ -29,6 +30,7 @@ class PartService:
         save_collection(self._collection, filename)
     
     @staticmethod
+    @timed("part_service.filter_parts")
     def filter_parts(parts: List[BeybladePart], search_term: str = "", part_type_filter: str = "All") -> List[BeybladePart]:
         """Filter parts by search term and type."""
         filtered = parts
@@ -0,0 +1,134 @@
+"""Cheapest product set to complete a collection (weighted set cover)."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from models import BeybladePart, Collection, PartType, Product
+from data import get_all_parts
+from data.products import get_all_products
+
+
+# Largest number of useful products solved exactly; above this, greedy only
+DEFAULT_EXACT_LIMIT = 30
+
+PartKey = Tuple[str, PartType]
+
+
+@dataclass
+class PurchasePlan:
+    """Products to buy and what they cover."""
+    products: List[Product] = field(default_factory=list)
+    total_cost: float = 0.0
+    covered: List[PartKey] = field(default_factory=list)
+    unavailable: List[PartKey] = field(default_factory=list)
+    exact: bool = True
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class PurchasePlanner:
+    """Plans the cheapest product purchase covering a collection's missing parts.
+    
+    Every part in the product catalog gets a bit position and every product
+    a precomputed bitmask, so a plan only needs the collection's missing
+    mask and a set cover over integers.
+    """
+    
+    def __init__(self, products: Optional[Sequence[Product]] = None):
+        self.products = list(products) if products is not None else get_all_products()
+        self._bits: Dict[PartKey, int] = {}
+        self._keys: List[PartKey] = []
+        self._masks: List[int] = []
+        for product in self.products:
+            mask = 0
+            for key in product.contents:
+                if key not in self._bits:
+                    self._bits[key] = len(self._keys)
+                    self._keys.append(key)
+                mask |= 1 << self._bits[key]
+            self._masks.append(mask)
+    
+    def plan(self, collection: Collection, catalog: Optional[Sequence[BeybladePart]] = None,
+             exact_limit: int = DEFAULT_EXACT_LIMIT) -> PurchasePlan:
+        """Plan purchases for every catalog part the collection is missing."""
+        if catalog is None:
+            catalog = get_all_parts()
+        owned = {(p.name, p.part_type) for p in collection.parts if p.owned_quantity > 0}
+        missing = [(p.name, p.part_type) for p in catalog if (p.name, p.part_type) not in owned]
+        return self.plan_for(missing, exact_limit)
+    
+    def plan_for(self, wanted: Sequence[PartKey], exact_limit: int = DEFAULT_EXACT_LIMIT) -> PurchasePlan:
+        """Plan the cheapest purchase covering a list of wanted parts."""
+        required = 0
+        unavailable = []
+        for key in wanted:
+            bit = self._bits.get(key)
+            if bit is None:
+                unavailable.append(key)
+            else:
+                required |= 1 << bit
+        
+        candidates = [i for i, mask in enumerate(self._masks) if mask & required]
+        chosen = self._greedy(required, candidates)
+        exact = len(candidates) <= exact_limit
+        if exact:
+            chosen = self._exact(required, candidates, chosen)
+        
+        covered = [self._keys[bit] for bit in range(len(self._keys)) if required >> bit & 1]
+        return PurchasePlan(
+            products=[self.products[i] for i in chosen],
+            total_cost=round(sum(self.products[i].price for i in chosen), 2),
+            covered=covered,
+            unavailable=unavailable,
+            exact=exact
+        )
+    
+    def _greedy(self, required: int, candidates: List[int]) -> List[int]:
+        """Repeatedly buy the product with the lowest price per newly covered part."""
+        remaining = required
+        chosen = []
+        while remaining:
+            best, best_ratio = None, None
+            for i in candidates:
+                gain = _popcount(self._masks[i] & remaining)
+                if gain:
+                    ratio = self.products[i].price / gain
+                    if best_ratio is None or ratio < best_ratio:
+                        best, best_ratio = i, ratio
+            chosen.append(best)
+            remaining &= ~self._masks[best]
+        return chosen
+    
+    def _exact(self, required: int, candidates: List[int], upper_bound: List[int]) -> List[int]:
+        """Optimal cover by memoized search on the remaining-parts bitmask.
+        
+        Any cover must include a product containing the lowest missing
+        part, so branching only over those products is complete.
+        """
+        covering: Dict[int, List[int]] = {}
+        for i in candidates:
+            mask = self._masks[i] & required
+            while mask:
+                low = mask & -mask
+                covering.setdefault(low, []).append(i)
+                mask ^= low
+        
+        memo: Dict[int, Tuple[float, Tuple[int, ...]]] = {0: (0.0, ())}
+        
+        def solve(remaining: int) -> Tuple[float, Tuple[int, ...]]:
+            if remaining in memo:
+                return memo[remaining]
+            low = remaining & -remaining
+            best = (float('inf'), ())
+            for i in covering[low]:
+                cost, picks = solve(remaining & ~self._masks[i])
+                cost += self.products[i].price
+                if cost < best[0]:
+                    best = (cost, (i,) + picks)
+            memo[remaining] = best
+            return best
+        
+        cost, picks = solve(required)
+        greedy_cost = sum(self.products[i].price for i in upper_bound)
+        return list(picks) if cost <= greedy_cost else upper_bound
@@ -0,0 +1,187 @@
+"""Elo ratings for combos and individual parts from battle results."""
+
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import BattleRecord, PartType
+from data.battle_log import BattleLog
+from data.persistence import save_ratings, load_ratings
+
+np = None  # NumPy, imported on the first batch recompute since it is slow to import
+
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+
+# Default rating period for batch recomputation (one event day)
+DEFAULT_PERIOD = timedelta(days=1)
+
+PartKey = Tuple[str, PartType]
+
+
+def _load_numpy() -> bool:
+    """Import NumPy on first use; False if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # Batch recompute falls back to sequential replay
+            return False
+        np = numpy
+    return True
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Expected score of a player against an opponent under Elo."""
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+def _part_pairs(battle: BattleRecord) -> Iterable[Tuple[PartKey, PartKey]]:
+    """Slot-wise part matchups (blade vs blade, ratchet vs ratchet, bit vs bit)."""
+    for slot in ('blade', 'ratchet', 'bit'):
+        part_a = getattr(battle.combo_a, slot)
+        part_b = getattr(battle.combo_b, slot)
+        yield (part_a.name, part_a.part_type), (part_b.name, part_b.part_type)
+
+
+def _part_key_to_str(key: PartKey) -> str:
+    return f"{key[1].value}|{key[0]}"
+
+
+def _part_key_from_str(text: str) -> PartKey:
+    part_type, name = text.split('|', 1)
+    return name, PartType(part_type)
+
+
+class RatingService:
+    """Maintains Elo ratings per combo and per part.
+    
+    Bigger finishes move ratings further: the K-factor is scaled by the
+    finish's points relative to an Over/Burst finish.
+    """
+    
+    def __init__(self, k_factor: float = K_FACTOR):
+        self.k_factor = k_factor
+        self.combo_ratings: Dict[str, float] = {}
+        self.part_ratings: Dict[PartKey, float] = {}
+        self.log_position = 0  # Battle log rows already applied
+    
+    def get_combo_rating(self, combo_name: str) -> float:
+        return self.combo_ratings.get(combo_name, DEFAULT_RATING)
+    
+    def get_part_rating(self, name: str, part_type: PartType) -> float:
+        return self.part_ratings.get((name, part_type), DEFAULT_RATING)
+    
+    def _k(self, battle: BattleRecord) -> float:
+        return self.k_factor * battle.finish.points / 2.0
+    
+    @staticmethod
+    def _apply(ratings: dict, key_a, key_b, score_a: float, k: float) -> None:
+        rating_a = ratings.get(key_a, DEFAULT_RATING)
+        rating_b = ratings.get(key_b, DEFAULT_RATING)
+        delta = k * (score_a - expected_score(rating_a, rating_b))
+        ratings[key_a] = rating_a + delta
+        ratings[key_b] = ratings.get(key_b, DEFAULT_RATING) - delta
+    
+    def update(self, battle: BattleRecord) -> None:
+        """Apply a single battle in O(1): one combo pair and three part pairs."""
+        score_a = 1.0 if battle.a_won else 0.0
+        k = self._k(battle)
+        self._apply(self.combo_ratings, battle.combo_a.name, battle.combo_b.name, score_a, k)
+        for key_a, key_b in _part_pairs(battle):
+            self._apply(self.part_ratings, key_a, key_b, score_a, k)
+    
+    def sync(self, battle_log: BattleLog) -> int:
+        """Apply log rows recorded since the last sync, returning how many.
+        
+        Falls back to a full recompute if the log is shorter than the
+        stored position (e.g. it was replaced).
+        """
+        if self.log_position > len(battle_log):
+            self.recompute(battle_log)
+            return len(battle_log)
+        applied = 0
+        for row in range(self.log_position, len(battle_log)):
+            self.update(battle_log.get_record(row))
+            applied += 1
+        self.log_position = len(battle_log)
+        return applied
+    
+    def recompute(self, battle_log: BattleLog, period: timedelta = DEFAULT_PERIOD) -> None:
+        """Recompute all ratings from the full log in rating periods.
+        
+        Battles within a period are rated against the ratings at the start
+        of that period (as in Glicko rating periods), which lets each
+        period be applied as one vectorized update. Without NumPy the
+        battles are replayed one by one instead.
+        """
+        battles = battle_log.records_between()
+        self.combo_ratings = {}
+        self.part_ratings = {}
+        self.log_position = len(battle_log)
+        if not battles:
+            return
+        if not _load_numpy():
+            for battle in battles:
+                self.update(battle)
+            return
+        
+        start = battles[0].timestamp
+        periods = np.array([(b.timestamp - start) // period for b in battles], dtype=np.int64)
+        scores = np.array([1.0 if b.a_won else 0.0 for b in battles])
+        ks = np.array([self._k(b) for b in battles])
+        
+        self.combo_ratings = self._batch_ratings(
+            [(b.combo_a.name, b.combo_b.name) for b in battles], periods, scores, ks)
+        
+        part_pairs = [pair for b in battles for pair in _part_pairs(b)]
+        self.part_ratings = self._batch_ratings(
+            part_pairs, np.repeat(periods, 3), np.repeat(scores, 3), np.repeat(ks, 3))
+    
+    @staticmethod
+    def _batch_ratings(pairs: List[tuple], periods, scores, ks) -> dict:
+        """Vectorized Elo over matches sorted by rating period."""
+        index: Dict[object, int] = {}
+        first = np.array([index.setdefault(a, len(index)) for a, _ in pairs], dtype=np.int64)
+        second = np.array([index.setdefault(b, len(index)) for _, b in pairs], dtype=np.int64)
+        ratings = np.full(len(index), DEFAULT_RATING)
+        
+        boundaries = np.flatnonzero(np.diff(periods)) + 1
+        for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(pairs)]):
+            a, b = first[lo:hi], second[lo:hi]
+            expected = 1.0 / (1.0 + 10 ** ((ratings[b] - ratings[a]) / 400.0))
+            delta = ks[lo:hi] * (scores[lo:hi] - expected)
+            changes = np.zeros_like(ratings)
+            np.add.at(changes, a, delta)
+            np.add.at(changes, b, -delta)
+            ratings += changes
+        
+        return {key: float(ratings[i]) for key, i in index.items()}
+    
+    def to_dict(self) -> dict:
+        return {
+            'k_factor': self.k_factor,
+            'log_position': self.log_position,
+            'combos': self.combo_ratings,
+            'parts': {_part_key_to_str(key): rating for key, rating in self.part_ratings.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RatingService':
+        service = cls(k_factor=data.get('k_factor', K_FACTOR))
+        service.log_position = data.get('log_position', 0)
+        service.combo_ratings = dict(data.get('combos', {}))
+        service.part_ratings = {_part_key_from_str(key): rating for key, rating in data.get('parts', {}).items()}
+        return service
+    
+    def save(self, filename: str = "ratings.json") -> None:
+        """Persist ratings together with the log position they cover."""
+        save_ratings(self.to_dict(), filename)
+    
+    @classmethod
+    def load(cls, battle_log: Optional[BattleLog] = None, filename: str = "ratings.json") -> 'RatingService':
+        """Load persisted ratings and catch up on any newer log rows."""
+        data = load_ratings(filename)
+        service = cls.from_dict(data) if data else cls()
+        if battle_log is not None:
+            service.sync(battle_log)
+        return service
@@ -0,0 +1,109 @@
+"""Next-purchase recommendations by marginal combo gain."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from models import BeybladePart, Collection, PartType
+from data import get_all_parts
+from services.combo_service import ComboService, ARCHETYPES
+
+
+@dataclass
+class Recommendation:
+    """Marginal value of adding one catalog part to a collection."""
+    part: BeybladePart
+    combo_gain: int
+    score_gain: float
+    best_combo_score: Optional[float]
+
+
+def _best(values) -> Optional[float]:
+    return max(values, default=None)
+
+
+def _add(*terms: Optional[float]) -> Optional[float]:
+    """Sum score terms, where None means "no such part owned"."""
+    return None if any(term is None for term in terms) else sum(terms)
+
+
+class RecommendationService:
+    """Service ranking unowned catalog parts for a collection."""
+    
+    @staticmethod
+    def recommend(collection: Collection, catalog: Optional[Sequence[BeybladePart]] = None,
+                  limit: Optional[int] = None, by: str = 'score') -> List[Recommendation]:
+        """Rank catalog parts the collection does not own.
+        
+        ``by='score'`` ranks by improvement of the best combo score (ties
+        broken by new combos), ``by='combos'`` by new buildable combos.
+        
+        Because combo scores are additive per part plus a blade/bit
+        synergy term, each candidate's gain is an O(1) lookup against
+        per-type counts and per-archetype best partners computed once
+        from the owned parts.
+        """
+        if catalog is None:
+            catalog = get_all_parts()
+        
+        owned = {(p.name, p.part_type) for p in collection.parts if p.owned_quantity > 0}
+        by_type: Dict[PartType, List[BeybladePart]] = {part_type: [] for part_type in PartType}
+        for part in collection.parts:
+            if part.owned_quantity > 0:
+                by_type[part.part_type].append(part)
+        blades, ratchets, bits = by_type[PartType.BLADE], by_type[PartType.RATCHET], by_type[PartType.BIT]
+        
+        # Cached scores of the owned parts
+        best_ratchet = _best(ComboService.score_part(r) for r in ratchets)
+        best_blade_by_archetype = {
+            archetype: _best(ComboService.score_part(b) for b in blades
+                             if ComboService.get_archetype(b) == archetype)
+            for archetype in ARCHETYPES
+        }
+        # Best owned bit (or blade) including synergy, for a partner of each archetype
+        best_bit_for = {
+            archetype: _best(ComboService.score_part(t) + ComboService.synergy(archetype, ComboService.get_archetype(t))
+                             for t in bits)
+            for archetype in ARCHETYPES
+        }
+        best_blade_for = {
+            archetype: _best(ComboService.score_part(b) + ComboService.synergy(ComboService.get_archetype(b), archetype)
+                             for b in blades)
+            for archetype in ARCHETYPES
+        }
+        best_pair = _best(
+            value for value in (_add(best_blade_by_archetype[a], best_bit_for[a]) for a in ARCHETYPES)
+            if value is not None
+        )
+        current_best = _add(best_pair, best_ratchet)
+        
+        counts = {PartType.BLADE: len(blades), PartType.RATCHET: len(ratchets), PartType.BIT: len(bits)}
+        
+        recommendations = []
+        for part in catalog:
+            if (part.name, part.part_type) in owned:
+                continue
+            
+            score = ComboService.score_part(part)
+            if part.part_type == PartType.BLADE:
+                combo_gain = counts[PartType.RATCHET] * counts[PartType.BIT]
+                new_best = _add(score, best_ratchet, best_bit_for[ComboService.get_archetype(part)])
+            elif part.part_type == PartType.RATCHET:
+                combo_gain = counts[PartType.BLADE] * counts[PartType.BIT]
+                new_best = _add(score, best_pair)
+            else:
+                combo_gain = counts[PartType.BLADE] * counts[PartType.RATCHET]
+                new_best = _add(score, best_ratchet, best_blade_for[ComboService.get_archetype(part)])
+            
+            if new_best is None:
+                score_gain, best_score = 0.0, current_best
+            elif current_best is None:
+                score_gain, best_score = new_best, new_best  # Completes the first buildable combo
+            else:
+                score_gain, best_score = max(0.0, new_best - current_best), max(new_best, current_best)
+            
+            recommendations.append(Recommendation(part, combo_gain, score_gain, best_score))
+        
+        if by == 'combos':
+            recommendations.sort(key=lambda r: (r.combo_gain, r.score_gain), reverse=True)
+        else:
+            recommendations.sort(key=lambda r: (r.score_gain, r.combo_gain), reverse=True)
+        return recommendations if limit is None else recommendations[:limit]
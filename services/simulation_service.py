@@ -0,0 +1,209 @@
+"""Monte Carlo battle simulation between combos."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from models import BeybladeCombo, FinishType
+from services.combo_service import ComboService, ARCHETYPES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the simulator needs it
+    np = None
+
+
+FINISH_TYPES = list(FinishType)
+
+# Archetype advantage logits, row archetype attacking column archetype
+# (Attack > Stamina > Defense > Attack, Balance is neutral)
+ARCHETYPE_ADVANTAGE = [
+    # Attack, Defense, Stamina, Balance
+    [0.0, -0.5, 0.5, 0.0],   # Attack
+    [0.5, 0.0, -0.5, 0.0],   # Defense
+    [-0.5, 0.5, 0.0, 0.0],   # Stamina
+    [0.0, 0.0, 0.0, 0.0],    # Balance
+]
+
+# Finish type logits (Spin, Over, Burst, Xtreme) by the winner's blade archetype
+FINISH_LOGITS = [
+    [0.0, 1.0, 0.6, 0.8],    # Attack
+    [0.8, 0.6, 0.3, -0.5],   # Defense
+    [1.5, 0.0, 0.0, -1.0],   # Stamina
+    [0.8, 0.5, 0.4, 0.0],    # Balance
+]
+
+WEIGHT_FACTOR = 0.15
+BIT_ADVANTAGE_FACTOR = 0.5
+SYNERGY_FACTOR = 0.1
+BURST_HEIGHT_FACTOR = 0.3
+BURST_SIDES_FACTOR = 0.15
+XTREME_BIT_BONUS = 0.5
+
+FEATURE_COLUMNS = ('weight', 'blade_archetype', 'bit_archetype',
+                   'ratchet_sides', 'ratchet_height', 'synergy')
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for battle simulation (pip install numpy)")
+
+
+def build_feature_table(combos: Sequence[BeybladeCombo]) -> Dict[str, "np.ndarray"]:
+    """Build column arrays of battle features, one row per combo."""
+    _require_numpy()
+    rows = [ComboService.get_features(combo) for combo in combos]
+    table = {}
+    for column in FEATURE_COLUMNS:
+        dtype = np.int64 if column.endswith('archetype') else np.float64
+        table[column] = np.array([row[column] for row in rows], dtype=dtype)
+    return table
+
+
+def _finish_probabilities(winner: dict, loser: dict) -> "np.ndarray":
+    """Probabilities of each finish type given who won, shape (..., K)."""
+    logits = np.asarray(FINISH_LOGITS)[winner['blade_archetype']]
+    logits = np.broadcast_to(logits, np.broadcast(winner['weight'], loser['weight']).shape
+                             + (len(FINISH_TYPES),)).copy()
+    burst = FINISH_TYPES.index(FinishType.BURST)
+    xtreme = FINISH_TYPES.index(FinishType.XTREME)
+    logits[..., burst] += (BURST_HEIGHT_FACTOR * (loser['ratchet_height'] - 6.0)
+                           - BURST_SIDES_FACTOR * (loser['ratchet_sides'] - 3))
+    logits[..., xtreme] += XTREME_BIT_BONUS * (winner['bit_archetype'] == ARCHETYPES.index('Attack'))
+    logits -= logits.max(axis=-1, keepdims=True)
+    weights = np.exp(logits)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+def outcome_probabilities(first: dict, second: dict):
+    """Get win probability and finish distributions for paired feature rows.
+    
+    ``first`` and ``second`` map feature names to arrays that broadcast
+    against each other. Returns ``(p_win, first_finishes, second_finishes)``
+    where ``p_win`` is the chance ``first`` wins and the finish arrays
+    carry a trailing axis over ``FINISH_TYPES``.
+    """
+    _require_numpy()
+    advantage = np.asarray(ARCHETYPE_ADVANTAGE)
+    logit = (WEIGHT_FACTOR * (first['weight'] - second['weight'])
+             + advantage[first['blade_archetype'], second['blade_archetype']]
+             + BIT_ADVANTAGE_FACTOR * advantage[first['bit_archetype'], second['bit_archetype']]
+             + SYNERGY_FACTOR * (first['synergy'] - second['synergy']))
+    p_win = 1.0 / (1.0 + np.exp(-logit))
+    return p_win, _finish_probabilities(first, second), _finish_probabilities(second, first)
+
+
+def split_counts(rng, counts, probabilities):
+    """Split counts across the last axis of ``probabilities`` (multinomial).
+    
+    Uses conditional binomials so arbitrary batch shapes are sampled in
+    a single vectorized call per category.
+    """
+    result = np.empty(probabilities.shape, dtype=np.int64)
+    remaining = np.asarray(counts, dtype=np.int64).copy()
+    rest = np.ones(remaining.shape)
+    for k in range(probabilities.shape[-1] - 1):
+        p_k = probabilities[..., k]
+        q = np.divide(p_k, rest, out=np.zeros_like(rest), where=rest > 0)
+        drawn = rng.binomial(remaining, np.clip(q, 0.0, 1.0))
+        result[..., k] = drawn
+        remaining -= drawn
+        rest = rest - p_k
+    result[..., -1] = remaining
+    return result
+
+
+@dataclass
+class MatchupResult:
+    """Estimated outcome of combo A versus combo B."""
+    combo_a: str
+    combo_b: str
+    trials: int
+    win_rate: float
+    loss_rate: float
+    win_finishes: Dict[FinishType, float]
+    loss_finishes: Dict[FinishType, float]
+    
+    def to_dict(self) -> dict:
+        return {
+            'combo_a': self.combo_a,
+            'combo_b': self.combo_b,
+            'trials': self.trials,
+            'win_rate': self.win_rate,
+            'loss_rate': self.loss_rate,
+            'win_finishes': {f.value: rate for f, rate in self.win_finishes.items()},
+            'loss_finishes': {f.value: rate for f, rate in self.loss_finishes.items()}
+        }
+
+
+class MatchupMatrix:
+    """Simulated results for every ordered pair of a list of combos."""
+    
+    def __init__(self, names: List[str], trials: int, wins, finishes):
+        self.names = names
+        self.trials = trials
+        self.wins = wins          # (N, N) trials won by row against column
+        self.finishes = finishes  # (N, N, K) row wins split by finish type
+    
+    def win_rates(self):
+        """Get the (N, N) matrix of row-beats-column probabilities."""
+        return self.wins / float(self.trials)
+    
+    def overall_win_rates(self):
+        """Get each combo's mean win rate against every other combo."""
+        n = len(self.names)
+        if n < 2:
+            return np.zeros(n)
+        return self.wins.sum(axis=1) / float(self.trials * (n - 1))
+    
+    def result(self, i: int, j: int) -> MatchupResult:
+        """Get the matchup result of combo ``i`` against combo ``j``."""
+        return MatchupResult(
+            combo_a=self.names[i],
+            combo_b=self.names[j],
+            trials=self.trials,
+            win_rate=float(self.wins[i, j]) / self.trials,
+            loss_rate=float(self.wins[j, i]) / self.trials,
+            win_finishes={f: float(self.finishes[i, j, k]) / self.trials for k, f in enumerate(FINISH_TYPES)},
+            loss_finishes={f: float(self.finishes[j, i, k]) / self.trials for k, f in enumerate(FINISH_TYPES)}
+        )
+
+
+class BattleSimulator:
+    """Vectorized Monte Carlo estimator of combo matchups."""
+    
+    def __init__(self, trials: int = 1000, seed: Optional[int] = None):
+        """Initialize with trials per matchup and an optional RNG seed."""
+        _require_numpy()
+        self.trials = trials
+        self.seed = seed
+    
+    def simulate(self, combo_a: BeybladeCombo, combo_b: BeybladeCombo) -> MatchupResult:
+        """Estimate the outcome of a single matchup."""
+        return self.matchup_matrix([combo_a, combo_b]).result(0, 1)
+    
+    def matchup_matrix(self, combos: Sequence[BeybladeCombo]) -> MatchupMatrix:
+        """Simulate every pair of combos in one batched pass.
+        
+        Each unordered pair is sampled once, so ``wins[i, j] + wins[j, i]``
+        always equals the number of trials. Results are reproducible for
+        the same seed and combo order.
+        """
+        rng = np.random.default_rng(self.seed)
+        table = build_feature_table(combos)
+        n = len(combos)
+        rows, cols = np.triu_indices(n, 1)
+        
+        first = {name: column[rows] for name, column in table.items()}
+        second = {name: column[cols] for name, column in table.items()}
+        p_win, first_finishes, second_finishes = outcome_probabilities(first, second)
+        
+        first_wins = rng.binomial(self.trials, p_win)
+        second_wins = self.trials - first_wins
+        
+        wins = np.zeros((n, n), dtype=np.int64)
+        finishes = np.zeros((n, n, len(FINISH_TYPES)), dtype=np.int64)
+        wins[rows, cols] = first_wins
+        wins[cols, rows] = second_wins
+        finishes[rows, cols] = split_counts(rng, first_wins, first_finishes)
+        finishes[cols, rows] = split_counts(rng, second_wins, second_finishes)
+        
+        return MatchupMatrix([combo.name for combo in combos], self.trials, wins, finishes)
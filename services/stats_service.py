@@ -2,12 +2,14 @@
 
 from typing import Dict
 from models import Collection, PartType
+from diagnostics import timed
 
 
 class StatsService:
     """Service for calculating collection statistics."""
     
     @staticmethod
+    @timed("stats_service.generate_stats_text")
     def generate_stats_text(collection: Collection) -> str:
         """Calculate and format collection statistics."""
         total_parts = len(collection.parts)
@@ -63,3 +65,22 @@ class StatsService:
 """
         
         return stats_content
+    
+    @staticmethod
+    def summarize(collection: Collection) -> Dict[str, object]:
+        """Collection totals as plain data, for machine-readable reports."""
+        by_type = {part_type.value: {'unique': 0, 'quantity': 0} for part_type in PartType}
+        by_rarity: Dict[str, int] = {}
+        for part in collection.parts:
+            counts = by_type[part.part_type.value]
+            counts['unique'] += 1
+            counts['quantity'] += part.owned_quantity
+            by_rarity[part.rarity.value] = by_rarity.get(part.rarity.value, 0) + part.owned_quantity
+        return {
+            'unique_parts': len(collection.parts),
+            'total_quantity': sum(part.owned_quantity for part in collection.parts),
+            'combos': len(collection.combos),
+            'by_type': by_type,
+            'by_rarity': by_rarity,
+            'total_weight': round(sum((p.weight or 0) * p.owned_quantity for p in collection.parts), 1)
+        }
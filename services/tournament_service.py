@@ -0,0 +1,371 @@
+"""Multi-process round-robin and Swiss tournament simulation."""
+
+import math
+import random
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from models import BeybladeCombo, BeybladePart
+from services.simulation_service import FINISH_TYPES, build_feature_table, outcome_probabilities, np, _require_numpy
+
+
+ROUND_ROBIN = "Round Robin"
+SWISS = "Swiss"
+
+# Per-deck counters returned by every shard, in this order
+_STAT_FIELDS = ('wins', 'losses', 'draws', 'points_for', 'points_against')
+
+# Pairs simulated per task sent to a worker process
+DEFAULT_SHARD_SIZE = 50000
+
+# Poll interval while waiting on shards, so cancellation stays responsive
+_WAIT_TIMEOUT = 0.1
+
+
+@dataclass
+class Deck:
+    """A named tournament entry made of one or more combos."""
+    name: str
+    combos: List[BeybladeCombo]
+
+
+@dataclass
+class Standing:
+    """Accumulated tournament record of a single deck."""
+    deck: str
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    points_for: int = 0
+    points_against: int = 0
+    
+    @property
+    def matches(self) -> int:
+        return self.wins + self.losses + self.draws
+    
+    @property
+    def match_points(self) -> int:
+        return 3 * self.wins + self.draws
+    
+    def to_dict(self) -> dict:
+        return {
+            'deck': self.deck,
+            'wins': self.wins,
+            'losses': self.losses,
+            'draws': self.draws,
+            'points_for': self.points_for,
+            'points_against': self.points_against,
+            'match_points': self.match_points
+        }
+
+
+@dataclass
+class TournamentResult:
+    """Final (or partial, if cancelled) outcome of a tournament."""
+    format: str
+    standings: List[Standing]
+    matches_played: int
+    cancelled: bool = False
+    rounds: int = 0
+
+
+ProgressCallback = Callable[[int, int], None]
+
+
+# ----------------------------------------------------------------------
+# Worker side. The field is shipped once per process by the initializer;
+# tasks only carry index ranges or pair arrays.
+# ----------------------------------------------------------------------
+
+_worker_state: Dict[str, object] = {}
+
+
+def _init_worker(part_dicts: List[dict], combo_rows: List[Tuple[int, int, int]], deck_rows: List[List[int]]) -> None:
+    """Rebuild the field's feature table inside a worker process."""
+    parts = [BeybladePart.from_dict(data) for data in part_dicts]
+    combos = [BeybladeCombo(name=str(i), blade=parts[blade], ratchet=parts[ratchet], bit=parts[bit])
+              for i, (blade, ratchet, bit) in enumerate(combo_rows)]
+    _worker_state['features'] = build_feature_table(combos)
+    _worker_state['decks'] = np.asarray(deck_rows, dtype=np.int64)
+    _worker_state['points'] = np.array([finish.points for finish in FINISH_TYPES], dtype=np.int64)
+
+
+def _play_pairs(first, second, rng):
+    """Play deck ``first[i]`` against ``second[i]`` slot by slot, returning points."""
+    features = _worker_state['features']
+    decks = _worker_state['decks']
+    finish_points = _worker_state['points']
+    first_points = np.zeros(len(first), dtype=np.int64)
+    second_points = np.zeros(len(first), dtype=np.int64)
+    
+    for slot in range(decks.shape[1]):
+        first_combos = decks[first, slot]
+        second_combos = decks[second, slot]
+        p_win, first_finishes, second_finishes = outcome_probabilities(
+            {name: column[first_combos] for name, column in features.items()},
+            {name: column[second_combos] for name, column in features.items()}
+        )
+        first_won = rng.random(len(first)) < p_win
+        finish_cdf = np.cumsum(np.where(first_won[:, None], first_finishes, second_finishes), axis=1)
+        finish = np.minimum((rng.random(len(first))[:, None] > finish_cdf).sum(axis=1), len(FINISH_TYPES) - 1)
+        points = finish_points[finish]
+        first_points += np.where(first_won, points, 0)
+        second_points += np.where(first_won, 0, points)
+    
+    return first_points, second_points
+
+
+def _aggregate(first, second, first_points, second_points):
+    """Reduce per-match points to per-deck counters, shape (len(_STAT_FIELDS), D)."""
+    n_decks = _worker_state['decks'].shape[0]
+    stats = np.zeros((len(_STAT_FIELDS), n_decks), dtype=np.int64)
+    first_won = first_points > second_points
+    second_won = second_points > first_points
+    drawn = ~(first_won | second_won)
+    for deck, won, lost, points_for, points_against in ((first, first_won, second_won, first_points, second_points),
+                                                        (second, second_won, first_won, second_points, first_points)):
+        stats[0] += np.bincount(deck, weights=won, minlength=n_decks).astype(np.int64)
+        stats[1] += np.bincount(deck, weights=lost, minlength=n_decks).astype(np.int64)
+        stats[2] += np.bincount(deck, weights=drawn, minlength=n_decks).astype(np.int64)
+        stats[3] += np.bincount(deck, weights=points_for, minlength=n_decks).astype(np.int64)
+        stats[4] += np.bincount(deck, weights=points_against, minlength=n_decks).astype(np.int64)
+    return stats
+
+
+def _round_robin_shard(row_start: int, row_end: int, seed_key: Tuple[int, ...]):
+    """Play every deck in ``[row_start, row_end)`` against all later decks."""
+    n_decks = _worker_state['decks'].shape[0]
+    rows = np.arange(row_start, row_end)
+    counts = n_decks - rows - 1
+    first = np.repeat(rows, counts)
+    # Column index for each pair: row + 1 + offset within the row's run
+    offsets = np.arange(first.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    rng = np.random.default_rng(seed_key)
+    first_points, second_points = _play_pairs(first, second, rng)
+    return first.size, _aggregate(first, second, first_points, second_points)
+
+
+def _pairs_shard(first, second, seed_key: Tuple[int, ...]):
+    """Play an explicit list of deck pairings (one Swiss round slice)."""
+    rng = np.random.default_rng(seed_key)
+    first_points, second_points = _play_pairs(first, second, rng)
+    return len(first), _aggregate(first, second, first_points, second_points)
+
+
+class _InlineExecutor:
+    """Executor stand-in that runs tasks in the calling process."""
+    
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+    
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+# Parent side
+# ----------------------------------------------------------------------
+
+class TournamentSimulator:
+    """Simulates tournaments over a field of decks using a process pool."""
+    
+    def __init__(self, decks: Sequence[Deck], processes: Optional[int] = None,
+                 shard_size: int = DEFAULT_SHARD_SIZE, seed: Optional[int] = None):
+        """Initialize the simulator.
+        
+        ``processes=0`` runs every shard in the calling process, which is
+        useful for small fields and for debugging.
+        """
+        _require_numpy()
+        if not decks:
+            raise ValueError("A tournament needs at least one deck")
+        if len({len(deck.combos) for deck in decks}) != 1:
+            raise ValueError("All decks must have the same number of combos")
+        self.decks = list(decks)
+        self.processes = processes
+        self.shard_size = max(1, shard_size)
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self._initargs = self._encode_field(self.decks)
+        self._stats = None
+        self._matches_played = 0
+    
+    @staticmethod
+    def _encode_field(decks: Sequence[Deck]):
+        """Intern parts and combos so the field pickles once and compactly."""
+        part_index: Dict[Tuple[str, str], int] = {}
+        part_dicts: List[dict] = []
+        combo_index: Dict[Tuple[int, int, int], int] = {}
+        combo_rows: List[Tuple[int, int, int]] = []
+        deck_rows: List[List[int]] = []
+        
+        def intern_part(part: BeybladePart) -> int:
+            key = (part.name, part.part_type.value)
+            if key not in part_index:
+                part_index[key] = len(part_dicts)
+                part_dicts.append(part.to_dict())
+            return part_index[key]
+        
+        for deck in decks:
+            row = []
+            for combo in deck.combos:
+                key = (intern_part(combo.blade), intern_part(combo.ratchet), intern_part(combo.bit))
+                if key not in combo_index:
+                    combo_index[key] = len(combo_rows)
+                    combo_rows.append(key)
+                row.append(combo_index[key])
+            deck_rows.append(row)
+        
+        return part_dicts, combo_rows, deck_rows
+    
+    @contextmanager
+    def _executor(self):
+        if self.processes == 0:
+            executor = _InlineExecutor(_init_worker, self._initargs)
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                           initargs=self._initargs)
+        try:
+            yield executor
+        finally:
+            # Never wait for running shards: after a cancel their results are
+            # discarded, and a finished run has none left
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _reset(self) -> None:
+        self._stats = np.zeros((len(_STAT_FIELDS), len(self.decks)), dtype=np.int64)
+        self._matches_played = 0
+    
+    def _drain(self, futures: List[Future], total: int, done: int,
+               progress_callback: Optional[ProgressCallback],
+               cancel_event: Optional[threading.Event]) -> Tuple[int, bool]:
+        """Fold shard results into the standings as they finish.
+        
+        Returns the updated progress count and whether the run was cancelled.
+        """
+        pending = set(futures)
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                for future in pending:
+                    future.cancel()
+                return done, True
+            finished, pending = wait(pending, timeout=_WAIT_TIMEOUT, return_when=FIRST_COMPLETED)
+            for future in finished:
+                matches, stats = future.result()
+                self._stats += stats
+                self._matches_played += matches
+                done += matches
+                if progress_callback:
+                    progress_callback(done, total)
+        return done, False
+    
+    def standings(self) -> List[Standing]:
+        """Get the current standings, best first."""
+        if self._stats is None:
+            self._reset()
+        standings = [
+            Standing(deck.name, *(int(value) for value in self._stats[:, i]))
+            for i, deck in enumerate(self.decks)
+        ]
+        standings.sort(key=lambda s: (s.match_points, s.points_for - s.points_against, s.points_for),
+                       reverse=True)
+        return standings
+    
+    def _row_shards(self) -> List[Tuple[int, int]]:
+        """Split round-robin rows into ranges holding about ``shard_size`` pairs."""
+        n = len(self.decks)
+        shards = []
+        start, pairs = 0, 0
+        for row in range(n):
+            pairs += n - row - 1
+            if pairs >= self.shard_size:
+                shards.append((start, row + 1))
+                start, pairs = row + 1, 0
+        if start < n:
+            shards.append((start, n))
+        return shards
+    
+    def run_round_robin(self, progress_callback: Optional[ProgressCallback] = None,
+                        cancel_event: Optional[threading.Event] = None) -> TournamentResult:
+        """Play every deck against every other deck once."""
+        self._reset()
+        n = len(self.decks)
+        total = n * (n - 1) // 2
+        with self._executor() as executor:
+            futures = [executor.submit(_round_robin_shard, start, end, (self.seed, 0, shard))
+                       for shard, (start, end) in enumerate(self._row_shards())]
+            _, cancelled = self._drain(futures, total, 0, progress_callback, cancel_event)
+        return TournamentResult(ROUND_ROBIN, self.standings(), self._matches_played, cancelled, rounds=1)
+    
+    def _swiss_pairings(self, played: set, byes: set,
+                        rng: random.Random) -> Tuple[List[int], List[int], Optional[int]]:
+        """Pair decks with similar records, avoiding rematches and second byes where possible."""
+        order = list(range(len(self.decks)))
+        rng.shuffle(order)
+        stats = self._stats
+        order.sort(key=lambda i: (3 * stats[0, i] + stats[2, i], stats[3, i] - stats[4, i]), reverse=True)
+        
+        bye = None
+        if len(order) % 2:
+            # The lowest-ranked deck that has not had a bye yet
+            bye_pos = next((pos for pos in range(len(order) - 1, -1, -1) if order[pos] not in byes), len(order) - 1)
+            bye = order.pop(bye_pos)
+            byes.add(bye)
+        
+        first, second = [], []
+        unpaired = order
+        while unpaired:
+            deck = unpaired[0]
+            partner_pos = next((pos for pos in range(1, len(unpaired))
+                                if (min(deck, unpaired[pos]), max(deck, unpaired[pos])) not in played), 1)
+            partner = unpaired[partner_pos]
+            first.append(deck)
+            second.append(partner)
+            played.add((min(deck, partner), max(deck, partner)))
+            unpaired = unpaired[1:partner_pos] + unpaired[partner_pos + 1:]
+        return first, second, bye
+    
+    def run_swiss(self, rounds: Optional[int] = None,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  cancel_event: Optional[threading.Event] = None) -> TournamentResult:
+        """Play a Swiss-system tournament (default: ceil(log2(decks)) rounds)."""
+        self._reset()
+        n = len(self.decks)
+        if rounds is None:
+            rounds = max(1, math.ceil(math.log2(n))) if n > 1 else 1
+        total = rounds * (n // 2)
+        played: set = set()
+        byes: set = set()
+        rng = random.Random(self.seed)
+        done, cancelled, rounds_played = 0, False, 0
+        
+        with self._executor() as executor:
+            for round_number in range(rounds):
+                first, second, bye = self._swiss_pairings(played, byes, rng)
+                if bye is not None:
+                    self._stats[0, bye] += 1
+                first = np.asarray(first, dtype=np.int64)
+                second = np.asarray(second, dtype=np.int64)
+                futures = [
+                    executor.submit(_pairs_shard, first[start:start + self.shard_size],
+                                    second[start:start + self.shard_size],
+                                    (self.seed, round_number + 1, shard))
+                    for shard, start in enumerate(range(0, len(first), self.shard_size))
+                ]
+                # Standings must be complete before the next round can be paired
+                done, cancelled = self._drain(futures, total, done, progress_callback, cancel_event)
+                if cancelled:
+                    break
+                rounds_played += 1
+        
+        return TournamentResult(SWISS, self.standings(), self._matches_played, cancelled, rounds=rounds_played)
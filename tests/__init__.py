@@ -0,0 +1 @@
+"""Tests for the Beyblade X Collection Manager; run with ``python -m pytest``."""
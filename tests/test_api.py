@@ -0,0 +1,93 @@
+"""HTTP API: ETags, conditional requests and saves that conflict."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from api.server import CollectionAPI, CollectionServer
+from data.database import get_all_parts
+from data.persistence import load_collection, save_collection
+from models import BeybladePart, Collection
+
+
+def _catalog_part(index: int, quantity: int = 1) -> BeybladePart:
+    part = get_all_parts()[index]
+    return BeybladePart(part.name, part.part_type, part.series, part.rarity, part.weight, part.description,
+                        owned_quantity=quantity)
+
+
+@pytest.fixture
+def collection_file(tmp_path):
+    path = str(tmp_path / "collection.json")
+    collection = Collection()
+    collection.add_part(_catalog_part(0))
+    save_collection(collection, path)
+    return path
+
+
+@pytest.fixture
+def serve():
+    servers = []
+    
+    def start(api: CollectionAPI):
+        server = CollectionServer(api, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(connection, method, path, body=None, headers=None):
+    connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    return response.status, response.getheader('ETag'), json.loads(data) if data else None
+
+
+def test_unchanged_collection_is_not_modified(collection_file, serve):
+    connection = serve(CollectionAPI(load_collection(collection_file), collection_file))
+    status, etag, _ = _request(connection, 'GET', '/parts')
+    assert status == 200
+    status, again, body = _request(connection, 'GET', '/parts', headers={'If-None-Match': etag})
+    assert (status, again, body) == (304, etag, None)
+
+
+def test_write_changes_etag(collection_file, serve):
+    connection = serve(CollectionAPI(load_collection(collection_file), collection_file))
+    _, etag, _ = _request(connection, 'GET', '/parts')
+    part = _catalog_part(1)
+    status, _, _ = _request(connection, 'POST', '/parts', {'name': part.name, 'part_type': part.part_type.value})
+    assert status == 201
+    status, new_etag, body = _request(connection, 'GET', '/parts', headers={'If-None-Match': etag})
+    assert status == 200
+    assert new_etag != etag
+    assert part.name in {item['name'] for item in body['items']}
+
+
+def test_merged_conflicting_save_changes_etag(collection_file, serve):
+    api = CollectionAPI(load_collection(collection_file), collection_file)
+    connection = serve(api)
+    
+    # Another instance saves the file after the server loaded it
+    elsewhere = load_collection(collection_file)
+    theirs = _catalog_part(2)
+    elsewhere.add_part(theirs)
+    save_collection(elsewhere, collection_file)
+    
+    ours = _catalog_part(1)
+    status, _, added = _request(connection, 'POST', '/parts', {'name': ours.name, 'part_type': ours.part_type.value})
+    assert status == 201
+    
+    # A client that saw the server's own write before the merge must not get a 304
+    before_merge = f'"{api.etag_prefix}-{added["version"]}"'
+    status, etag, body = _request(connection, 'GET', '/parts', headers={'If-None-Match': before_merge})
+    assert status == 200
+    assert etag != before_merge
+    assert {ours.name, theirs.name} <= {item['name'] for item in body['items']}
+    assert api.view().version == api.collection.version
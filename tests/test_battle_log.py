@@ -0,0 +1,107 @@
+"""Battle log: file ids, malformed lines and indexed win rates."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from data.battle_log import BattleLog
+from models import BattleRecord, BeybladeCombo, BeybladePart, FinishType, PartType, Rarity
+
+
+START = datetime(2026, 1, 1, 12)
+
+
+def _combo(name: str) -> BeybladeCombo:
+    def part(part_name, part_type):
+        return BeybladePart(part_name, part_type, 'BX-01', Rarity.COMMON)
+    return BeybladeCombo(name, part(f"{name} Blade", PartType.BLADE), part('3-60', PartType.RATCHET),
+                         part('Flat', PartType.BIT))
+
+
+def _battle(a: BeybladeCombo, b: BeybladeCombo, winner: BeybladeCombo, days: int = 0) -> BattleRecord:
+    return BattleRecord(a, b, FinishType.SPIN, winner.name, START + timedelta(days=days))
+
+
+def _summary(log: BattleLog) -> list:
+    return [(record.combo_a.name, record.combo_b.name, record.winner) for record in log.records_between()]
+
+
+def test_reload_matches_recorded(tmp_path):
+    path = str(tmp_path / "battles.jsonl")
+    a, b, c = _combo("A"), _combo("B"), _combo("C")
+    log = BattleLog(path)
+    log.record(_battle(a, b, a))
+    log.record(_battle(c, a, c, days=1))
+    log.record(_battle(b, c, c, days=2))
+    
+    reloaded = BattleLog(path)
+    reloaded.load()
+    assert _summary(reloaded) == _summary(log) == [("A", "B", "A"), ("C", "A", "C"), ("B", "C", "C")]
+
+
+def test_skipped_definition_does_not_shift_later_ids(tmp_path):
+    path = tmp_path / "battles.jsonl"
+    a, c = _combo("A"), _combo("C")
+    lines = [
+        {'c': 0, 'combo': a.to_dict()},
+        {'c': 1, 'combo': {'name': "Broken"}},  # Unreadable definition
+        {'c': 2, 'combo': c.to_dict()},
+        [START.timestamp(), 0, 2, FinishType.SPIN.name, 1],
+        [START.timestamp(), 0, 1, FinishType.SPIN.name, 0],  # Refers to the unreadable combo
+        [START.timestamp(), 0, 0, FinishType.SPIN.name, 0],  # A combo against itself
+        [START.timestamp(), 0, 2, "NOT_A_FINISH", 0],
+        {'combo': c.to_dict()},  # No id
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + '[1, 0')  # Torn last line
+    
+    log = BattleLog(str(path))
+    log.load()
+    assert _summary(log) == [("A", "C", "C")]
+    
+    # New combos take ids after every stored one, including the unreadable one
+    d = _combo("D")
+    log.record(_battle(d, a, d, days=1))
+    reloaded = BattleLog(str(path))
+    reloaded.load()
+    assert _summary(reloaded) == [("A", "C", "C"), ("D", "A", "D")]
+
+
+def test_failed_write_keeps_ids_in_step_with_file(tmp_path):
+    directory = tmp_path / "logs"
+    path = str(directory / "battles.jsonl")
+    a, b, c, d = _combo("A"), _combo("B"), _combo("C"), _combo("D")
+    log = BattleLog(path)
+    with pytest.raises(OSError):
+        log.record(_battle(a, b, a))  # The directory does not exist yet
+    assert len(log) == 0
+    
+    directory.mkdir()
+    log.record(_battle(c, d, d))
+    log.record(_battle(a, c, a, days=1))
+    reloaded = BattleLog(path)
+    reloaded.load()
+    assert _summary(reloaded) == _summary(log) == [("C", "D", "D"), ("A", "C", "A")]
+
+
+def test_rejects_a_combo_battling_itself(tmp_path):
+    a = _combo("A")
+    with pytest.raises(ValueError):
+        BattleLog(str(tmp_path / "battles.jsonl")).record(_battle(a, a, a))
+
+
+def test_win_rates_over_date_ranges(tmp_path):
+    a, b = _combo("A"), _combo("B")
+    log = BattleLog(str(tmp_path / "battles.jsonl"))
+    for day, winner in enumerate([a, a, b, a, b]):
+        log.record(_battle(a, b, winner, days=day))
+    log.record(_battle(a, b, b, days=-1))  # Back-dated
+    
+    assert (log.combo_win_rate("A").wins, log.combo_win_rate("A").battles) == (3, 6)
+    window = log.combo_win_rate("A", START, START + timedelta(days=2))
+    assert (window.wins, window.battles) == (2, 3)
+    earliest = log.combo_win_rate("B", end=START)
+    assert (earliest.wins, earliest.battles) == (1, 2)
+    assert log.part_win_rate("3-60", PartType.RATCHET).battles == 12  # Both sides of every battle
+    assert log.combo_win_rate("Unknown").rate is None
+    assert [record.timestamp for record in log.records_for_combo("B")][0] == START - timedelta(days=1)
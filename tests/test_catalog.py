@@ -0,0 +1,56 @@
+"""Catalog reloads: keyed diffs and the cached image."""
+
+import hashlib
+import json
+
+from data import database
+from data.catalog import Catalog, compile_catalog, diff_catalogs, load_catalog
+from models import PartType
+
+
+def _source(blades: list, version: int = 1) -> bytes:
+    return json.dumps({
+        'version': version,
+        'blades': [dict({'part_type': 'Blade', 'series': 'BX-01', 'rarity': 'Common'}, **blade) for blade in blades],
+        'ratchets': [{'name': '3-60', 'part_type': 'Ratchet', 'series': 'BX-01', 'rarity': 'Common'}],
+        'bits': [{'name': 'Flat', 'part_type': 'Bit', 'series': 'BX-01', 'rarity': 'Common'}]
+    }).encode('utf-8')
+
+
+def _catalog(source: bytes) -> Catalog:
+    return Catalog(compile_catalog(source), hashlib.sha256(source).digest())
+
+
+def test_diff_reports_added_removed_and_changed_parts():
+    old = _catalog(_source([{'name': 'Dran Sword'}, {'name': 'Hells Scythe'}, {'name': 'Wizard Arrow'}]))
+    new = _catalog(_source([{'name': 'Dran Sword'}, {'name': 'Wizard Arrow', 'rarity': 'Rare'},
+                            {'name': 'Phoenix Wing'}], version=2))
+    kept = old.find('Dran Sword', PartType.BLADE)
+    diff = diff_catalogs(old, new)
+    
+    assert [part.name for part in diff.added] == ['Phoenix Wing']
+    assert [part.name for part in diff.removed] == ['Hells Scythe']
+    assert [(a.rarity.value, b.rarity.value) for a, b in diff.changed] == [('Common', 'Rare')]
+    assert new.find('Dran Sword', PartType.BLADE) is kept  # Decoded parts carry over
+    assert diff_catalogs(new, new).empty
+
+
+def test_reload_patches_parts_and_search(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+    path = tmp_path / "catalog.json"
+    path.write_bytes(_source([{'name': 'Dran Sword'}, {'name': 'Hells Scythe'}]))
+    monkeypatch.setattr(database, '_catalog', load_catalog(str(path)))
+    monkeypatch.setattr(database, '_search_index', None)
+    index = database.get_search_index()
+    
+    path.write_bytes(_source([{'name': 'Dran Sword'}, {'name': 'Dran Dagger'}], version=2))
+    diff = database.reload_catalog()
+    
+    assert [part.name for part in diff.added] == ['Dran Dagger']
+    assert [part.name for part in diff.removed] == ['Hells Scythe']
+    assert database.get_catalog().version == 2
+    blades = [part.name for part in database.get_all_parts() if part.part_type == PartType.BLADE]
+    assert blades == ['Dran Sword', 'Dran Dagger']
+    assert database.get_search_index().search('dran') == {('Dran Sword', PartType.BLADE),
+                                                          ('Dran Dagger', PartType.BLADE)}
+    assert index.search('scythe') == {('Hells Scythe', PartType.BLADE)}  # Searches in flight keep the old index
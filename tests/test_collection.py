@@ -0,0 +1,87 @@
+"""Collection versions and snapshot isolation."""
+
+import threading
+
+from models import BeybladeCombo, BeybladePart, Collection, PartType, Rarity
+from models.collection import COMPACT_MIN_CHANGES
+
+
+def _part(name: str, part_type: PartType = PartType.BLADE, quantity: int = 1) -> BeybladePart:
+    return BeybladePart(name, part_type, 'BX-01', Rarity.COMMON, owned_quantity=quantity)
+
+
+def _combo(name: str) -> BeybladeCombo:
+    return BeybladeCombo(name, _part('Dran Sword'), _part('3-60', PartType.RATCHET), _part('Flat', PartType.BIT))
+
+
+def _contents(snapshot) -> list:
+    return [(part.name, part.owned_quantity) for part in snapshot.parts], [combo.name for combo in snapshot.combos]
+
+
+def test_every_change_bumps_the_version():
+    collection = Collection()
+    versions = [collection.version]
+    collection.add_part(_part('Dran Sword'))
+    versions.append(collection.version)
+    collection.remove_part('Dran Sword', PartType.BLADE)
+    versions.append(collection.version)
+    collection.add_combo(_combo("Dran"))
+    versions.append(collection.version)
+    collection.parts = [_part('Wizard Arrow')]
+    versions.append(collection.version)
+    collection.combos = []
+    versions.append(collection.version)
+    assert versions == sorted(set(versions))
+    assert collection.snapshot().version == collection.version
+
+
+def test_snapshot_is_unaffected_by_later_changes():
+    collection = Collection()
+    collection.add_part(_part('Dran Sword', quantity=2))
+    collection.add_combo(_combo("Dran"))
+    snapshot = collection.snapshot()
+    
+    collection.add_part(_part('Dran Sword'))
+    collection.add_part(_part('Wizard Arrow'))
+    collection.remove_combo("Dran")
+    collection.parts = collection.parts + [_part('Hells Scythe')]
+    
+    assert _contents(snapshot) == ([('Dran Sword', 2)], ["Dran"])
+    assert _contents(collection.snapshot()) == ([('Dran Sword', 3), ('Wizard Arrow', 1), ('Hells Scythe', 1)], [])
+
+
+def test_snapshot_survives_log_compaction():
+    collection = Collection()
+    collection.add_part(_part('Dran Sword'))
+    snapshot = collection.snapshot()
+    for _ in range(COMPACT_MIN_CHANGES + 5):
+        collection.add_part(_part('Dran Sword'))
+    collection.remove_part('Dran Sword', PartType.BLADE, COMPACT_MIN_CHANGES + 6)
+    
+    assert _contents(snapshot) == ([('Dran Sword', 1)], [])
+    assert _contents(collection.snapshot()) == ([], [])
+
+
+def test_snapshots_taken_during_writes_are_consistent():
+    collection = Collection()
+    start = collection.version
+    count = 2000
+    
+    def write():
+        for i in range(count):
+            collection.add_part(_part(f"Part {i}"))
+    
+    writer = threading.Thread(target=write)
+    writer.start()
+    snapshots = {}
+    while writer.is_alive():
+        snapshot = collection.snapshot()
+        snapshots.setdefault(snapshot.version, snapshot)
+    writer.join()
+    final = collection.snapshot()
+    snapshots[final.version] = final
+    
+    # Each change adds one part, so a snapshot's parts follow from its version
+    for version, snapshot in snapshots.items():
+        assert [part.name for part in snapshot.parts] == [f"Part {i}" for i in range(version - start)]
+    assert final.version - start == count
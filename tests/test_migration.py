@@ -0,0 +1,57 @@
+"""Migrating collections to current catalog names."""
+
+import hashlib
+import json
+
+from data.catalog import Catalog, compile_catalog
+from data.migration import migrate_collection
+from models import BeybladeCombo, BeybladePart, Collection, PartType, Rarity
+
+
+def _catalog() -> Catalog:
+    source = json.dumps({
+        'version': 2,
+        'aliases': {'Blade': {'Hells Scythe': "Hell's Scythe"}},
+        'blades': [{'name': "Hell's Scythe", 'part_type': 'Blade', 'series': 'BX-02', 'rarity': 'Common'}],
+        'ratchets': [{'name': '4-60', 'part_type': 'Ratchet', 'series': 'BX-02', 'rarity': 'Common'}],
+        'bits': [{'name': 'Taper', 'part_type': 'Bit', 'series': 'BX-02', 'rarity': 'Common'}]
+    }).encode('utf-8')
+    return Catalog(compile_catalog(source), hashlib.sha256(source).digest())
+
+
+def _part(name: str, part_type: PartType, quantity: int = 1) -> BeybladePart:
+    return BeybladePart(name, part_type, 'BX-02', Rarity.COMMON, owned_quantity=quantity)
+
+
+def test_renames_and_merges_aliased_parts():
+    collection = Collection()
+    collection.parts = [_part('Hells Scythe', PartType.BLADE, 2), _part("Hell's Scythe", PartType.BLADE, 1)]
+    report = migrate_collection(collection, _catalog())
+    assert (report.renamed, report.merged) == (1, 1)
+    assert [(part.name, part.owned_quantity) for part in collection.parts] == [("Hell's Scythe", 3)]
+    assert collection.catalog_version == 2
+
+
+def test_migration_publishes_a_new_version():
+    collection = Collection()
+    old_blade = _part('Hells Scythe', PartType.BLADE)
+    collection.parts = [old_blade]
+    collection.combos = [BeybladeCombo("Scythe", old_blade, _part('4-60', PartType.RATCHET),
+                                       _part('Taper', PartType.BIT))]
+    before = collection.snapshot()
+    
+    migrate_collection(collection, _catalog())
+    after = collection.snapshot()
+    assert after.version == collection.version
+    assert after.version > before.version
+    assert [part.name for part in after.parts] == ["Hell's Scythe"]
+    assert after.combos[0].blade.name == "Hell's Scythe"
+    assert [part.name for part in before.parts] == ['Hells Scythe']
+
+
+def test_unchanged_collection_keeps_its_version():
+    collection = Collection()
+    collection.parts = [_part("Hell's Scythe", PartType.BLADE)]
+    version = collection.version
+    assert not migrate_collection(collection, _catalog()).changed
+    assert collection.version == version
@@ -0,0 +1,105 @@
+"""Saving collections shared between instances: conflicts, merges and the save lock."""
+
+import json
+import threading
+
+import pytest
+
+from data.persistence import CollectionConflictError, file_version, load_collection, save_collection
+from models import BeybladeCombo, BeybladePart, Collection, PartType, Rarity
+
+
+def _part(name: str, part_type: PartType = PartType.BLADE, quantity: int = 1) -> BeybladePart:
+    return BeybladePart(name, part_type, 'BX-01', Rarity.COMMON, owned_quantity=quantity)
+
+
+def _combo(name: str) -> BeybladeCombo:
+    return BeybladeCombo(name, _part('Dran Sword'), _part('3-60', PartType.RATCHET), _part('Flat', PartType.BIT))
+
+
+def _quantities(collection) -> dict:
+    return {part.name: part.owned_quantity for part in collection.parts}
+
+
+@pytest.fixture
+def collection_file(tmp_path):
+    path = str(tmp_path / "collection.json")
+    collection = Collection()
+    collection.add_parts([_part('Dran Sword', quantity=2), _part('Wizard Arrow'), _part('Hells Scythe')])
+    collection.add_combo(_combo("Dran"))
+    save_collection(collection, path)
+    return path
+
+
+def test_saves_count_versions(collection_file):
+    collection = load_collection(collection_file)
+    assert collection.saved.version == file_version(collection_file) == 1
+    collection.add_part(_part('Dran Sword'))
+    save_collection(collection, collection_file)
+    assert collection.saved.version == file_version(collection_file) == 2
+    with open(collection_file) as f:
+        assert json.load(f)['version'] == 2
+
+
+def test_save_over_another_instance_conflicts(collection_file):
+    first, second = load_collection(collection_file), load_collection(collection_file)
+    first.add_part(_part('Dran Sword'))
+    save_collection(first, collection_file)
+    
+    second.add_part(_part('Wizard Arrow'))
+    with pytest.raises(CollectionConflictError) as error:
+        save_collection(second, collection_file)
+    assert (error.value.expected, error.value.found) == (1, 2)
+    assert _quantities(load_collection(collection_file))['Wizard Arrow'] == 1
+
+
+def test_merge_keeps_both_instances_changes(collection_file):
+    first, second = load_collection(collection_file), load_collection(collection_file)
+    first.add_part(_part('Dran Sword'))
+    first.remove_part('Hells Scythe', PartType.BLADE)
+    first.add_combo(_combo("First"))
+    save_collection(first, collection_file)
+    
+    second.add_part(_part('Dran Sword'))
+    second.add_part(_part('Phoenix Wing'))
+    second.remove_combo("Dran")
+    second.add_combo(_combo("Second"))
+    save_collection(second, collection_file, merge=True)
+    
+    merged = load_collection(collection_file)
+    assert _quantities(merged) == {'Dran Sword': 4, 'Wizard Arrow': 1, 'Phoenix Wing': 1}
+    assert sorted(combo.name for combo in merged.combos) == ["First", "Second"]
+    assert merged.saved.version == second.saved.version == 3
+    assert _quantities(second) == _quantities(merged)
+
+
+def test_snapshot_saves_but_cannot_merge(collection_file):
+    collection = load_collection(collection_file)
+    collection.add_part(_part('Wizard Arrow'))
+    snapshot = collection.snapshot()
+    collection.add_part(_part('Wizard Arrow'))
+    save_collection(snapshot, collection_file)
+    assert _quantities(load_collection(collection_file))['Wizard Arrow'] == 2
+    with pytest.raises(TypeError):
+        save_collection(collection.snapshot(), collection_file, merge=True)
+
+
+def test_concurrent_merged_saves_lose_nothing(collection_file):
+    count = 8
+    collections = [load_collection(collection_file) for _ in range(count)]
+    for i, collection in enumerate(collections):
+        collection.add_part(_part(f"Part {i}"))
+        collection.add_part(_part('Dran Sword'))
+    
+    threads = [threading.Thread(target=save_collection, args=(collection, collection_file), kwargs={'merge': True})
+               for collection in collections]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    saved = load_collection(collection_file)
+    assert saved.saved.version == count + 1
+    quantities = _quantities(saved)
+    assert quantities['Dran Sword'] == 2 + count
+    assert all(quantities[f"Part {i}"] == 1 for i in range(count))
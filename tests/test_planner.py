@@ -0,0 +1,55 @@
+"""Purchase planning: the exact search finds the cheapest cover."""
+
+import itertools
+import random
+
+from models import PartType, Product
+from services.planner_service import PurchasePlanner
+
+
+def _key(name: str):
+    return (name, PartType.BLADE)
+
+
+def _cheapest_cover(products, wanted):
+    best = None
+    for size in range(len(products) + 1):
+        for chosen in itertools.combinations(products, size):
+            covered = {key for product in chosen for key in product.contents}
+            if set(wanted) <= covered:
+                cost = round(sum(product.price for product in chosen), 2)
+                best = cost if best is None else min(best, cost)
+    return best
+
+
+def test_exact_plan_beats_greedy():
+    products = [
+        Product('BX-A', "Pair", 2.0, [_key('A'), _key('B')]),
+        Product('BX-C', "Other pair", 2.5, [_key('C'), _key('D')]),
+        Product('BX-S', "Set", 4.2, [_key('A'), _key('B'), _key('C'), _key('D')])
+    ]
+    planner = PurchasePlanner(products)
+    wanted = [_key(name) for name in "ABCD"]
+    
+    greedy = planner.plan_for(wanted, exact_limit=0)
+    assert (greedy.total_cost, greedy.exact) == (4.5, False)
+    
+    plan = planner.plan_for(wanted)
+    assert ([product.sku for product in plan.products], plan.total_cost, plan.exact) == (['BX-S'], 4.2, True)
+
+
+def test_exact_plan_is_optimal_on_random_catalogs():
+    rng = random.Random(0)
+    names = [_key(f"Part {i}") for i in range(12)]
+    for trial in range(20):
+        products = [Product(f"BX-{trial}-{i}", f"Product {i}", round(rng.uniform(5, 40), 2),
+                            rng.sample(names, rng.randint(1, 5)))
+                    for i in range(9)]
+        planner = PurchasePlanner(products)
+        wanted = rng.sample(names, 6)
+        plan = planner.plan_for(wanted)
+        
+        buyable = [key for key in wanted if any(key in product.contents for product in products)]
+        assert sorted(plan.covered) == sorted(buyable)
+        assert sorted(plan.unavailable) == sorted(set(wanted) - set(buyable))
+        assert plan.total_cost == _cheapest_cover(products, buyable)
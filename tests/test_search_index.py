@@ -0,0 +1,23 @@
+"""Patching the part search index for a reloaded catalog."""
+
+from data.search_index import SearchIndex
+from models import BeybladePart, PartType, Rarity
+
+
+def _part(name: str, description: str = "") -> BeybladePart:
+    return BeybladePart(name, PartType.BLADE, 'BX-01', Rarity.COMMON, description=description)
+
+
+def test_patched_index_leaves_the_original_untouched():
+    index = SearchIndex([_part('Dran Sword', "Attack blade"), _part('Hells Scythe', "Balance blade")])
+    patched = index.patched([('Hells Scythe', PartType.BLADE)], [_part('Dran Dagger'), _part('Dran Sword', "Stamina")])
+    
+    assert index.search('dran') == {('Dran Sword', PartType.BLADE)}
+    assert index.search('scythe') == {('Hells Scythe', PartType.BLADE)}
+    assert index.search('attack') == {('Dran Sword', PartType.BLADE)}
+    
+    assert patched.search('dran') == {('Dran Sword', PartType.BLADE), ('Dran Dagger', PartType.BLADE)}
+    assert patched.search('scythe') == set()
+    assert patched.search('attack') == set()
+    assert patched.search('stamina') == {('Dran Sword', PartType.BLADE)}
+    assert len(index) == 2 and len(patched) == 2
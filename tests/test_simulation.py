@@ -0,0 +1,55 @@
+"""Vectorized matchup simulation against the model's exact probabilities."""
+
+import numpy as np
+
+from data.database import get_catalog
+from models import BeybladeCombo
+from services.simulation_service import BattleSimulator, build_feature_table, outcome_probabilities
+
+
+def _combos(count: int):
+    catalog = get_catalog()
+    blades, ratchets, bits = catalog['blades'], catalog['ratchets'], catalog['bits']
+    return [BeybladeCombo(f"Combo {i}", blades[i % len(blades)], ratchets[(3 * i) % len(ratchets)],
+                          bits[(7 * i) % len(bits)])
+            for i in range(count)]
+
+
+def test_seeded_matrix_is_reproducible():
+    combos = _combos(12)
+    first = BattleSimulator(trials=500, seed=7).matchup_matrix(combos)
+    second = BattleSimulator(trials=500, seed=7).matchup_matrix(combos)
+    assert np.array_equal(first.wins, second.wins)
+    assert np.array_equal(first.finishes, second.finishes)
+
+
+def test_matrix_counts_add_up():
+    matrix = BattleSimulator(trials=300, seed=1).matchup_matrix(_combos(10))
+    off_diagonal = ~np.eye(10, dtype=bool)
+    assert np.all((matrix.wins + matrix.wins.T)[off_diagonal] == 300)
+    assert np.array_equal(matrix.finishes.sum(axis=-1), matrix.wins)
+    assert np.all(np.diag(matrix.wins) == 0)
+
+
+def test_matrix_agrees_with_single_pair_probabilities():
+    combos = _combos(8)
+    trials = 20000
+    matrix = BattleSimulator(trials=trials, seed=3).matchup_matrix(combos)
+    table = build_feature_table(combos)
+    for i in range(len(combos)):
+        for j in range(i + 1, len(combos)):
+            first = {name: column[i] for name, column in table.items()}
+            second = {name: column[j] for name, column in table.items()}
+            p_win, first_finishes, _ = outcome_probabilities(first, second)
+            assert abs(matrix.wins[i, j] / trials - float(p_win)) < 0.02
+            if matrix.wins[i, j] > 2000:
+                rates = matrix.finishes[i, j] / matrix.wins[i, j]
+                assert np.allclose(rates, first_finishes, atol=0.04)
+
+
+def test_single_matchup_matches_its_matrix():
+    a, b = _combos(2)
+    result = BattleSimulator(trials=1000, seed=11).simulate(a, b)
+    matrix = BattleSimulator(trials=1000, seed=11).matchup_matrix([a, b])
+    assert result == matrix.result(0, 1)
+    assert result.win_rate + result.loss_rate == 1.0
@@ -0,0 +1,51 @@
+"""Tournament sharding, worker processes and Swiss byes."""
+
+import random
+
+from services.tournament_service import Deck, TournamentSimulator
+from tests.test_simulation import _combos
+
+
+def _decks(count: int):
+    return [Deck(f"Deck {i}", [combo]) for i, combo in enumerate(_combos(count))]
+
+
+def _summary(result):
+    return [(s.deck, s.wins, s.losses, s.draws, s.points_for, s.points_against) for s in result.standings]
+
+
+def test_round_robin_plays_every_pair_once_across_shards():
+    n = 13
+    result = TournamentSimulator(_decks(n), processes=0, shard_size=7, seed=5).run_round_robin()
+    assert result.matches_played == n * (n - 1) // 2
+    assert all(standing.matches == n - 1 for standing in result.standings)
+    assert sum(s.wins for s in result.standings) == sum(s.losses for s in result.standings)
+
+
+def test_worker_processes_give_the_inline_results():
+    decks = _decks(12)
+    inline = TournamentSimulator(decks, processes=0, shard_size=10, seed=9)
+    pooled = TournamentSimulator(decks, processes=2, shard_size=10, seed=9)
+    assert _summary(inline.run_round_robin()) == _summary(pooled.run_round_robin())
+    assert _summary(inline.run_swiss(rounds=3)) == _summary(pooled.run_swiss(rounds=3))
+
+
+def test_swiss_gives_each_deck_at_most_one_bye():
+    n = 7
+    simulator = TournamentSimulator(_decks(n), processes=0, seed=2)
+    simulator._reset()
+    played, byes, rng = set(), set(), random.Random(2)
+    given = []
+    for _ in range(n):
+        first, second, bye = simulator._swiss_pairings(played, byes, rng)
+        assert sorted(first + second + [bye]) == list(range(n))
+        given.append(bye)
+    assert sorted(given) == list(range(n))
+
+
+def test_swiss_counts_byes_as_wins():
+    n = 7
+    result = TournamentSimulator(_decks(n), processes=0, seed=4).run_swiss(rounds=3)
+    assert (result.rounds, result.matches_played) == (3, 3 * (n // 2))
+    assert all(standing.matches == 3 for standing in result.standings)
+    assert sum(s.wins for s in result.standings) == sum(s.losses for s in result.standings) + 3
@@ -0,0 +1,106 @@
+"""Diagnostics panel showing live metrics."""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from ui.theme import BeybladeXTheme
+from diagnostics import metrics
+
+
+class DiagnosticsPanel:
+    """Window listing every recorded metric, refreshed while open."""
+    
+    REFRESH_INTERVAL_MS = 1000
+    
+    def __init__(self, parent):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Diagnostics")
+        self.dialog.geometry("760x480")
+        self.dialog.configure(bg=BeybladeXTheme.COLORS['background'])
+        self.dialog.transient(parent)
+        
+        self.setup_dialog()
+        self.refresh()
+    
+    def setup_dialog(self):
+        """Setup the metrics table and buttons."""
+        main_frame = BeybladeXTheme.create_frame(self.dialog, 'background')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        BeybladeXTheme.create_label(
+            main_frame,
+            "📊 Diagnostics",
+            'heading_medium'
+        ).pack(pady=(0, 15))
+        
+        columns = ('Count', 'Mean ms', 'p95 ms', 'p99 ms', 'Max ms')
+        self.metrics_tree = ttk.Treeview(main_frame, columns=columns, show='tree headings', height=15)
+        self.metrics_tree.heading('#0', text='Metric')
+        self.metrics_tree.column('#0', width=260)
+        for column in columns:
+            self.metrics_tree.heading(column, text=column)
+            self.metrics_tree.column(column, width=80, anchor='e')
+        self.metrics_tree.pack(fill='both', expand=True, pady=(0, 10))
+        
+        button_frame = BeybladeXTheme.create_frame(main_frame, 'background')
+        button_frame.pack(fill='x')
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "Close",
+            'secondary',
+            command=self.dialog.destroy
+        ).pack(side='right', padx=(10, 0))
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "💾 Dump JSON",
+            'primary',
+            command=self.dump
+        ).pack(side='right')
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "Reset",
+            'secondary',
+            command=metrics.reset
+        ).pack(side='left')
+    
+    @staticmethod
+    def get_metric_values(snapshot):
+        """Row values for a counter or a histogram of seconds."""
+        if snapshot['type'] == 'counter':
+            return (snapshot['value'], '', '', '', '')
+        
+        def ms(seconds):
+            return '' if seconds is None else f"{seconds * 1e3:.2f}"
+        return (snapshot['count'], ms(snapshot['mean']), ms(snapshot['p95']), ms(snapshot['p99']), ms(snapshot['max']))
+    
+    def refresh(self):
+        """Update rows in place and reschedule while the window is open."""
+        if not self.dialog.winfo_exists():
+            return
+        snapshot = metrics.snapshot()
+        for name in set(self.metrics_tree.get_children()) - set(snapshot):
+            self.metrics_tree.delete(name)
+        for index, (name, values) in enumerate(snapshot.items()):
+            row = self.get_metric_values(values)
+            if self.metrics_tree.exists(name):
+                self.metrics_tree.item(name, values=row)
+            else:
+                self.metrics_tree.insert('', index, iid=name, text=name, values=row)
+        self.dialog.after(self.REFRESH_INTERVAL_MS, self.refresh)
+    
+    def dump(self):
+        """Write the current metrics to a JSON file."""
+        path = filedialog.asksaveasfilename(
+            parent=self.dialog,
+            defaultextension=".json",
+            initialfile="metrics.json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            metrics.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to write metrics: {e}", parent=self.dialog)
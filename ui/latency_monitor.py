@@ -0,0 +1,219 @@
+"""Watchdog for the Tk main loop: scheduling lag and slow handlers.
+
+Every Python callback Tk runs (button commands, bindings, variable traces,
+``after`` jobs) goes through ``tkinter.CallWrapper``. Installing the
+monitor swaps in a subclass that times each call; calls over the
+threshold are logged with their name. While a call runs, a sampler
+thread checks in once per threshold and grabs the main thread's stack
+from any call that overran, so the log shows where it was stuck rather
+than where it finished. A periodic ``after`` heartbeat measures how late
+the loop gets round to scheduled work.
+
+Install before the UI is built, since Tk binds the wrapper when a
+callback is registered::
+
+    monitor = LatencyMonitor(threshold_ms=150)
+    monitor.install()
+    app = ModernMainWindow()
+    monitor.start(app.root)
+"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+import tkinter as tk
+from collections import deque
+from typing import Dict, List, Optional
+
+
+DEFAULT_THRESHOLD_MS = 200
+DEFAULT_HEARTBEAT_MS = 100
+
+logger = logging.getLogger(__name__)
+
+
+def _unwrap(func):
+    """The scheduled function behind the closure ``Misc.after`` registers."""
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and 'func' in code.co_freevars:
+        return func.__closure__[code.co_freevars.index('func')].cell_contents
+    return func
+
+
+def handler_name(func) -> str:
+    """Readable name of a Tk callback, e.g. ``ui.modern_tabs.parts_tab.PartsTab.on_search_change``."""
+    func = getattr(func, '__func__', func)
+    module = getattr(func, '__module__', None) or ""
+    name = getattr(func, '__qualname__', None) or repr(func)
+    return f"{module}.{name}" if module else name
+
+
+class HandlerStats:
+    """Call count and durations of one handler."""
+    __slots__ = ('calls', 'total', 'worst')
+    
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+    
+    def to_dict(self) -> dict:
+        return {'calls': self.calls, 'total_ms': self.total * 1e3, 'max_ms': self.worst * 1e3}
+
+
+_plain_call = tk.CallWrapper.__call__
+
+
+class _TimedCallWrapper(tk.CallWrapper):
+    monitor: Optional['LatencyMonitor'] = None
+    
+    def __call__(self, *args):
+        monitor = self.monitor
+        if monitor is None:
+            return _plain_call(self, *args)
+        return monitor.timed_call(self, args)
+
+
+class LatencyMonitor:
+    """Measures Tk event-loop lag and logs handlers slower than a threshold."""
+    
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, heartbeat_ms: int = DEFAULT_HEARTBEAT_MS):
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.lags = deque(maxlen=1000)  # Recent heartbeat lags in seconds
+        self.slow_calls = deque(maxlen=100)  # Recent (name, seconds, stack) of slow handlers
+        
+        self._original_wrapper = None
+        self._root = None
+        self._heartbeat_job = None
+        self._expected = 0.0
+        
+        # Outermost running handler as (func, start, call id), read by the sampler
+        self._active = None
+        self._depth = 0
+        self._calls = 0
+        self._samples: Dict[int, List[str]] = {}
+        self._main_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = None
+    
+    def install(self) -> None:
+        """Start timing Tk callbacks registered from now on."""
+        if self._original_wrapper is not None:
+            return
+        self._original_wrapper = tk.CallWrapper
+        _TimedCallWrapper.monitor = self
+        tk.CallWrapper = _TimedCallWrapper
+        self._main_thread = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="tk-latency-sampler", daemon=True)
+        self._sampler.start()
+    
+    def uninstall(self) -> None:
+        """Stop timing; callbacks already registered fall back to plain calls."""
+        if self._original_wrapper is None:
+            return
+        self.stop()
+        tk.CallWrapper = self._original_wrapper
+        _TimedCallWrapper.monitor = None
+        self._original_wrapper = None
+        self._stop.set()
+    
+    def start(self, root) -> None:
+        """Start the heartbeat on a root window."""
+        self._root = root
+        self._expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self._heartbeat_job = root.after(self.heartbeat_ms, self._heartbeat)
+    
+    def stop(self) -> None:
+        if self._root is not None and self._heartbeat_job is not None:
+            try:
+                self._root.after_cancel(self._heartbeat_job)
+            except tk.TclError:
+                pass  # Root already destroyed
+        self._heartbeat_job = None
+    
+    def _heartbeat(self) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, now - self._expected)
+        self.lags.append(lag)
+        if lag > self.threshold:
+            logger.warning("Tk event loop stalled: heartbeat %.0f ms late", lag * 1e3,
+                           extra={'duration_ms': lag * 1e3})
+        self._expected = now + self.heartbeat_ms / 1000
+        self._heartbeat_job = self._root.after(self.heartbeat_ms, self._heartbeat)
+    
+    def timed_call(self, wrapper: tk.CallWrapper, args):
+        """Run a wrapped Tk callback, recording how long it took."""
+        outermost = self._depth == 0
+        self._depth += 1
+        start = time.perf_counter()
+        if outermost:
+            self._calls += 1
+            call_id = self._calls
+            self._active = (wrapper.func, start, call_id)
+        try:
+            return _plain_call(wrapper, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            if outermost:
+                self._active = None
+            self._record(wrapper.func, elapsed, self._samples.pop(call_id, None) if outermost else None)
+    
+    def _record(self, func, elapsed: float, stack: Optional[List[str]]) -> None:
+        func = _unwrap(func)
+        if func == self._heartbeat:
+            return
+        name = handler_name(func)
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = HandlerStats()
+        stats.calls += 1
+        stats.total += elapsed
+        if elapsed > stats.worst:
+            stats.worst = elapsed
+        
+        if elapsed > self.threshold:
+            self.slow_calls.append((name, elapsed, stack))
+            if stack:
+                logger.warning("Slow Tk handler %s took %.0f ms; stack while running:\n%s",
+                               name, elapsed * 1e3, "".join(stack),
+                               extra={'handler': name, 'duration_ms': elapsed * 1e3})
+            else:
+                logger.warning("Slow Tk handler %s took %.0f ms", name, elapsed * 1e3,
+                               extra={'handler': name, 'duration_ms': elapsed * 1e3})
+    
+    def _sample_loop(self) -> None:
+        """Grab the main thread's stack once from each handler that overruns."""
+        while not self._stop.wait(self.threshold / 2):
+            active = self._active
+            if active is None:
+                continue
+            _, start, call_id = active
+            if call_id in self._samples or time.perf_counter() - start < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_thread)
+            if frame is not None and self._active is active:
+                self._samples[call_id] = traceback.format_stack(frame)
+    
+    def stats(self) -> dict:
+        """Heartbeat lag percentiles and per-handler timings, slowest first."""
+        lags = sorted(self.lags)
+        
+        def lag_ms(pct: float) -> float:
+            return lags[min(len(lags) - 1, int(len(lags) * pct))] * 1e3 if lags else 0.0
+        
+        handlers = sorted(self.handlers.items(), key=lambda item: item[1].worst, reverse=True)
+        return {
+            'heartbeat_ms': self.heartbeat_ms,
+            'threshold_ms': self.threshold * 1e3,
+            'lag_p50_ms': lag_ms(0.50),
+            'lag_p99_ms': lag_ms(0.99),
+            'lag_max_ms': lags[-1] * 1e3 if lags else 0.0,
+            'slow_calls': len(self.slow_calls),
+            'handlers': {name: stats.to_dict() for name, stats in handlers}
+        }
@@ -3,21 +3,42 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
+import time
+from typing import Optional
+from models import Collection, PartNotLoadedError
 from services.part_service import PartService
 from services.stats_service import StatsService
 from ui.theme import BeybladeXTheme
-from ui.modern_tabs.dashboard_tab import DashboardTab
-from ui.modern_tabs.parts_tab import PartsTab
-from ui.modern_tabs.parts_manager_tab import PartsManagerTab
-from ui.modern_tabs.combos_tab import CombosTab
-from data.persistence import save_collection, load_collection
+from data.persistence import save_collection, iter_collection_file, CollectionConflictError
+from data.battle_log import BattleLog
+from data.database import CatalogWatcher, get_catalog
+from data.migration import migrate_collection
+from services.rating_service import RatingService
+from diagnostics import metrics
+from diagnostics.profiler import ProfileCapture
+from diagnostics.startup import startup_timer
+from ui.task_executor import get_executor
+
+
+# How often to check the catalog file for edits
+CATALOG_POLL_MS = 2000
+
+# Shift+F12 profiles this long; F12 profiles the next click or key press
+PROFILE_SECONDS = 10
 
 
 class ModernMainWindow:
     """Modern, redesigned main window with Beyblade X theming."""
     
-    def __init__(self):
-        """Initialize the modern main window."""
+    def __init__(self, collection: Optional[Collection] = None, collection_path: str = "collection.json",
+                 profile_capture: Optional[ProfileCapture] = None):
+        """Initialize the modern main window.
+        
+        A collection can be passed in instead of loading ``collection_path``,
+        e.g. to drive the window with synthetic data. Otherwise the file is
+        loaded on a worker thread while the window is already usable. A running
+        ``profile_capture`` (say, of startup) is stopped by ``stop_profile``.
+        """
         try:
             logging.info("Starting Modern Beyblade X Manager...")
             self.root = tk.Tk()
@@ -30,19 +51,45 @@ class ModernMainWindow:
             
             # Initialize services
             logging.info("Initializing services...")
-            self.collection = load_collection()
+            self.collection_path = collection_path
+            self.collection = collection if collection is not None else Collection()
+            if collection is not None:
+                self.migrate_collection()
+            self.battle_log = BattleLog()
+            self.battle_log.load()
+            self.rating_service = RatingService.load(self.battle_log)
             self.part_service = PartService()
             self.stats_service = StatsService()
+            self.catalog_watcher = CatalogWatcher()
+            self.executor = get_executor(self.root)
+            self.save_task = None
+            startup_timer.mark("services")
             
             # Configure theme
             BeybladeXTheme.configure_ttk_style()
             
             logging.info("Setting up modern UI...")
             self.setup_ui()
+            startup_timer.mark("window shell")
             logging.info("UI setup complete!")
             
+            self.root.report_callback_exception = self.report_callback_exception
+            if collection is None:
+                self.start_collection_load()
+            
+            self.catalog_watcher.add_listener(self.on_catalog_changed)
+            self.root.after(CATALOG_POLL_MS, self.poll_catalog)
+            
+            # Profiling hotkeys
+            self.profile_capture = profile_capture or ProfileCapture()
+            self.profile_job = None
+            self.root.bind_all('<F12>', lambda event: self.profile_next_action())
+            self.root.bind_all('<Shift-F12>', lambda event: self.profile_for(PROFILE_SECONDS))
+            
+            self.root.after_idle(self.finish_startup)
+        
         except Exception as e:
-            logging.error(f"Error in __init__: {e}")
+            logging.error("Error in __init__: %s", e)
             messagebox.showerror("Initialization Error", f"Failed to start application: {e}")
             raise
     
@@ -100,6 +147,12 @@ class ModernMainWindow:
             actions_frame, "🔄 Refresh", 'secondary',
             command=self.refresh_all
         ).pack(side='right', padx=5)
+        
+        if metrics.enabled:
+            BeybladeXTheme.create_button(
+                actions_frame, "📊 Diagnostics", 'secondary',
+                command=self.show_diagnostics
+            ).pack(side='right', padx=5)
     
     def create_main_content(self):
         """Create the main content area with modern tabs."""
@@ -115,44 +168,85 @@ class ModernMainWindow:
         self.create_modern_tabs()
     
     def create_modern_tabs(self):
-        """Create modernized tabs with better UX."""
-        # Dashboard - Overview and quick stats
-        self.dashboard_tab = DashboardTab(
-            self.notebook, 
-            self.collection, 
-            self.stats_service,
-            self.refresh_callback
-        )
-        
-        # All Parts - Comprehensive parts browser
-        self.all_parts_tab = PartsTab(
-            self.notebook,
-            self.collection,
-            self.refresh_callback
-        )
-        
-        # Parts Manager - Combined collection and database view
-        self.parts_manager_tab = PartsManagerTab(
-            self.notebook,
-            self.collection,
-            self.part_service,
-            self.refresh_callback
-        )
-        
-        # Combos - Streamlined combo management
-        self.combos_tab = CombosTab(
-            self.notebook,
-            self.collection,
-            self.refresh_callback
-        )
-        
-        # Store tabs for easy refresh
-        self.tabs = [
-            self.dashboard_tab,
-            self.all_parts_tab,
-            self.parts_manager_tab,
-            self.combos_tab
+        """Add a placeholder page per tab; each tab is built when first selected."""
+        self.tab_specs = [
+            # Overview and quick stats
+            ('dashboard_tab', "🏠 Dashboard", self.create_dashboard_tab),
+            # Comprehensive parts browser
+            ('all_parts_tab', "🎯 All Parts", self.create_parts_tab),
+            # Combined collection and database view
+            ('parts_manager_tab', "🎯 Parts Manager", self.create_parts_manager_tab),
+            # Streamlined combo management
+            ('combos_tab', "⚔️ Combos", self.create_combos_tab)
         ]
+        self.tab_placeholders = {}  # placeholder widget path -> tab attribute
+        for attribute, label, _ in self.tab_specs:
+            setattr(self, attribute, None)
+            placeholder = BeybladeXTheme.create_frame(self.notebook, 'background')
+            self.notebook.add(placeholder, text=label)
+            self.tab_placeholders[str(placeholder)] = attribute
+    
+    # Tab modules are imported on first use to keep them off the startup path
+    
+    def create_dashboard_tab(self):
+        from ui.modern_tabs.dashboard_tab import DashboardTab
+        return DashboardTab(self.notebook, self.collection, self.stats_service, self.refresh_callback)
+    
+    def create_parts_tab(self):
+        from ui.modern_tabs.parts_tab import PartsTab
+        return PartsTab(self.notebook, self.collection, self.refresh_callback)
+    
+    def create_parts_manager_tab(self):
+        from ui.modern_tabs.parts_manager_tab import PartsManagerTab
+        return PartsManagerTab(self.notebook, self.collection, self.part_service, self.refresh_callback)
+    
+    def create_combos_tab(self):
+        from ui.modern_tabs.combos_tab import CombosTab
+        return CombosTab(self.notebook, self.collection, self.refresh_callback, self.battle_log, self.rating_service)
+    
+    @property
+    def tabs(self):
+        """Tabs built so far, in notebook order."""
+        return [tab for tab in (getattr(self, attribute) for attribute, _, _ in self.tab_specs) if tab is not None]
+    
+    def on_tab_changed(self, event=None):
+        """Build the selected tab if it is still a placeholder."""
+        attribute = self.tab_placeholders.get(str(self.notebook.select()))
+        if attribute is not None:
+            self.get_tab(attribute)
+    
+    def get_tab(self, attribute):
+        """The tab stored under ``attribute``, building it in place of its placeholder if needed."""
+        tab = getattr(self, attribute)
+        if tab is not None:
+            return tab
+        factory = next(factory for name, _, factory in self.tab_specs if name == attribute)
+        placeholder = next(path for path, name in self.tab_placeholders.items() if name == attribute)
+        with metrics.timer(f"ui.build.{attribute}"):
+            tab = factory()
+        setattr(self, attribute, tab)
+        
+        # The tab added itself at the end; move it to the placeholder's slot
+        was_selected = str(self.notebook.select()) == placeholder
+        self.notebook.insert(placeholder, tab.frame)
+        if was_selected:
+            self.notebook.select(tab.frame)
+        del self.tab_placeholders[placeholder]
+        self.notebook.forget(placeholder)
+        self.notebook.nametowidget(placeholder).destroy()
+        return tab
+    
+    def finish_startup(self):
+        """Paint the window shell, then build the first tab, timing both."""
+        self.root.update_idletasks()
+        startup_timer.mark("first paint")
+        self.on_tab_changed()
+        # Bound only now, so the selection made by adding the first page
+        # does not build a tab before the shell is painted
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.root.update_idletasks()
+        startup_timer.mark("first tab")
+        startup_timer.finish()
     
     def create_status_bar(self):
         """Create status bar with collection info."""
@@ -169,15 +263,91 @@ class ModernMainWindow:
         )
         self.status_label.pack(side='left', padx=10, pady=5)
         
-        # App info
-        app_info = BeybladeXTheme.create_label(
+        # Background tasks: "Ready", or the running task with a progress bar
+        self.activity_label = BeybladeXTheme.create_label(
             status_frame,
             "Ready",
             'body_small',
             bg=BeybladeXTheme.COLORS['surface_variant'],
             fg=BeybladeXTheme.COLORS['text_secondary']
         )
-        app_info.pack(side='right', padx=10, pady=5)
+        self.activity_label.pack(side='right', padx=10, pady=5)
+        self.activity_bar = ttk.Progressbar(status_frame, length=120)
+        self.executor.add_listener(self.show_activity)
+    
+    def show_activity(self, tasks):
+        """Show the oldest running background task in the status bar."""
+        if not tasks:
+            self.activity_bar.stop()
+            self.activity_bar.pack_forget()
+            self.activity_label.config(text="Ready")
+            return
+        task = tasks[0]
+        text = task.message or f"{task.name}..."
+        if len(tasks) > 1:
+            text += f" (+{len(tasks) - 1} more)"
+        self.activity_label.config(text=text)
+        if not self.activity_bar.winfo_ismapped():
+            self.activity_bar.pack(side='right', pady=5, before=self.activity_label)
+        if task.fraction is None:
+            if self.activity_bar.cget('mode') != 'indeterminate':
+                self.activity_bar.config(mode='indeterminate')
+                self.activity_bar.start()
+        else:
+            self.activity_bar.stop()
+            self.activity_bar.config(mode='determinate', maximum=1.0, value=task.fraction)
+    
+    def start_collection_load(self):
+        """Decode the collection file on a worker thread, applying it as it arrives."""
+        self.collection.loading = True
+        self.load_started = time.perf_counter()
+        
+        def load(task):
+            for event in iter_collection_file(self.collection_path):
+                task.deliver(event)
+        
+        # The executor applies batches between redraws, so the UI stays responsive meanwhile
+        self.executor.submit(load, name="Loading collection", on_partial=self.apply_load_event,
+                             on_error=self.on_load_failed)
+        self.status_label.config(text="Loading collection...")
+    
+    def apply_load_event(self, event):
+        """Apply a decoded batch of parts, or the combos and file state once the file is read."""
+        if event[0] == 'parts':
+            self.collection.extend_loaded(event[1])
+            for tab in self.tabs:
+                if hasattr(tab, 'append_loaded_parts'):
+                    tab.append_loaded_parts(event[1])
+            self.status_label.config(text=f"Loading collection... {len(self.collection.parts)} parts")
+        else:
+            self.collection.combos = event[1]
+            self.collection.catalog_version = event[2]
+            self.collection.saved = event[3]  # The file as read, not as edited during the load
+            self.finish_collection_load()
+    
+    def on_load_failed(self, error):
+        """Report a file that could not be read; the parts applied so far are kept."""
+        logging.error("Error loading collection: %s", error)
+        messagebox.showerror("Error", f"Failed to load collection: {error}")
+        self.finish_collection_load()
+    
+    def finish_collection_load(self):
+        """Unblock edits and redraw everything from the complete collection."""
+        self.collection.loading = False
+        self.migrate_collection()
+        if self.dashboard_tab is not None:
+            self.dashboard_tab.completion_tracker.rebuild()
+        self.refresh_all()
+        elapsed_ms = (time.perf_counter() - self.load_started) * 1e3
+        logging.info("Loaded %d parts and %d combos in %.0f ms", len(self.collection.parts),
+                     len(self.collection.combos), elapsed_ms, extra={'duration_ms': elapsed_ms})
+    
+    def report_callback_exception(self, exc_type, exc_value, exc_traceback):
+        """Explain edits blocked by the background load instead of logging a traceback."""
+        if isinstance(exc_value, PartNotLoadedError):
+            messagebox.showinfo("Still Loading", str(exc_value))
+            return
+        tk.Tk.report_callback_exception(self.root, exc_type, exc_value, exc_traceback)
     
     def get_status_text(self):
         """Get current collection status text."""
@@ -193,27 +363,156 @@ class ModernMainWindow:
     
     def refresh_all(self):
         """Refresh all tabs and status."""
+        with metrics.timer("ui.refresh_all"):
+            for tab in self.tabs:
+                if hasattr(tab, 'refresh'):
+                    with metrics.timer(f"ui.refresh.{type(tab).__name__}"):
+                        tab.refresh()
+            
+            # Update status bar
+            self.status_label.config(text=self.get_status_text())
+    
+    def poll_catalog(self):
+        """Check the catalog file for edits and reschedule."""
+        try:
+            self.catalog_watcher.poll()
+        except Exception as e:
+            logging.error("Error applying catalog update: %s", e)
+        self.root.after(CATALOG_POLL_MS, self.poll_catalog)
+    
+    def migrate_collection(self):
+        """Rename parts the catalog has renamed since the collection was last migrated."""
+        if self.collection.catalog_version == get_catalog().version:
+            return False
+        report = migrate_collection(self.collection)
+        if report.changed:
+            logging.info("Migrated collection to catalog v%s: %d renamed, %d merged, %d combo parts updated",
+                         report.to_version, report.renamed, report.merged, report.combo_parts)
+        return report.changed
+    
+    def on_catalog_changed(self, diff):
+        """Let tabs patch their rows for a reloaded catalog."""
+        # A collection still loading is migrated once it is complete
+        if not self.collection.loading and self.migrate_collection():
+            # Renames replace collection parts wholesale
+            if self.dashboard_tab is not None:
+                self.dashboard_tab.completion_tracker.rebuild()
+            self.refresh_all()
         for tab in self.tabs:
-            if hasattr(tab, 'refresh'):
-                tab.refresh()
+            if hasattr(tab, 'apply_catalog_diff'):
+                tab.apply_catalog_diff(diff)
+        self.status_label.config(
+            text=self.get_status_text() + f" • Catalog updated (+{len(diff.added)} "
+                                          f"-{len(diff.removed)} ~{len(diff.changed)})")
+    
+    def save_collection(self, notify=True):
+        """Save a snapshot of the collection on a worker thread; ``notify`` shows a message when done."""
+        if self.collection.loading:
+            messagebox.showinfo("Still Loading", "The collection is still loading; save once it has finished.")
+            return
+        if self.save_task is not None and not self.save_task.finished:
+            return  # The button is clicked again while saving
+        snapshot = self.collection.snapshot()
         
-        # Update status bar
-        self.status_label.config(text=self.get_status_text())
+        def save(task):
+            save_collection(snapshot, self.collection_path)
+        
+        self.save_task = self.executor.submit(save, name="Saving collection",
+                                              on_done=lambda _: self.on_saved(snapshot, notify),
+                                              on_error=self.on_save_failed)
     
-    def save_collection(self):
-        """Save the collection to file."""
+    def on_saved(self, snapshot, notify=True):
+        """Record what the file now holds, the base for merging a later conflict."""
+        if snapshot.saved.version > self.collection.saved.version:
+            self.collection.saved = snapshot.saved
+        self.status_label.config(text=self.get_status_text() + " • Saved")
+        if notify:
+            messagebox.showinfo("Success", "Collection saved successfully!")
+    
+    def on_save_failed(self, error):
+        """Offer to merge with a file saved elsewhere; report any other failure."""
         try:
-            save_collection(self.collection, "collection.json")
+            if not isinstance(error, CollectionConflictError):
+                raise error
+            logging.warning("%s", error)
+            if not messagebox.askyesno(
+                    "Saved Elsewhere",
+                    "The collection file was saved by another window or the API server since it was "
+                    "loaded.\n\nMerge your changes into it? Choosing No leaves the file as it is."):
+                return
+            # Merging edits the live collection, so it runs here rather than on a worker
+            self.write_collection(merge=True)
+            self.migrate_collection()
+            if self.dashboard_tab is not None:
+                self.dashboard_tab.completion_tracker.rebuild()
+            self.refresh_all()
             messagebox.showinfo("Success", "Collection saved successfully!")
-            self.status_label.config(text=self.get_status_text() + " • Saved")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save collection: {e}")
     
+    def profile_next_action(self):
+        """Profile until the next click or key press has been handled (F12 again cancels)."""
+        if self.profile_capture.active:
+            self.stop_profile()
+            return
+        self.profile_capture.start("action")
+        self.root.bind_all('<ButtonRelease>', self.on_profiled_action)
+        self.root.bind_all('<KeyRelease>', self.on_profiled_action)
+        self.status_label.config(text=self.get_status_text() + " • Profiling next action...")
+    
+    def on_profiled_action(self, event):
+        """End an action capture once the action and the redraw it queued are done."""
+        if event.keysym in ('F12', 'Shift_L', 'Shift_R'):
+            return  # Releasing the hotkey itself
+        self.root.unbind_all('<ButtonRelease>')
+        self.root.unbind_all('<KeyRelease>')
+        self.root.after_idle(self.stop_profile)
+    
+    def profile_for(self, seconds):
+        """Profile everything for the next ``seconds`` (Shift+F12 again stops early)."""
+        if self.profile_capture.active:
+            self.stop_profile()
+            return
+        self.profile_capture.start(f"{seconds}s")
+        self.profile_job = self.root.after(int(seconds * 1000), self.stop_profile)
+        self.status_label.config(text=self.get_status_text() + f" • Profiling for {seconds} s...")
+    
+    def stop_profile(self):
+        """Stop any capture and write its reports next to the debug log."""
+        if self.profile_job is not None:
+            self.root.after_cancel(self.profile_job)
+            self.profile_job = None
+        self.root.unbind_all('<ButtonRelease>')
+        self.root.unbind_all('<KeyRelease>')
+        try:
+            paths = self.profile_capture.stop()
+        except OSError as e:
+            logging.error("Failed to write profile: %s", e)
+            return
+        if paths:
+            self.status_label.config(text=self.get_status_text() + f" • Profile saved to {paths[1]}")
+    
+    def show_diagnostics(self):
+        """Open the live metrics panel."""
+        from ui.diagnostics_panel import DiagnosticsPanel
+        DiagnosticsPanel(self.root)
+    
+    def write_collection(self, merge=False):
+        """Write the collection to its file and note it in the status bar.
+        
+        Raises ``CollectionConflictError`` if the file was saved elsewhere
+        since it was loaded, unless ``merge`` merges this session's changes.
+        """
+        save_collection(self.collection, self.collection_path, merge)
+        self.status_label.config(text=self.get_status_text() + " • Saved")
+    
     def run(self):
         """Start the application main loop."""
         try:
             logging.info("Entering main loop...")
             self.root.mainloop()
         except Exception as e:
-            logging.error(f"Error in main loop: {e}")
+            logging.error("Error in main loop: %s", e)
             messagebox.showerror("Runtime Error", f"Application error: {e}")
+        finally:
+            self.executor.shutdown()
@@ -1,7 +1,19 @@
 """Modern tab components for the Beyblade X Collection Manager."""
 
-from .dashboard_tab import DashboardTab
-from .parts_manager_tab import PartsManagerTab
-from .combos_tab import CombosTab
+import importlib
+
+# Importing any tab module runs this package first; load the tabs on first
+# use so building one tab does not import the others.
+_LAZY = {'DashboardTab': 'dashboard_tab', 'PartsManagerTab': 'parts_manager_tab', 'CombosTab': 'combos_tab'}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ['DashboardTab', 'PartsManagerTab', 'CombosTab']
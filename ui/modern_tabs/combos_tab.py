@@ -1,24 +1,37 @@
 """Modern combos tab with streamlined combo management."""
 
+import os
+import threading
 import tkinter as tk
+from datetime import datetime
 from tkinter import ttk, messagebox, simpledialog
+from typing import Optional
 from ui.theme import BeybladeXTheme
-from models import Collection, BeybladeCombo, PartType
+from ui.task_executor import get_executor
+from models import Collection, BeybladeCombo, PartType, BattleRecord, FinishType
+from data.battle_log import BattleLog
+from services.rating_service import RatingService
+from services.combo_service import ComboService
 
 
 class CombosTab:
     """Modern combos tab with improved combo creation and management."""
     
-    def __init__(self, parent_notebook, collection: Collection, refresh_callback):
+    def __init__(self, parent_notebook, collection: Collection, refresh_callback,
+                 battle_log: Optional[BattleLog] = None, rating_service: Optional[RatingService] = None):
         self.collection = collection
         self.refresh_callback = refresh_callback
+        self.battle_log = battle_log
+        self.rating_service = rating_service
+        self.sort_column = None
+        self.sort_reverse = False
         
         # Create main frame
         self.frame = BeybladeXTheme.create_frame(parent_notebook, 'background')
         parent_notebook.add(self.frame, text="⚔️ Combos")
         
         self.setup_ui()
-        self.refresh()
+        self.populate_combos()
     
     def setup_ui(self):
         """Setup the combos tab UI."""
@@ -64,6 +77,21 @@ class CombosTab:
                 'primary',
                 command=self.create_combo_dialog
             ).pack(side='right', padx=(10, 0))
+            
+            BeybladeXTheme.create_button(
+                buttons_frame,
+                "🏆 Tournament",
+                'accent',
+                command=self.tournament_dialog
+            ).pack(side='right', padx=(10, 0))
+        
+        if self.battle_log is not None and self.collection.combos:
+            BeybladeXTheme.create_button(
+                buttons_frame,
+                "📝 Record Battle",
+                'secondary',
+                command=self.record_battle_dialog
+            ).pack(side='right', padx=(10, 0))
         
         BeybladeXTheme.create_button(
             buttons_frame,
@@ -135,20 +163,24 @@ class CombosTab:
         list_card.pack(fill='both', expand=True)
         
         # Combos treeview
-        columns = ('Blade', 'Ratchet', 'Bit', 'Notes')
+        columns = ('Blade', 'Ratchet', 'Bit', 'Rating', 'Record', 'Notes')
         self.combos_tree = ttk.Treeview(list_card, columns=columns, show='tree headings')
         
-        # Configure columns
-        self.combos_tree.heading('#0', text='Combo Name')
-        self.combos_tree.heading('Blade', text='Blade')
-        self.combos_tree.heading('Ratchet', text='Ratchet')
-        self.combos_tree.heading('Bit', text='Bit')
+        # Configure columns (click a heading to sort)
+        self.combos_tree.heading('#0', text='Combo Name', command=lambda: self.sort_by('#0'))
+        self.combos_tree.heading('Blade', text='Blade', command=lambda: self.sort_by('Blade'))
+        self.combos_tree.heading('Ratchet', text='Ratchet', command=lambda: self.sort_by('Ratchet'))
+        self.combos_tree.heading('Bit', text='Bit', command=lambda: self.sort_by('Bit'))
+        self.combos_tree.heading('Rating', text='Rating', command=lambda: self.sort_by('Rating'))
+        self.combos_tree.heading('Record', text='Win Rate', command=lambda: self.sort_by('Record'))
         self.combos_tree.heading('Notes', text='Notes')
         
         self.combos_tree.column('#0', width=200)
         self.combos_tree.column('Blade', width=150)
         self.combos_tree.column('Ratchet', width=100)
         self.combos_tree.column('Bit', width=100)
+        self.combos_tree.column('Rating', width=70)
+        self.combos_tree.column('Record', width=120)
         self.combos_tree.column('Notes', width=200)
         
         # Scrollbar
@@ -212,6 +244,10 @@ class CombosTab:
         """Show create combo dialog."""
         dialog = CreateComboDialog(self.frame, self.collection, self.refresh_callback)
     
+    def tournament_dialog(self):
+        """Show tournament simulation dialog."""
+        dialog = TournamentDialog(self.frame, self.collection)
+    
     def delete_selected_combo(self):
         """Delete selected combo."""
         if not hasattr(self, 'combos_tree'):
@@ -249,7 +285,10 @@ class CombosTab:
         for widget in self.frame.winfo_children():
             widget.destroy()
         self.setup_ui()
-        
+        self.populate_combos()
+    
+    def populate_combos(self):
+        """Fill the combos list from the collection."""
         if hasattr(self, 'combos_tree'):
             # Refresh combos list
             for item in self.combos_tree.get_children():
@@ -258,7 +297,57 @@ class CombosTab:
             for combo in self.collection.combos:
                 self.combos_tree.insert('', 'end', text=combo.name,
                                        values=(combo.blade.name, combo.ratchet.name,
-                                             combo.bit.name, combo.notes or ""))
+                                             combo.bit.name, self.get_rating_text(combo),
+                                             self.get_record_text(combo), combo.notes or ""))
+            
+            if self.sort_column:
+                self.apply_sort()
+    
+    def get_rating_text(self, combo: BeybladeCombo) -> str:
+        """Format a combo's Elo rating."""
+        if self.rating_service is None:
+            return ""
+        return f"{self.rating_service.get_combo_rating(combo.name):.0f}"
+    
+    def sort_by(self, column):
+        """Sort combos by a column, toggling direction on repeated clicks."""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            # Ratings and win rates read best-first
+            self.sort_reverse = column in ('Rating', 'Record')
+        self.apply_sort()
+    
+    def apply_sort(self):
+        """Reorder treeview rows by the current sort column."""
+        def sort_key(item):
+            if self.sort_column == '#0':
+                return (0, self.combos_tree.item(item, 'text').lower())
+            value = str(self.combos_tree.set(item, self.sort_column))
+            number = value.split('%')[0]
+            try:
+                return (0, float(number))
+            except ValueError:
+                return (1, value.lower()) if not self.sort_reverse else (-1, value.lower())
+        
+        items = sorted(self.combos_tree.get_children(), key=sort_key, reverse=self.sort_reverse)
+        for index, item in enumerate(items):
+            self.combos_tree.move(item, '', index)
+    
+    def get_record_text(self, combo: BeybladeCombo) -> str:
+        """Format a combo's logged win rate."""
+        if self.battle_log is None:
+            return ""
+        record = self.battle_log.combo_win_rate(combo.name)
+        if not record.battles:
+            return "-"
+        return f"{record.rate:.0%} ({record.wins}-{record.losses})"
+    
+    def record_battle_dialog(self):
+        """Show record battle dialog."""
+        dialog = RecordBattleDialog(self.frame, self.collection, self.battle_log,
+                                    self.refresh_callback, self.rating_service)
 
 
 class CreateComboDialog:
@@ -421,3 +510,284 @@ class CreateComboDialog:
         
         messagebox.showinfo("Success", f"Created combo '{combo.name}'!")
         self.dialog.destroy()
+
+
+class RecordBattleDialog:
+    """Dialog for logging the result of a battle between two combos."""
+    
+    def __init__(self, parent, collection: Collection, battle_log: BattleLog, refresh_callback,
+                 rating_service: Optional[RatingService] = None):
+        self.collection = collection
+        self.battle_log = battle_log
+        self.refresh_callback = refresh_callback
+        self.rating_service = rating_service
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Record Battle")
+        self.dialog.geometry("500x350")
+        self.dialog.configure(bg=BeybladeXTheme.COLORS['background'])
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 50))
+        
+        self.setup_dialog()
+    
+    def setup_dialog(self):
+        """Setup the record battle dialog."""
+        main_frame = BeybladeXTheme.create_frame(self.dialog, 'background')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        BeybladeXTheme.create_label(
+            main_frame,
+            "📝 Record Battle",
+            'heading_medium'
+        ).pack(pady=(0, 20))
+        
+        content_card = BeybladeXTheme.create_card_frame(main_frame)
+        content_card.pack(fill='both', expand=True, pady=(0, 20))
+        
+        content_frame = BeybladeXTheme.create_frame(content_card, 'surface')
+        content_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        combo_names = [combo.name for combo in self.collection.combos]
+        self.combo_a_var = tk.StringVar()
+        self.combo_b_var = tk.StringVar()
+        self.winner_var = tk.StringVar(value='a')
+        self.finish_var = tk.StringVar(value=FinishType.SPIN.value)
+        
+        rows = [
+            ("Combo A:", ttk.Combobox(content_frame, textvariable=self.combo_a_var,
+                                      values=combo_names, state="readonly", width=30)),
+            ("Combo B:", ttk.Combobox(content_frame, textvariable=self.combo_b_var,
+                                      values=combo_names, state="readonly", width=30)),
+            ("Finish:", ttk.Combobox(content_frame, textvariable=self.finish_var,
+                                     values=[finish.value for finish in FinishType],
+                                     state="readonly", width=30)),
+        ]
+        for row, (label, widget) in enumerate(rows):
+            BeybladeXTheme.create_label(content_frame, label, 'body', bg=BeybladeXTheme.COLORS['surface']
+                                        ).grid(row=row, column=0, sticky='w', pady=5, padx=(0, 10))
+            widget.grid(row=row, column=1, sticky='ew', pady=5)
+        
+        winner_frame = BeybladeXTheme.create_frame(content_frame, 'surface')
+        winner_frame.grid(row=len(rows), column=1, sticky='w', pady=5)
+        BeybladeXTheme.create_label(content_frame, "Winner:", 'body', bg=BeybladeXTheme.COLORS['surface']
+                                    ).grid(row=len(rows), column=0, sticky='w', pady=5, padx=(0, 10))
+        ttk.Radiobutton(winner_frame, text="Combo A", variable=self.winner_var, value='a').pack(side='left')
+        ttk.Radiobutton(winner_frame, text="Combo B", variable=self.winner_var, value='b').pack(side='left', padx=(10, 0))
+        content_frame.grid_columnconfigure(1, weight=1)
+        
+        # Buttons
+        button_frame = BeybladeXTheme.create_frame(main_frame, 'background')
+        button_frame.pack(fill='x')
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "📝 Record",
+            'primary',
+            command=self.record_battle
+        ).pack(side='right', padx=(10, 0))
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "Cancel",
+            'secondary',
+            command=self.dialog.destroy
+        ).pack(side='right')
+    
+    def find_combo(self, name: str) -> Optional[BeybladeCombo]:
+        """Find a collection combo by name."""
+        return next((combo for combo in self.collection.combos if combo.name == name), None)
+    
+    def record_battle(self):
+        """Append the battle to the log."""
+        combo_a = self.find_combo(self.combo_a_var.get())
+        combo_b = self.find_combo(self.combo_b_var.get())
+        if not combo_a or not combo_b:
+            messagebox.showwarning("Incomplete", "Please select both combos.")
+            return
+        if combo_a.name == combo_b.name:
+            messagebox.showwarning("Same Combo", "Please select two different combos.")
+            return
+        
+        winner = combo_a if self.winner_var.get() == 'a' else combo_b
+        battle = BattleRecord(
+            combo_a=combo_a,
+            combo_b=combo_b,
+            finish=FinishType(self.finish_var.get()),
+            winner=winner.name,
+            timestamp=datetime.now()
+        )
+        try:
+            self.battle_log.record(battle)
+            if self.rating_service is not None:
+                self.rating_service.sync(self.battle_log)
+                self.rating_service.save()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to record battle: {e}")
+            return
+        
+        self.refresh_callback()
+        messagebox.showinfo("Success", f"Recorded {battle.finish.value} win for '{winner.name}'!")
+        self.dialog.destroy()
+
+
+class TournamentDialog:
+    """Dialog that simulates a tournament between buildable combos."""
+    
+    def __init__(self, parent, collection: Collection):
+        self.collection = collection
+        self.cancel_event = None
+        self.task = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Tournament Simulator")
+        self.dialog.geometry("600x500")
+        self.dialog.configure(bg=BeybladeXTheme.COLORS['background'])
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 50))
+        
+        self.setup_dialog()
+    
+    def setup_dialog(self):
+        """Setup the tournament dialog."""
+        main_frame = BeybladeXTheme.create_frame(self.dialog, 'background')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        BeybladeXTheme.create_label(
+            main_frame,
+            "🏆 Tournament Simulator",
+            'heading_medium'
+        ).pack(pady=(0, 15))
+        
+        # Options
+        options_frame = BeybladeXTheme.create_frame(main_frame, 'background')
+        options_frame.pack(fill='x', pady=(0, 10))
+        
+        BeybladeXTheme.create_label(options_frame, "Format:", 'body').pack(side='left')
+        self.format_var = tk.StringVar(value="Swiss")
+        ttk.Combobox(
+            options_frame,
+            textvariable=self.format_var,
+            values=["Swiss", "Round Robin"],
+            state="readonly",
+            width=12
+        ).pack(side='left', padx=(5, 20))
+        
+        BeybladeXTheme.create_label(options_frame, "Field size:", 'body').pack(side='left')
+        self.field_var = tk.IntVar(value=256)
+        tk.Spinbox(options_frame, from_=2, to=20000, textvariable=self.field_var, width=8).pack(side='left', padx=(5, 0))
+        
+        # Progress
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=1)
+        self.progress.pack(fill='x', pady=(0, 5))
+        
+        self.status_label = BeybladeXTheme.create_label(
+            main_frame,
+            "Each buildable combo enters as a one-combo deck.",
+            'body_small',
+            fg=BeybladeXTheme.COLORS['text_secondary']
+        )
+        self.status_label.pack(anchor='w', pady=(0, 10))
+        
+        # Standings
+        columns = ('W', 'L', 'D', 'Points')
+        self.standings_tree = ttk.Treeview(main_frame, columns=columns, show='tree headings', height=10)
+        self.standings_tree.heading('#0', text='Deck')
+        for column in columns:
+            self.standings_tree.heading(column, text=column)
+            self.standings_tree.column(column, width=60)
+        self.standings_tree.column('#0', width=250)
+        self.standings_tree.pack(fill='both', expand=True, pady=(0, 10))
+        
+        # Buttons
+        button_frame = BeybladeXTheme.create_frame(main_frame, 'background')
+        button_frame.pack(fill='x')
+        
+        self.run_button = BeybladeXTheme.create_button(
+            button_frame,
+            "▶ Run",
+            'primary',
+            command=self.start
+        )
+        self.run_button.pack(side='right', padx=(10, 0))
+        
+        BeybladeXTheme.create_button(
+            button_frame,
+            "Cancel",
+            'secondary',
+            command=self.cancel
+        ).pack(side='right')
+    
+    def start(self):
+        """Start the tournament on the shared executor."""
+        try:
+            from services.tournament_service import TournamentSimulator, Deck
+            field_size = self.field_var.get()
+            decks = [Deck(combo.name, [combo])
+                     for combo, _ in ComboService.top_combos(self.collection, field_size)]
+            simulator = TournamentSimulator(decks, processes=os.cpu_count())
+        except (ImportError, ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"Cannot start tournament: {e}")
+            return
+        
+        # Cancel stops the run but still shows the partial standings, so it
+        # sets the simulator's event rather than cancelling the task
+        cancel_event = self.cancel_event = threading.Event()
+        self.run_button.config(state='disabled')
+        self.status_label.config(text=f"Simulating {len(decks)} decks...")
+        
+        tournament_format = self.format_var.get()
+        
+        def run(task):
+            if tournament_format == "Round Robin":
+                return simulator.run_round_robin(task.progress, cancel_event)
+            return simulator.run_swiss(progress_callback=task.progress, cancel_event=cancel_event)
+        
+        self.task = get_executor().submit(run, name="Simulating tournament", on_done=self.show_result,
+                                          on_error=self.on_failed, on_progress=self.show_progress,
+                                          on_finished=self.on_finished)
+    
+    def show_progress(self, task):
+        """Show the matches played so far."""
+        total = task.total or 0
+        self.progress.config(maximum=max(total, 1), value=task.done)
+        self.status_label.config(text=f"{task.done:,} / {total:,} matches")
+    
+    def on_failed(self, error):
+        messagebox.showerror("Error", f"Tournament failed: {error}")
+    
+    def on_finished(self, task):
+        if self.dialog.winfo_exists():  # Also called for a run cancelled by closing the dialog
+            self.run_button.config(state='normal')
+    
+    def show_result(self, result):
+        """Show the top of the final standings."""
+        for item in self.standings_tree.get_children():
+            self.standings_tree.delete(item)
+        for standing in result.standings[:50]:
+            self.standings_tree.insert('', 'end', text=standing.deck,
+                                       values=(standing.wins, standing.losses,
+                                               standing.draws, standing.points_for))
+        state = "Cancelled" if result.cancelled else "Finished"
+        self.status_label.config(text=f"{state} • {result.format} • {result.matches_played:,} matches")
+    
+    def cancel(self):
+        """Cancel a running tournament, or close the dialog when idle."""
+        if self.task is not None and not self.task.finished and not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.status_label.config(text="Cancelling...")
+        else:
+            self.close()
+    
+    def close(self):
+        """Close the dialog, cancelling any running tournament without waiting for its result."""
+        if self.task is not None:
+            self.cancel_event.set()
+            self.task.cancel()  # No callbacks once the dialog is gone
+        self.dialog.destroy()
@@ -5,6 +5,9 @@ from tkinter import ttk
 from ui.theme import BeybladeXTheme
 from models import Collection, PartType
 from services.stats_service import StatsService
+from services.recommendation_service import RecommendationService
+from services.planner_service import PurchasePlanner
+from services.completion_service import CompletionTracker
 
 
 class DashboardTab:
@@ -14,13 +17,16 @@ class DashboardTab:
         self.collection = collection
         self.stats_service = stats_service
         self.refresh_callback = refresh_callback
+        self.purchase_planner = PurchasePlanner()
+        self.completion_tracker = CompletionTracker(collection)
+        self.completion_tracker.add_listener(self.update_completion)
+        self.completion_labels = {}
         
         # Create main frame
         self.frame = BeybladeXTheme.create_frame(parent_notebook, 'background')
         parent_notebook.add(self.frame, text="🏠 Dashboard")
         
         self.setup_ui()
-        self.refresh()
     
     def setup_ui(self):
         """Setup the dashboard UI."""
@@ -34,6 +40,9 @@ class DashboardTab:
         # Stats cards
         self.create_stats_cards(main_frame)
         
+        # Catalog completion
+        self.create_completion_card(main_frame)
+        
         # Recent activity / Quick actions
         self.create_quick_actions(main_frame)
     
@@ -53,20 +62,22 @@ class DashboardTab:
         ).pack(anchor='w')
         
         # Description
+        self.welcome_label = BeybladeXTheme.create_label(
+            welcome_content,
+            self.get_welcome_text(),
+            'body',
+            fg=BeybladeXTheme.COLORS['text_secondary']
+        )
+        self.welcome_label.pack(anchor='w', pady=(5, 0))
+    
+    def get_welcome_text(self):
+        """Describe the collection's size for the welcome section."""
         total_parts = len(self.collection.parts)
         total_quantity = sum(part.owned_quantity for part in self.collection.parts)
         
         if total_parts > 0:
-            description = f"You have {total_parts} unique parts with {total_quantity} total items in your collection."
-        else:
-            description = "Start building your collection by adding parts in the Parts Manager tab."
-        
-        BeybladeXTheme.create_label(
-            welcome_content,
-            description,
-            'body',
-            fg=BeybladeXTheme.COLORS['text_secondary']
-        ).pack(anchor='w', pady=(5, 0))
+            return f"You have {total_parts} unique parts with {total_quantity} total items in your collection."
+        return "Start building your collection by adding parts in the Parts Manager tab."
     
     def create_stats_cards(self, parent):
         """Create stats cards showing collection metrics."""
@@ -77,20 +88,23 @@ class DashboardTab:
         cards_container = BeybladeXTheme.create_frame(stats_frame, 'background')
         cards_container.pack(fill='x')
         
-        # Calculate stats
-        blades = self.collection.get_parts_by_type(PartType.BLADE)
-        ratchets = self.collection.get_parts_by_type(PartType.RATCHET)
-        bits = self.collection.get_parts_by_type(PartType.BIT)
-        combos = len(self.collection.combos)
-        
-        # Create individual stat cards
-        self.create_stat_card(cards_container, "🗡️", "Blades", len(blades), 0)
-        self.create_stat_card(cards_container, "⚙️", "Ratchets", len(ratchets), 1)
-        self.create_stat_card(cards_container, "🎯", "Bits", len(bits), 2)
-        self.create_stat_card(cards_container, "⚔️", "Combos", combos, 3)
+        # Create individual stat cards; value labels are kept for refresh
+        icons = ["🗡️", "⚙️", "🎯", "⚔️"]
+        self.stat_labels = {}
+        for position, (label, value) in enumerate(self.get_stat_values().items()):
+            self.stat_labels[label] = self.create_stat_card(cards_container, icons[position], label, value, position)
+    
+    def get_stat_values(self):
+        """Count the collection's parts by type and its combos, keyed by card label."""
+        return {
+            "Blades": len(self.collection.get_parts_by_type(PartType.BLADE)),
+            "Ratchets": len(self.collection.get_parts_by_type(PartType.RATCHET)),
+            "Bits": len(self.collection.get_parts_by_type(PartType.BIT)),
+            "Combos": len(self.collection.combos)
+        }
     
     def create_stat_card(self, parent, icon, label, value, position):
-        """Create an individual stat card."""
+        """Create an individual stat card and return its value label."""
         card = BeybladeXTheme.create_card_frame(parent)
         card.grid(row=0, column=position, padx=10, pady=0, sticky='ew')
         
@@ -109,12 +123,13 @@ class DashboardTab:
         ).pack()
         
         # Value
-        BeybladeXTheme.create_label(
+        value_label = BeybladeXTheme.create_label(
             content,
             str(value),
             'heading_large',
             fg=BeybladeXTheme.COLORS['primary']
-        ).pack()
+        )
+        value_label.pack()
         
         # Label
         BeybladeXTheme.create_label(
@@ -123,6 +138,106 @@ class DashboardTab:
             'body',
             fg=BeybladeXTheme.COLORS['text_secondary']
         ).pack()
+        
+        return value_label
+    
+    def create_completion_card(self, parent):
+        """Create catalog completion card, updated in place as parts change."""
+        completion_card = BeybladeXTheme.create_card_frame(parent)
+        completion_card.pack(fill='x', pady=(0, 20))
+        
+        content = BeybladeXTheme.create_frame(completion_card, 'surface')
+        content.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        header = BeybladeXTheme.create_frame(content, 'surface')
+        header.pack(fill='x', pady=(0, 10))
+        
+        BeybladeXTheme.create_label(
+            header,
+            "Catalog Completion",
+            'heading_medium'
+        ).pack(side='left')
+        
+        BeybladeXTheme.create_button(
+            header,
+            "📋 Missing Parts",
+            'secondary',
+            command=self.show_missing_parts
+        ).pack(side='right')
+        
+        self.completion_rows = BeybladeXTheme.create_frame(content, 'surface')
+        self.completion_rows.pack(fill='x')
+        self.create_completion_rows()
+    
+    def create_completion_rows(self):
+        """(Re)create the completion rows, e.g. after a catalog reload changed the groups."""
+        for widget in self.completion_rows.winfo_children():
+            widget.destroy()
+        
+        # One row per group kind; labels are kept so single groups can be updated
+        self.completion_labels = {}
+        tracker = self.completion_tracker
+        rows = [
+            ("Overall", [tracker.overall()]),
+            ("Part Type", tracker.by_type()),
+            ("Rarity", tracker.by_rarity()),
+            ("Series", tracker.by_series())
+        ]
+        for title, groups in rows:
+            row = BeybladeXTheme.create_frame(self.completion_rows, 'surface')
+            row.pack(fill='x', pady=2)
+            
+            BeybladeXTheme.create_label(
+                row,
+                f"{title}:",
+                'body',
+                fg=BeybladeXTheme.COLORS['text_secondary'],
+                width=10,
+                anchor='w'
+            ).pack(side='left')
+            
+            # Series are many and short, so they wrap onto several lines
+            items = BeybladeXTheme.create_frame(row, 'surface')
+            items.pack(side='left', fill='x', expand=True)
+            per_line = 8 if title == "Series" else len(groups)
+            for position, group in enumerate(groups):
+                label = BeybladeXTheme.create_label(
+                    items,
+                    self.get_completion_text(group),
+                    'body_small'
+                )
+                label.grid(row=position // per_line, column=position % per_line, sticky='w', padx=(0, 15))
+                self.completion_labels[group.key] = label
+    
+    @staticmethod
+    def get_completion_text(group):
+        """Format a completion group as 'Label owned/total (percent)'."""
+        return f"{group.label} {group.owned}/{group.total} ({group.percent:.0f}%)"
+    
+    def update_completion(self, keys):
+        """Tracker listener: relabel only the groups that changed."""
+        for key in keys:
+            label = self.completion_labels.get(key)
+            if label is not None and label.winfo_exists():
+                label.config(text=self.get_completion_text(self.completion_tracker.progress(key)))
+    
+    def apply_catalog_diff(self, diff):
+        """Recount completion for a reloaded catalog and recreate its rows."""
+        self.completion_tracker.apply_catalog_diff(diff)
+        self.create_completion_rows()
+    
+    def show_missing_parts(self):
+        """Show the catalog parts not yet in the collection, by part type."""
+        from tkinter import messagebox
+        lines = []
+        for group in self.completion_tracker.by_type():
+            missing = self.completion_tracker.missing(group.key)
+            if missing:
+                lines.append(f"{group.label} ({len(missing)}): {', '.join(part.name for part in missing)}")
+        if not lines:
+            messagebox.showinfo("Missing Parts", "Your collection is complete!")
+            return
+        messagebox.showinfo("Missing Parts", "\n\n".join(lines))
     
     def create_quick_actions(self, parent):
         """Create quick actions section."""
@@ -158,13 +273,37 @@ class DashboardTab:
             command=self.go_to_combos
         ).pack(side='left', padx=(0, 10))
         
+        self.stats_button = BeybladeXTheme.create_button(
+            buttons_frame,
+            "📊 View Detailed Stats",
+            'secondary',
+            command=self.show_detailed_stats
+        )
+        
+        self.recommend_button = BeybladeXTheme.create_button(
+            buttons_frame,
+            "🛒 What to Buy Next",
+            'secondary',
+            command=self.show_recommendations
+        )
+        self.recommend_button.pack(side='left', padx=(0, 10))
+        
+        BeybladeXTheme.create_button(
+            buttons_frame,
+            "📦 Complete My Collection",
+            'secondary',
+            command=self.show_purchase_plan
+        ).pack(side='left')
+        
+        self.update_stats_button()
+    
+    def update_stats_button(self):
+        """Show the detailed stats button only while the collection has parts."""
         if len(self.collection.parts) > 0:
-            BeybladeXTheme.create_button(
-                buttons_frame,
-                "📊 View Detailed Stats",
-                'secondary',
-                command=self.show_detailed_stats
-            ).pack(side='left')
+            if not self.stats_button.winfo_manager():
+                self.stats_button.pack(side='left', padx=(0, 10), before=self.recommend_button)
+        else:
+            self.stats_button.pack_forget()
     
     def go_to_parts_manager(self):
         """Switch to All Parts tab."""
@@ -184,9 +323,42 @@ class DashboardTab:
         stats_text = self.stats_service.calculate_stats(self.collection)
         messagebox.showinfo("Detailed Statistics", stats_text)
     
+    def show_recommendations(self):
+        """Show the parts that would improve the collection most."""
+        from tkinter import messagebox
+        recommendations = RecommendationService.recommend(self.collection, limit=10)
+        if not recommendations:
+            messagebox.showinfo("What to Buy Next", "You already own every part in the catalog!")
+            return
+        
+        lines = []
+        for rank, rec in enumerate(recommendations, 1):
+            lines.append(f"{rank}. {rec.part.name} ({rec.part.part_type.value}) • "
+                         f"+{rec.combo_gain} combos • +{rec.score_gain:.1f} best score")
+        messagebox.showinfo("What to Buy Next", "\n".join(lines))
+    
+    def show_purchase_plan(self):
+        """Show the cheapest set of products covering every missing part."""
+        from tkinter import messagebox
+        plan = self.purchase_planner.plan(self.collection)
+        if not plan.products:
+            messagebox.showinfo("Complete My Collection", "Your collection is already complete!")
+            return
+        
+        lines = [f"{product.sku} {product.name} • ${product.price:.2f}" for product in plan.products]
+        lines.append("")
+        lines.append(f"Total: ${plan.total_cost:.2f} for {len(plan.covered)} missing parts")
+        if not plan.exact:
+            lines.append("(approximate plan)")
+        if plan.unavailable:
+            lines.append(f"Not sold in any product: {', '.join(name for name, _ in plan.unavailable)}")
+        messagebox.showinfo("Complete My Collection", "\n".join(lines))
+    
     def refresh(self):
-        """Refresh the dashboard content."""
-        # Refresh is handled by recreating the stats cards
-        for widget in self.frame.winfo_children():
-            widget.destroy()
-        self.setup_ui()
+        """Update the dashboard's existing widgets from the collection."""
+        self.welcome_label.config(text=self.get_welcome_text())
+        for label, value in self.get_stat_values().items():
+            self.stat_labels[label].config(text=str(value))
+        # Cheap: the tracker already holds the counts, e.g. after a rebuild()
+        self.update_completion(list(self.completion_labels))
+        self.update_stats_button()
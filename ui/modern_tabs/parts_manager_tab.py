@@ -5,7 +5,8 @@ from tkinter import ttk, messagebox, simpledialog
 from ui.theme import BeybladeXTheme
 from models import Collection, PartType, BeybladePart
 from services.part_service import PartService
-from data.database import BEYBLADE_X_DATABASE, find_database_part
+from data.database import BEYBLADE_X_DATABASE, find_database_part, get_search_index
+from ui.modern_tabs.parts_tab import part_iid, catalog_insert_index
 
 
 class PartsManagerTab:
@@ -295,26 +296,60 @@ class PartsManagerTab:
     def refresh_database_view(self):
         """Refresh the database view with current filters."""
         # Clear existing items
-        for item in self.database_tree.get_children():
-            self.database_tree.delete(item)
+        self.database_tree.delete(*self.database_tree.get_children())
         
         # Get all parts and apply filters
         from data.database import get_all_parts
         all_parts = get_all_parts()
         
-        search_term = self.search_var.get().lower()
+        matches = get_search_index().search(self.search_var.get(), fields=('name',))
         filter_type = self.filter_var.get()
         
         for part in all_parts:
             # Apply filters
             if filter_type != "All" and part.part_type.value != filter_type:
                 continue
-            if search_term and search_term not in part.name.lower():
+            if matches is not None and (part.name, part.part_type) not in matches:
                 continue
             
-            self.database_tree.insert('', 'end', text=part.name,
-                                     values=(part.part_type.value, part.series,
-                                           part.rarity.value, part.weight or "N/A"))
+            self.insert_database_row(part)
+    
+    @staticmethod
+    def get_database_values(part):
+        return (part.part_type.value, part.series, part.rarity.value, part.weight or "N/A")
+    
+    def insert_database_row(self, part, index='end'):
+        """Insert a database part row keyed by its catalog iid."""
+        self.database_tree.insert('', index, iid=part_iid(part), text=part.name,
+                                  values=self.get_database_values(part))
+    
+    def is_database_row_shown(self, part):
+        """Check a part against the current type filter and name search."""
+        filter_type = self.filter_var.get()
+        search_term = self.search_var.get()
+        return ((filter_type == "All" or part.part_type.value == filter_type) and
+                (not search_term or get_search_index().matches(part, search_term, fields=('name',))))
+    
+    def apply_catalog_diff(self, diff):
+        """Patch only the database rows of parts that a catalog reload touched."""
+        tree = self.database_tree
+        for part in diff.removed:
+            if tree.exists(part_iid(part)):
+                tree.delete(part_iid(part))
+        
+        for _, part in diff.changed:
+            shown = self.is_database_row_shown(part)
+            if tree.exists(part_iid(part)):
+                if shown:
+                    tree.item(part_iid(part), text=part.name, values=self.get_database_values(part))
+                else:
+                    tree.delete(part_iid(part))
+            elif shown:
+                self.insert_database_row(part, catalog_insert_index(tree, part))
+        
+        for part in diff.added:
+            if self.is_database_row_shown(part):
+                self.insert_database_row(part, catalog_insert_index(tree, part))
     
     def refresh_collection_view(self):
         """Refresh the collection view."""
@@ -323,7 +358,11 @@ class PartsManagerTab:
             self.collection_tree.delete(item)
         
         # Add collection items
-        for part in self.collection.parts:
+        self.append_loaded_parts(self.collection.parts)
+    
+    def append_loaded_parts(self, parts):
+        """Add collection rows, e.g. for a batch delivered by the background load."""
+        for part in parts:
             self.collection_tree.insert('', 'end', text=part.name,
                                        values=(part.part_type.value, part.rarity.value,
                                              part.owned_quantity, part.condition))
@@ -4,7 +4,61 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from ui.theme import BeybladeXTheme
 from models import Collection, PartType, BeybladePart
-from data.database import BEYBLADE_X_DATABASE
+from data.database import BEYBLADE_X_DATABASE, get_catalog, get_search_index
+from diagnostics import timed
+from ui.task_executor import get_executor
+
+
+# Quick-add sets report progress and check for cancellation this often
+QUICK_ADD_PROGRESS_EVERY = 200
+
+
+def part_iid(part: BeybladePart) -> str:
+    """Treeview item id of a catalog part, stable across catalog reloads."""
+    return f"{part.part_type.value}|{part.name}"
+
+
+def catalog_insert_index(tree, part: BeybladePart) -> int:
+    """Index keeping a treeview's catalog-ordered rows in catalog order."""
+    catalog = get_catalog()
+    position = catalog.position(part.name, part.part_type)
+    children = tree.get_children()
+    lo, hi = 0, len(children)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        part_type, name = children[mid].split('|', 1)
+        if catalog.position(name, PartType(part_type)) < position:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def filter_parts_lists(task, search_term: str, parts_lists):
+    """The parts of each list matching a search; runs on a worker."""
+    matches = get_search_index().search(search_term)
+    results = []
+    for parts_list in parts_lists:
+        task.check_cancelled()
+        if matches is None:
+            results.append(parts_list)
+        else:
+            results.append([part for part in parts_list if (part.name, part.part_type) in matches])
+    return results
+
+
+def owned_copy(part: BeybladePart) -> BeybladePart:
+    """A new, owned copy of a catalog part for adding to the collection."""
+    return BeybladePart(
+        name=part.name,
+        part_type=part.part_type,
+        series=part.series,
+        rarity=part.rarity,
+        weight=part.weight,
+        description=part.description,
+        owned_quantity=1,
+        condition="New"
+    )
 
 
 class PartsTab:
@@ -13,13 +67,16 @@ class PartsTab:
     def __init__(self, parent_notebook, collection: Collection, refresh_callback):
         self.collection = collection
         self.refresh_callback = refresh_callback
+        self.part_trees = []  # (treeview, part type shown or None for all)
+        self.count_labels = {}  # category or None for the total -> (label, text template)
+        self.search_task = None
         
         # Create main frame
         self.frame = BeybladeXTheme.create_frame(parent_notebook, 'background')
         parent_notebook.add(self.frame, text="🎯 All Parts")
         
+        # The treeviews are filled with the whole catalog as they are created
         self.setup_ui()
-        self.refresh()
     
     def setup_ui(self):
         """Setup the parts browser UI."""
@@ -70,14 +127,16 @@ class PartsTab:
         info_row.pack(fill='x')
         
         total_parts = sum(len(parts) for parts in BEYBLADE_X_DATABASE.values())
-        info_text = f"Browse {total_parts} official Beyblade X parts • Click any part to add to your collection"
+        info_template = "Browse {} official Beyblade X parts • Click any part to add to your collection"
         
-        BeybladeXTheme.create_label(
+        info_label = BeybladeXTheme.create_label(
             info_row,
-            info_text,
+            info_template.format(total_parts),
             'body',
             fg=BeybladeXTheme.COLORS['text_secondary']
-        ).pack(side='left')
+        )
+        info_label.pack(side='left')
+        self.count_labels[None] = (info_label, info_template)
         
         # Quick add button
         BeybladeXTheme.create_button(
@@ -116,14 +175,17 @@ class PartsTab:
         stats_content.pack(fill='x', padx=15, pady=10)
         
         blade_count = len(BEYBLADE_X_DATABASE["blades"])
-        BeybladeXTheme.create_label(
+        count_template = "🗡️ {} Blades Available • Attack, Defense, Stamina & Balance Types"
+        count_label = BeybladeXTheme.create_label(
             stats_content,
-            f"🗡️ {blade_count} Blades Available • Attack, Defense, Stamina & Balance Types",
+            count_template.format(blade_count),
             'heading_small'
-        ).pack()
+        )
+        count_label.pack()
+        self.count_labels["blades"] = (count_label, count_template)
         
         # Blades grid
-        self.blades_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["blades"])
+        self.blades_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["blades"], PartType.BLADE)
     
     def create_ratchets_tab(self):
         """Create the Ratchets tab."""
@@ -141,14 +203,17 @@ class PartsTab:
         stats_content.pack(fill='x', padx=15, pady=10)
         
         ratchet_count = len(BEYBLADE_X_DATABASE["ratchets"])
-        BeybladeXTheme.create_label(
+        count_template = "⚙️ {} Ratchets Available • 60mm, 70mm, 80mm Heights • 1-10 Sided"
+        count_label = BeybladeXTheme.create_label(
             stats_content,
-            f"⚙️ {ratchet_count} Ratchets Available • 60mm, 70mm, 80mm Heights • 1-10 Sided",
+            count_template.format(ratchet_count),
             'heading_small'
-        ).pack()
+        )
+        count_label.pack()
+        self.count_labels["ratchets"] = (count_label, count_template)
         
         # Ratchets grid
-        self.ratchets_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["ratchets"])
+        self.ratchets_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["ratchets"], PartType.RATCHET)
     
     def create_bits_tab(self):
         """Create the Bits tab."""
@@ -166,14 +231,17 @@ class PartsTab:
         stats_content.pack(fill='x', padx=15, pady=10)
         
         bit_count = len(BEYBLADE_X_DATABASE["bits"])
-        BeybladeXTheme.create_label(
+        count_template = "🎯 {} Bits Available • Attack, Stamina, Defense, Balance & Special Types"
+        count_label = BeybladeXTheme.create_label(
             stats_content,
-            f"🎯 {bit_count} Bits Available • Attack, Stamina, Defense, Balance & Special Types",
+            count_template.format(bit_count),
             'heading_small'
-        ).pack()
+        )
+        count_label.pack()
+        self.count_labels["bits"] = (count_label, count_template)
         
         # Bits grid
-        self.bits_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["bits"])
+        self.bits_tree = self.create_parts_treeview(content_frame, BEYBLADE_X_DATABASE["bits"], PartType.BIT)
     
     def create_all_parts_tab(self):
         """Create the All Parts tab."""
@@ -188,8 +256,8 @@ class PartsTab:
         all_parts = get_all_parts()
         self.all_parts_tree = self.create_parts_treeview(content_frame, all_parts)
     
-    def create_parts_treeview(self, parent, parts_list):
-        """Create a treeview for displaying parts."""
+    def create_parts_treeview(self, parent, parts_list, part_type=None):
+        """Create a treeview for displaying parts, optionally of a single type."""
         # Treeview frame
         tree_card = BeybladeXTheme.create_card_frame(parent)
         tree_card.pack(fill='both', expand=True)
@@ -222,11 +290,7 @@ class PartsTab:
         
         # Populate with parts
         for part in parts_list:
-            # Color code by rarity
-            tags = [part.rarity.value.lower().replace(' ', '_')]
-            tree.insert('', 'end', text=part.name, tags=tags,
-                       values=(part.part_type.value, part.series, part.rarity.value,
-                             f"{part.weight:.1f}" if part.weight else "N/A", part.description or ""))
+            self.insert_part_row(tree, part)
         
         # Configure rarity colors
         tree.tag_configure('common', background='#E8F5E8')
@@ -238,8 +302,23 @@ class PartsTab:
         tree.bind('<Double-1>', lambda e: self.add_part_to_collection(tree))
         tree.bind('<Button-1>', lambda e: self.on_single_click(tree, e))
         
+        self.part_trees.append((tree, part_type))
         return tree
     
+    @staticmethod
+    def get_row_options(part):
+        """Treeview text, values and rarity color tag for a part."""
+        return {
+            'text': part.name,
+            'tags': [part.rarity.value.lower().replace(' ', '_')],
+            'values': (part.part_type.value, part.series, part.rarity.value,
+                       f"{part.weight:.1f}" if part.weight else "N/A", part.description or "")
+        }
+    
+    def insert_part_row(self, tree, part, index='end'):
+        """Insert a part row keyed by its catalog iid."""
+        tree.insert('', index, iid=part_iid(part), **self.get_row_options(part))
+    
     def on_single_click(self, tree, event):
         """Handle single click to show part details."""
         selection = tree.selection()
@@ -276,49 +355,73 @@ class PartsTab:
         dialog = QuickAddMultipleDialog(self.frame, self.collection, self.refresh_callback)
     
     def on_search_change(self, *args):
-        """Handle search text change."""
+        """Filter the treeviews on a worker; typing again cancels a search still running."""
+        from data.database import get_all_parts
         search_term = self.search_var.get().lower()
-        
-        # Update all treeviews based on search
-        if hasattr(self, 'blades_tree'):
-            self.filter_treeview(self.blades_tree, BEYBLADE_X_DATABASE["blades"], search_term)
-        if hasattr(self, 'ratchets_tree'):
-            self.filter_treeview(self.ratchets_tree, BEYBLADE_X_DATABASE["ratchets"], search_term)
-        if hasattr(self, 'bits_tree'):
-            self.filter_treeview(self.bits_tree, BEYBLADE_X_DATABASE["bits"], search_term)
-        if hasattr(self, 'all_parts_tree'):
-            from data.database import get_all_parts
-            self.filter_treeview(self.all_parts_tree, get_all_parts(), search_term)
-    
-    def filter_treeview(self, tree, parts_list, search_term):
-        """Filter treeview based on search term."""
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Add filtered parts
-        for part in parts_list:
-            if not search_term or search_term in part.name.lower() or search_term in part.description.lower():
-                tags = [part.rarity.value.lower().replace(' ', '_')]
-                tree.insert('', 'end', text=part.name, tags=tags,
-                           values=(part.part_type.value, part.series, part.rarity.value,
-                                 f"{part.weight:.1f}" if part.weight else "N/A", part.description or ""))
+        if self.search_task is not None:
+            self.search_task.cancel()
+        
+        trees, parts_lists = [], []
+        for attribute, parts_list in (('blades_tree', BEYBLADE_X_DATABASE["blades"]),
+                                      ('ratchets_tree', BEYBLADE_X_DATABASE["ratchets"]),
+                                      ('bits_tree', BEYBLADE_X_DATABASE["bits"]),
+                                      ('all_parts_tree', get_all_parts())):
+            if hasattr(self, attribute):
+                trees.append(getattr(self, attribute))
+                parts_lists.append(parts_list)
+        self.search_task = get_executor().submit(
+            filter_parts_lists, search_term, parts_lists, name="Searching parts", show_status=False,
+            on_done=lambda results: self.show_search_results(trees, results))
+    
+    @timed("ui.parts_tab.show_search_results")
+    def show_search_results(self, trees, results):
+        """Refill each treeview with its matching parts."""
+        for tree, parts in zip(trees, results):
+            tree.delete(*tree.get_children())
+            for part in parts:
+                self.insert_part_row(tree, part)
+    
+    def apply_catalog_diff(self, diff):
+        """Patch only the rows of parts that a catalog reload added, removed or changed."""
+        if self.search_task is not None and not self.search_task.finished:
+            # The running search filters the old catalog; search the new one instead
+            self.on_search_change()
+        else:
+            self.patch_catalog_rows(diff)
+        
+        # Category and total counts
+        for category, (label, template) in self.count_labels.items():
+            count = len(get_catalog().all_parts()) if category is None else len(BEYBLADE_X_DATABASE[category])
+            label.config(text=template.format(count))
+    
+    def patch_catalog_rows(self, diff):
+        search_term = self.search_var.get()
+        index = get_search_index()
+        
+        for tree, part_type in self.part_trees:
+            for part in diff.removed:
+                if tree.exists(part_iid(part)):
+                    tree.delete(part_iid(part))
+            
+            for old_part, part in diff.changed:
+                shown = part_type in (None, part.part_type) and (
+                    not search_term or index.matches(part, search_term))
+                if tree.exists(part_iid(part)):
+                    if shown:
+                        tree.item(part_iid(part), **self.get_row_options(part))
+                    else:
+                        tree.delete(part_iid(part))
+                elif shown:
+                    self.insert_part_row(tree, part, catalog_insert_index(tree, part))
+            
+            for part in diff.added:
+                if part_type in (None, part.part_type) and (not search_term or index.matches(part, search_term)):
+                    self.insert_part_row(tree, part, catalog_insert_index(tree, part))
     
     def refresh(self):
         """Refresh the parts display."""
-        # Clear search
+        # Clearing the search refills every treeview through its trace
         self.search_var.set("")
-        
-        # Refresh all treeviews
-        if hasattr(self, 'blades_tree'):
-            self.filter_treeview(self.blades_tree, BEYBLADE_X_DATABASE["blades"], "")
-        if hasattr(self, 'ratchets_tree'):
-            self.filter_treeview(self.ratchets_tree, BEYBLADE_X_DATABASE["ratchets"], "")
-        if hasattr(self, 'bits_tree'):
-            self.filter_treeview(self.bits_tree, BEYBLADE_X_DATABASE["bits"], "")
-        if hasattr(self, 'all_parts_tree'):
-            from data.database import get_all_parts
-            self.filter_treeview(self.all_parts_tree, get_all_parts(), "")
 
 
 class QuickAddPartDialog:
@@ -458,12 +561,45 @@ class QuickAddPartDialog:
         self.dialog.destroy()
 
 
+def starter_set_parts(task):
+    """Dran Sword, 3-60 and Flat; runs on a worker."""
+    from data.database import find_database_part
+    parts = []
+    for part_name, part_type in (("Dran Sword", PartType.BLADE), ("3-60", PartType.RATCHET), ("Flat", PartType.BIT)):
+        db_part = find_database_part(part_name, part_type)
+        if db_part:
+            parts.append(owned_copy(db_part))
+    return parts
+
+
+def battle_set_parts(task):
+    """The first 5 blades, ratchets and bits; runs on a worker."""
+    return [owned_copy(part) for category in ("blades", "ratchets", "bits")
+            for part in BEYBLADE_X_DATABASE[category][:5]]
+
+
+def common_parts(task):
+    """Every common part in the catalog; runs on a worker."""
+    from data.database import get_all_parts
+    from models.enums import Rarity
+    all_parts = get_all_parts()
+    parts = []
+    for i, part in enumerate(all_parts):
+        if i % QUICK_ADD_PROGRESS_EVERY == 0:
+            task.check_cancelled()
+            task.progress(i, len(all_parts))
+        if part.rarity == Rarity.COMMON:
+            parts.append(owned_copy(part))
+    return parts
+
+
 class QuickAddMultipleDialog:
     """Dialog for adding multiple parts at once."""
     
     def __init__(self, parent, collection: Collection, refresh_callback):
         self.collection = collection
         self.refresh_callback = refresh_callback
+        self.task = None  # The set being built
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Quick Add Multiple Parts")
@@ -476,6 +612,7 @@ class QuickAddMultipleDialog:
         self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 50))
         
         self.setup_dialog()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
     
     def setup_dialog(self):
         """Setup the multiple add dialog."""
@@ -502,26 +639,24 @@ class QuickAddMultipleDialog:
         ).pack(anchor='w', pady=(0, 10))
         
         # Starter set buttons
-        BeybladeXTheme.create_button(
-            sets_content,
-            "🎯 Basic Starter Set (Dran Sword + 3-60 + Flat)",
-            'primary',
-            command=self.add_basic_starter
-        ).pack(fill='x', pady=2)
-        
-        BeybladeXTheme.create_button(
-            sets_content,
-            "⚔️ Complete Battle Set (5 Blades + 5 Ratchets + 5 Bits)",
-            'accent',
-            command=self.add_battle_set
-        ).pack(fill='x', pady=2)
-        
-        BeybladeXTheme.create_button(
+        self.set_buttons = []
+        for text, style, command in (
+                ("🎯 Basic Starter Set (Dran Sword + 3-60 + Flat)", 'primary', self.add_basic_starter),
+                ("⚔️ Complete Battle Set (5 Blades + 5 Ratchets + 5 Bits)", 'accent', self.add_battle_set),
+                ("🌟 All Common Parts", 'secondary', self.add_all_common)):
+            button = BeybladeXTheme.create_button(sets_content, text, style, command=command)
+            button.pack(fill='x', pady=2)
+            self.set_buttons.append(button)
+        
+        # Progress of a set being built, shown while it runs
+        self.progress = ttk.Progressbar(sets_content)
+        self.progress_label = BeybladeXTheme.create_label(
             sets_content,
-            "🌟 All Common Parts",
-            'secondary',
-            command=self.add_all_common
-        ).pack(fill='x', pady=2)
+            "",
+            'body_small',
+            fg=BeybladeXTheme.COLORS['text_secondary']
+        )
+        self.progress_label.pack(anchor='w', pady=(5, 0))
         
         # Custom selection (placeholder)
         custom_card = BeybladeXTheme.create_card_frame(main_frame)
@@ -542,115 +677,60 @@ class QuickAddMultipleDialog:
             main_frame,
             "Close",
             'secondary',
-            command=self.dialog.destroy
+            command=self.close
         ).pack(pady=(20, 0))
     
     def add_basic_starter(self):
         """Add basic starter set."""
-        from data.database import find_database_part
-        
-        parts_to_add = [
-            ("Dran Sword", PartType.BLADE),
-            ("3-60", PartType.RATCHET),
-            ("Flat", PartType.BIT)
-        ]
-        
-        added_count = 0
-        for part_name, part_type in parts_to_add:
-            db_part = find_database_part(part_name, part_type)
-            if db_part:
-                new_part = BeybladePart(
-                    name=db_part.name,
-                    part_type=db_part.part_type,
-                    series=db_part.series,
-                    rarity=db_part.rarity,
-                    weight=db_part.weight,
-                    description=db_part.description,
-                    owned_quantity=1,
-                    condition="New"
-                )
-                self.collection.add_part(new_part)
-                added_count += 1
-        
-        self.refresh_callback()
-        messagebox.showinfo("Success", f"Added {added_count} parts from Basic Starter Set!")
+        self.add_set(starter_set_parts, "Basic Starter Set", "Added {} parts from Basic Starter Set!")
     
     def add_battle_set(self):
         """Add complete battle set."""
-        from data.database import BEYBLADE_X_DATABASE
-        
-        added_count = 0
-        
-        # Add first 5 blades
-        for blade in BEYBLADE_X_DATABASE["blades"][:5]:
-            new_part = BeybladePart(
-                name=blade.name,
-                part_type=blade.part_type,
-                series=blade.series,
-                rarity=blade.rarity,
-                weight=blade.weight,
-                description=blade.description,
-                owned_quantity=1,
-                condition="New"
-            )
-            self.collection.add_part(new_part)
-            added_count += 1
-        
-        # Add first 5 ratchets
-        for ratchet in BEYBLADE_X_DATABASE["ratchets"][:5]:
-            new_part = BeybladePart(
-                name=ratchet.name,
-                part_type=ratchet.part_type,
-                series=ratchet.series,
-                rarity=ratchet.rarity,
-                weight=ratchet.weight,
-                description=ratchet.description,
-                owned_quantity=1,
-                condition="New"
-            )
-            self.collection.add_part(new_part)
-            added_count += 1
-        
-        # Add first 5 bits
-        for bit in BEYBLADE_X_DATABASE["bits"][:5]:
-            new_part = BeybladePart(
-                name=bit.name,
-                part_type=bit.part_type,
-                series=bit.series,
-                rarity=bit.rarity,
-                weight=bit.weight,
-                description=bit.description,
-                owned_quantity=1,
-                condition="New"
-            )
-            self.collection.add_part(new_part)
-            added_count += 1
-        
-        self.refresh_callback()
-        messagebox.showinfo("Success", f"Added {added_count} parts from Complete Battle Set!")
+        self.add_set(battle_set_parts, "Complete Battle Set", "Added {} parts from Complete Battle Set!")
     
     def add_all_common(self):
         """Add all common rarity parts."""
-        from data.database import get_all_parts
-        from models.enums import Rarity
-        
-        all_parts = get_all_parts()
-        added_count = 0
-        
-        for part in all_parts:
-            if part.rarity == Rarity.COMMON:
-                new_part = BeybladePart(
-                    name=part.name,
-                    part_type=part.part_type,
-                    series=part.series,
-                    rarity=part.rarity,
-                    weight=part.weight,
-                    description=part.description,
-                    owned_quantity=1,
-                    condition="New"
-                )
-                self.collection.add_part(new_part)
-                added_count += 1
-        
+        self.add_set(common_parts, "common parts", "Added {} common parts to your collection!")
+    
+    def add_set(self, build_parts, set_name, success_message):
+        """Build a set's parts on a worker, then add them to the collection here."""
+        if self.task is not None and not self.task.finished:
+            return
+        for button in self.set_buttons:
+            button.config(state='disabled')
+        self.progress.config(mode='indeterminate')
+        self.progress.pack(fill='x', pady=(10, 0), before=self.progress_label)
+        self.progress.start()
+        self.progress_label.config(text=f"Finding {set_name}...")
+        self.task = get_executor().submit(
+            build_parts, name=f"Adding {set_name}",
+            on_progress=self.show_progress,
+            on_done=lambda parts: self.add_parts(parts, success_message),
+            on_finished=self.on_set_finished)
+    
+    def show_progress(self, task):
+        if task.fraction is None or not self.dialog.winfo_exists():
+            return
+        self.progress.stop()
+        self.progress.config(mode='determinate', maximum=1.0, value=task.fraction)
+        self.progress_label.config(text=f"{task.done:,} / {task.total:,} catalog parts checked")
+    
+    def add_parts(self, parts, success_message):
+        self.collection.add_parts(parts)
         self.refresh_callback()
-        messagebox.showinfo("Success", f"Added {added_count} common parts to your collection!")
+        messagebox.showinfo("Success", success_message.format(len(parts)))
+    
+    def on_set_finished(self, task):
+        if not self.dialog.winfo_exists():
+            return
+        self.progress.stop()
+        self.progress.pack_forget()
+        self.progress_label.config(text="")
+        for button in self.set_buttons:
+            button.config(state='normal')
+    
+    def close(self):
+        """Close the dialog, abandoning a set still being built."""
+        if self.task is not None:
+            self.task.cancel()
+        self.dialog.destroy()
@@ -0,0 +1,290 @@
+"""Background tasks for the Tk UI, with progress and cooperative cancellation.
+
+Heavy work started from a button or keystroke is submitted to the shared
+executor instead of running in the callback. It runs on a thread pool,
+or on a process pool for picklable CPU-bound work. Every task reports
+back through one queue, which the executor drains on the Tk thread with
+an ``after`` job, scheduled only while tasks are active and yielding to
+Tk after ``POLL_BUDGET_MS``. All callbacks therefore run on the Tk
+thread and may touch widgets.
+
+A thread task is called as ``fn(task, *args)``. It may call
+``task.progress(done, total)`` and should call ``task.check_cancelled()``
+between steps. That raises ``TaskCancelled`` once ``task.cancel()`` has
+been called, so cancellation is cooperative. A task producing results
+as it goes passes each to ``task.deliver(value)``, and ``on_partial``
+gets them in order. Tasks must not touch Tk or the live ``Collection``;
+pass them ``Collection.snapshot()`` instead::
+
+    def build(task, snapshot):
+        for i, part in enumerate(snapshot.parts):
+            task.progress(i, len(snapshot.parts))
+            task.check_cancelled()
+            ...
+
+    get_executor().submit(build, collection.snapshot(), name="Building report",
+                          on_done=show_report)
+
+Process tasks are called as ``fn(*args)``. They report no progress, and
+cancelling one only stops it if it has not started.
+"""
+
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import tkinter as tk
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+
+POLL_MS = 50
+POLL_BUDGET_MS = 20  # Longest run of callbacks before the poll yields to Tk
+MAX_THREADS = 4
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional["TaskExecutor"] = None
+
+
+class TaskCancelled(Exception):
+    """Raised by ``Task.check_cancelled`` in a task that has been cancelled."""
+
+
+class Task:
+    """A submitted task: its progress, its state and how to cancel it."""
+    
+    PENDING, RUNNING, DONE, FAILED, CANCELLED = 'pending', 'running', 'done', 'failed', 'cancelled'
+    
+    def __init__(self, executor: "TaskExecutor", name: str, show_status: bool,
+                 on_done: Optional[Callable[[Any], None]], on_error: Optional[Callable[[BaseException], None]],
+                 on_progress: Optional[Callable[["Task"], None]], on_finished: Optional[Callable[["Task"], None]],
+                 on_partial: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.show_status = show_status  # Shown in the status bar while active
+        self.state = Task.PENDING
+        self.done = 0
+        self.total: Optional[int] = None  # None while the amount of work is unknown
+        self.message: Optional[str] = None
+        self.started: Optional[float] = None
+        self._executor = executor
+        self._cancelled = threading.Event()
+        self._future: Optional[Future] = None  # Process tasks only; thread tasks check the flag
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._on_partial = on_partial
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in (Task.DONE, Task.FAILED, Task.CANCELLED)
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the work done, or None when the total is unknown."""
+        return min(self.done / self.total, 1.0) if self.total else None
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def cancel(self) -> None:
+        """Ask the task to stop; its ``on_done`` will not be called."""
+        self._cancelled.set()
+        if self._future is not None:
+            self._future.cancel()  # A process task can only be stopped before it starts
+    
+    def check_cancelled(self) -> None:
+        """Called by the task between steps; raises ``TaskCancelled`` once cancelled."""
+        if self._cancelled.is_set():
+            raise TaskCancelled(self.name)
+    
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        """Called by the task; only enqueues, never touches Tk."""
+        self._executor._events.put(('progress', self, done, total, message))
+    
+    def deliver(self, value) -> None:
+        """Called by the task to hand a partial result to ``on_partial``; only enqueues."""
+        self._executor._events.put(('partial', self, value))
+
+
+class TaskExecutor:
+    """A thread pool, and a process pool on first use, reporting back to the Tk thread."""
+    
+    def __init__(self, root: tk.Misc, max_threads: int = MAX_THREADS, max_processes: Optional[int] = None):
+        self.root = root
+        self.max_processes = max_processes or os.cpu_count()
+        self.active: List[Task] = []
+        self._threads = ThreadPoolExecutor(max_threads, thread_name_prefix="ui-task")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._events: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._poll_job = None
+        self._listeners: List[Callable[[List[Task]], None]] = []
+    
+    def add_listener(self, listener: Callable[[List[Task]], None]) -> None:
+        """Call ``listener(tasks)`` with the active status-bar tasks whenever they change."""
+        self._listeners.append(listener)
+    
+    def submit(self, fn: Callable, *args, name: str, show_status: bool = True,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[Task], None]] = None,
+               on_finished: Optional[Callable[[Task], None]] = None,
+               on_partial: Optional[Callable[[Any], None]] = None) -> Task:
+        """Run ``fn(task, *args)`` on the thread pool; call from the Tk thread.
+        
+        ``on_done`` gets the result and ``on_error`` the exception, unless
+        the task was cancelled. ``on_finished`` is called in every case.
+        Errors without an ``on_error`` are logged.
+        """
+        task = self._add(name, show_status, on_done, on_error, on_progress, on_finished, on_partial)
+        self._threads.submit(self._run, task, fn, args)
+        return task
+    
+    def submit_process(self, fn: Callable, *args, name: str, show_status: bool = True,
+                       on_done: Optional[Callable[[Any], None]] = None,
+                       on_error: Optional[Callable[[BaseException], None]] = None,
+                       on_finished: Optional[Callable[[Task], None]] = None) -> Task:
+        """Run the picklable ``fn(*args)`` in a worker process; call from the Tk thread."""
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.max_processes)
+        task = self._add(name, show_status, on_done, on_error, None, on_finished)
+        task.started = time.perf_counter()
+        task.state = Task.RUNNING
+        task._future = self._processes.submit(fn, *args)
+        task._future.add_done_callback(lambda future: self._events.put(self._outcome(task, future)))
+        return task
+    
+    def _add(self, name, show_status, on_done, on_error, on_progress, on_finished, on_partial=None) -> Task:
+        task = Task(self, name, show_status, on_done, on_error, on_progress, on_finished, on_partial)
+        self.active.append(task)
+        if self._poll_job is None:
+            self._poll_job = self.root.after(POLL_MS, self._poll)
+        if show_status:
+            self._notify()
+        return task
+    
+    def _run(self, task: Task, fn: Callable, args: tuple) -> None:
+        """Runs on a pool thread; reports only through the queue."""
+        if task.cancelled:
+            self._events.put(('cancelled', task))
+            return
+        self._events.put(('started', task))
+        try:
+            result = fn(task, *args)
+        except TaskCancelled:
+            self._events.put(('cancelled', task))
+        except BaseException as e:
+            self._events.put(('error', task, e))
+        else:
+            self._events.put(('cancelled', task) if task.cancelled else ('done', task, result))
+    
+    @staticmethod
+    def _outcome(task: Task, future: Future) -> tuple:
+        try:
+            result = future.result()
+        except CancelledError:
+            return 'cancelled', task
+        except BaseException as e:
+            return 'error', task, e
+        return ('cancelled', task) if task.cancelled else ('done', task, result)
+    
+    def _poll(self) -> None:
+        """Apply queued events for up to ``POLL_BUDGET_MS``, then reschedule while tasks are active."""
+        self._poll_job = None
+        changed = []
+        deadline = time.perf_counter() + POLL_BUDGET_MS / 1e3
+        more = False
+        while not more:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            changed.append(self._apply(event))
+            more = time.perf_counter() > deadline
+        if any(task.show_status for task in changed):
+            self._notify()
+        if self.active:
+            # Soon again if events are left, after Tk has handled input and redrawn
+            self._poll_job = self.root.after(1 if more else POLL_MS, self._poll)
+    
+    def drain(self, timeout: Optional[float] = None) -> None:
+        """Block until every active task has finished, applying events; for scripts and benchmarks."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.active:
+            remaining = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+            try:
+                event = self._events.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if self._apply(event).show_status:
+                self._notify()
+    
+    def _apply(self, event: tuple) -> Task:
+        """Update a task from one event and call its callbacks, on the Tk thread."""
+        kind, task = event[0], event[1]
+        if task.finished:
+            return task
+        if kind == 'started':
+            task.state = Task.RUNNING
+            task.started = time.perf_counter()
+        elif kind == 'progress':
+            task.done, task.message = event[2], event[4]
+            if event[3] is not None:
+                task.total = event[3]
+            self._call(task._on_progress, task)
+        elif kind == 'partial':
+            self._call(task._on_partial, event[2])
+        else:
+            self.active.remove(task)
+            elapsed_ms = (time.perf_counter() - (task.started or time.perf_counter())) * 1e3
+            if kind == 'done' and not task.cancelled:
+                task.state = Task.DONE
+                logger.debug("Task %s done in %.0f ms", task.name, elapsed_ms, extra={'duration_ms': elapsed_ms})
+                self._call(task._on_done, event[2])
+            elif kind == 'error' and not task.cancelled:
+                task.state = Task.FAILED
+                if task._on_error is None:
+                    logger.error("Task %s failed", task.name, exc_info=event[2])
+                else:
+                    self._call(task._on_error, event[2])
+            else:
+                task.state = Task.CANCELLED
+                logger.debug("Task %s cancelled after %.0f ms", task.name, elapsed_ms)
+            self._call(task._on_finished, task)
+        return task
+    
+    def _call(self, callback: Optional[Callable], value) -> None:
+        # Reported like any Tk callback error, and without stopping the queue from draining
+        if callback is not None:
+            try:
+                callback(value)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+    
+    def _notify(self) -> None:
+        shown = [active for active in self.active if active.show_status]
+        for listener in list(self._listeners):
+            self._call(listener, shown)
+    
+    def shutdown(self) -> None:
+        """Stop taking tasks once the main loop has ended.
+        
+        Thread tasks still run to the end, so a save in progress completes
+        before the interpreter exits, but no callbacks are called. Process
+        tasks not yet started are cancelled.
+        """
+        self._threads.shutdown(wait=False)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+def get_executor(root: Optional[tk.Misc] = None) -> TaskExecutor:
+    """The application's shared executor, created for ``root`` (or the default root) on first use."""
+    global _executor
+    if _executor is None:
+        _executor = TaskExecutor(root or tk._default_root)
+    return _executor